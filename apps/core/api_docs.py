@@ -0,0 +1,25 @@
+"""Schema annotations for views that don't import drf-spectacular when API docs are off.
+
+With ``API_DOCS_ENABLED`` these are drf-spectacular's own. Without it nothing
+generates a schema, so ``extend_schema`` returns the view unchanged and
+``OpenApiParameter`` only holds its arguments; importing a view module then
+doesn't load drf-spectacular (about 26 modules).
+"""
+
+from django.conf import settings
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.utils import OpenApiParameter, extend_schema
+else:
+
+    def extend_schema(*args, **kwargs):
+        return lambda view: view
+
+    class OpenApiParameter:
+        QUERY, PATH, HEADER, COOKIE = "query", "path", "header", "cookie"
+
+        def __init__(self, *args, **kwargs):
+            self.args, self.kwargs = args, kwargs
+
+
+__all__ = ["OpenApiParameter", "extend_schema"]
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+
+
+class CoreConfig(AppConfig):
+    """Cross-cutting infrastructure: middleware, instrumentation, ops commands."""
+
+    name = "apps.core"
+
+    def ready(self):
+        from .migration_state import forget_fingerprint
+
+        pre_migrate.connect(forget_fingerprint, sender=self)
@@ -0,0 +1,271 @@
+"""Two-tier cache backend: a per-process LRU (L1) in front of a shared cache (L2).
+
+    CACHES = {
+        "default": {
+            "BACKEND": "apps.core.cache.TieredCache",
+            "OPTIONS": {"L2_ALIAS": "shared", "L1_MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+        },
+        "shared": env.cache("CACHE_URL"),  # redis://, filecache:///..., locmemcache://
+    }
+
+Reads are served from L1 while fresh, then from L2 (refilling L1). Writes
+and deletes go to both tiers, so this process never reads its own stale
+values; other processes may, for at most ``L1_TIMEOUT`` seconds.
+
+``get_or_set(key, callable)`` is single-flight: threads of a process queue on
+a per-key lock and processes on a lock key in L2, so one caller computes a
+missing value while the rest wait for it instead of all recomputing it. A
+caller that waits longer than ``LOCK_TIMEOUT`` computes it anyway. The L2
+lock is only as strict as the backend's ``add()``: atomic on Redis, Memcached
+and local memory, check-then-write on the file cache.
+
+Hits, misses, L1 evictions and stampede waits are counted per namespace (the
+key up to its last ``:``, e.g. ``custom_user:me``); see ``stats()`` and
+``tiered_cache_stats()``.
+"""
+
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Per-process state shared by the per-thread backend instances Django creates
+# for each alias (like LocMemCache's module-level dicts), keyed by LOCATION.
+_stores: dict[str, LRUStore] = {}
+_stats: dict[str, dict[str, NamespaceStats]] = {}
+_flight_locks: dict[str, list[threading.Lock]] = {}
+_registry_lock = threading.Lock()
+
+FLIGHT_STRIPES = 64
+_MISSING = object()
+
+
+@dataclass
+class NamespaceStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    l1_evictions: int = 0
+    computations: int = 0
+    stampede_waits: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            **asdict(self),
+            "hit_ratio": (self.l1_hits + self.l2_hits) / lookups if lookups else 0.0,
+            "l1_hit_ratio": self.l1_hits / lookups if lookups else 0.0,
+        }
+
+
+class LRUStore:
+    """Bounded, thread-safe LRU of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(entry[1])
+
+    def set(self, key: str, value, ttl: float) -> int:
+        """Store ``value`` for ``ttl`` seconds; return how many entries were evicted."""
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def namespace_of(key: str) -> str:
+    return key.rpartition(":")[0] or "-"
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.name = location or "default"
+        self.l2_alias = options.get("L2_ALIAS", "shared")
+        self.l1_timeout = options.get("L1_TIMEOUT", 5)
+        self.lock_timeout = options.get("LOCK_TIMEOUT", 10)
+        self.poll_interval = options.get("POLL_INTERVAL", 0.05)
+        with _registry_lock:
+            self.l1 = _stores.setdefault(self.name, LRUStore(options.get("L1_MAX_ENTRIES", 1000)))
+            self._stats = _stats.setdefault(self.name, {})
+            self._flight = _flight_locks.setdefault(
+                self.name, [threading.Lock() for _ in range(FLIGHT_STRIPES)]
+            )
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self.l2_alias]
+
+    def stats_for(self, key: str) -> NamespaceStats:
+        namespace = namespace_of(key)
+        stats = self._stats.get(namespace)
+        if stats is None:
+            with _registry_lock:
+                stats = self._stats.setdefault(namespace, NamespaceStats())
+        return stats
+
+    def _l1_ttl(self, timeout) -> float:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+
+    def _fill_l1(self, key: str, l1_key: str, value, timeout=DEFAULT_TIMEOUT) -> None:
+        ttl = self._l1_ttl(timeout)
+        if ttl > 0:
+            self.stats_for(key).l1_evictions += self.l1.set(l1_key, value, ttl)
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version)
+        stats = self.stats_for(key)
+        value = self.l1.get(l1_key)
+        if value is not _MISSING:
+            stats.l1_hits += 1
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            stats.misses += 1
+            return default
+        stats.l2_hits += 1
+        self._fill_l1(key, l1_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version)
+        self.l2.set(key, value, timeout=self._l2_timeout(timeout), version=version)
+        self.stats_for(key).sets += 1
+        self._fill_l1(key, l1_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version)
+        added = self.l2.add(key, value, timeout=self._l2_timeout(timeout), version=version)
+        if added:
+            self.stats_for(key).sets += 1
+            self._fill_l1(key, l1_key, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=self._l2_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(self.make_and_validate_key(key, version))
+        self.stats_for(key).deletes += 1
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(self.make_and_validate_key(key, version))
+        return self.l2.incr(key, delta, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    def _l2_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        if not callable(default):
+            return super().get_or_set(key, default, timeout=timeout, version=version)
+
+        l1_key = self.make_and_validate_key(key, version)
+        with self._flight[hash(l1_key) % FLIGHT_STRIPES]:
+            # Another thread of this process may have filled it while we queued.
+            value = self.l1.get(l1_key)
+            if value is not _MISSING:
+                return value
+            lock_key = f"{key}.lock"
+            locked = self.l2.add(lock_key, 1, timeout=self.lock_timeout, version=version)
+            if locked:
+                # The previous holder may have stored it and released the lock
+                # between our L2 miss and the add().
+                value = self.l2.get(key, _MISSING, version=version)
+            else:
+                value = self._wait_for(key, version)
+            if value is not _MISSING:
+                if locked:
+                    self.l2.delete(lock_key, version=version)
+                self._fill_l1(key, l1_key, value, timeout)
+                return value
+            try:
+                value = default()
+                self.stats_for(key).computations += 1
+                self.set(key, value, timeout=timeout, version=version)
+            finally:
+                if locked:
+                    self.l2.delete(lock_key, version=version)
+        return value
+
+    def _wait_for(self, key, version):
+        """Poll L2 for a value another process is computing."""
+        self.stats_for(key).stampede_waits += 1
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = self.l2.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+    def stats(self) -> dict[str, dict]:
+        with _registry_lock:
+            namespaces = dict(self._stats)
+        return {namespace: stats.as_dict() for namespace, stats in sorted(namespaces.items())}
+
+    def reset_stats(self) -> None:
+        with _registry_lock:
+            self._stats.clear()
+
+
+def tiered_cache_stats() -> dict[str, dict[str, dict]]:
+    """Per-namespace stats of every tiered cache in this process, by LOCATION."""
+    with _registry_lock:
+        names = {name: dict(namespaces) for name, namespaces in _stats.items()}
+    return {
+        name: {namespace: stats.as_dict() for namespace, stats in sorted(namespaces.items())}
+        for name, namespaces in names.items()
+    }
@@ -0,0 +1,34 @@
+"""How many CPUs this process may use, and the web worker count derived from it.
+
+Plain functions with no Django or gunicorn imports: ``config/gunicorn.py``
+sizes its workers with them, and app code (the password hashing pool) sizes
+its thread pools without importing the gunicorn config.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """CPUs this process may use: affinity mask capped by a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_workers(interface: str, cpus: int) -> int:
+    # Sync workers block on I/O, so oversubscribe; async workers don't need to.
+    return cpus if interface == "asgi" else 2 * cpus + 1
@@ -0,0 +1,43 @@
+"""psycopg connection pools of the PostgreSQL aliases configured with ``OPTIONS["pool"]``.
+
+Django creates a pool per alias per process on first use and shares it
+between the process's threads (see ``DATABASE_POOL`` in the settings).
+"""
+
+from __future__ import annotations
+
+from django.db import connections
+
+
+def pooled_connections():
+    """Connection wrappers (of this thread) whose alias is configured with a pool."""
+    for alias in connections:
+        if connections.settings[alias].get("OPTIONS", {}).get("pool"):
+            yield connections[alias]
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """``ConnectionPool.get_stats()`` per alias, for the pools opened in this process.
+
+    ``pool_size``/``pool_available`` are gauges of the connections held and
+    idle, ``requests_waiting`` the threads waiting for one; ``requests_num``,
+    ``requests_wait_ms``, ``requests_errors`` (checkout timeouts) etc. count
+    since the pool was opened.
+    """
+    stats = {}
+    for connection in pooled_connections():
+        pool = connection.pool
+        if not pool.closed:
+            stats[connection.alias] = pool.get_stats()
+    return stats
+
+
+def close_pools() -> None:
+    """Close this process's pools, e.g. in a parent before it forks workers.
+
+    A pool's connections and maintenance threads can't be used across a fork;
+    the next query in each process opens a new pool.
+    """
+    for connection in pooled_connections():
+        connection.close()
+        connection.close_pool()
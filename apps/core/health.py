@@ -0,0 +1,261 @@
+"""Readiness checks: every database, every cache backend, unapplied migrations.
+
+``readiness.report()`` starts all checks at once on a small thread pool and
+gives each ``HEALTH_CHECK_TIMEOUT`` seconds from its start; a check that
+hasn't finished by then fails as timed out (and a later report waits on the
+same attempt rather than starting another one beside it). The report is kept
+for ``HEALTH_CHECK_CACHE_SECONDS``, and concurrent callers share one run, so
+however many probes arrive a worker runs the checks at most once per
+interval.
+
+Read replicas are checked and reported, but a failing replica only fails the
+report with ``HEALTH_CHECK_REPLICAS_REQUIRED``: reads fall back to the primary
+when no replica is configured, and one lagging replica shouldn't take every
+instance out of the load balancer.
+
+``/readyz`` serves the report (503 while a check fails), ``/healthz`` only
+shows that the process answers requests, and ``manage.py check_ready`` runs
+the same checks from the command line, e.g. before migrating at start-up.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field, replace
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.http import require_safe
+
+from .cache import TieredCache
+from .routing import replica_aliases
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    run: Callable[[], None]  # raises when the dependency isn't usable
+    timeout: float
+    required: bool = True  # whether a failure makes the report fail
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    ok: bool
+    duration_ms: float
+    error: str = ""
+    required: bool = True
+
+
+@dataclass(frozen=True)
+class Report:
+    results: dict[str, CheckResult]
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def failures(self) -> list[str]:
+        """Failed checks that are required."""
+        return [name for name, result in self.results.items() if result.required and not result.ok]
+
+    @property
+    def warnings(self) -> list[str]:
+        """Failed checks that aren't."""
+        return [
+            name for name, result in self.results.items() if not result.required and not result.ok
+        ]
+
+    def as_dict(self, errors: bool = False) -> dict:
+        checks = {}
+        for name, result in self.results.items():
+            checks[name] = {"ok": result.ok, "duration_ms": result.duration_ms}
+            if not result.required:
+                checks[name]["required"] = False
+            if errors and result.error:
+                checks[name]["error"] = result.error
+        return {"status": "ok" if self.ok else "unavailable", "checks": checks}
+
+
+def check_database(alias: str) -> None:
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def check_cache(alias: str) -> None:
+    backend = caches[alias]
+    # Per probe: workers and instances probing one shared cache at the same time
+    # would otherwise overwrite each other's value between the set and the get.
+    key = f"health:probe:{os.getpid()}:{uuid.uuid4().hex}"
+    value = os.urandom(8).hex()
+    try:
+        backend.set(key, value, timeout=60)
+        if backend.get(key) != value:
+            raise RuntimeError("a value written to the cache could not be read back")
+    finally:
+        backend.delete(key)
+
+
+def check_migrations() -> None:
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        migration, _backwards = plan[0]
+        raise RuntimeError(f"{len(plan)} unapplied migration(s), starting with {migration}")
+
+
+def default_checks(skip: tuple[str, ...] = ()) -> list[Check]:
+    """The databases, the cache backends (not their tiered fronts) and migrations.
+
+    ``skip`` drops checks by name or kind (``database``, ``cache``, ``migrations``).
+    Replica checks are required only with ``HEALTH_CHECK_REPLICAS_REQUIRED``.
+    """
+    timeout = getattr(settings, "HEALTH_CHECK_TIMEOUT", 2.0)
+    replicas = set(replica_aliases())
+    replicas_required = getattr(settings, "HEALTH_CHECK_REPLICAS_REQUIRED", False)
+    checks = [
+        Check(
+            f"database:{alias}",
+            lambda alias=alias: check_database(alias),
+            timeout,
+            required=replicas_required or alias not in replicas,
+        )
+        for alias in connections
+    ]
+    checks += [
+        Check(f"cache:{alias}", lambda alias=alias: check_cache(alias), timeout)
+        for alias in settings.CACHES
+        # A tiered cache's I/O is its L2 alias, checked on its own.
+        if not isinstance(caches[alias], TieredCache)
+    ]
+    checks.append(Check("migrations", check_migrations, timeout))
+    return [
+        check for check in checks if check.name not in skip and check.name.split(":")[0] not in skip
+    ]
+
+
+def _timed(run: Callable[[], None]) -> CheckResult:
+    started = time.perf_counter()
+    try:
+        run()
+    except Exception as exc:  # noqa: BLE001  any failure means "not ready"
+        error = f"{type(exc).__name__}: {exc}"
+        ok = False
+    else:
+        error, ok = "", True
+    finally:
+        # Pool threads are long-lived: don't keep (or hold a pooled) connection.
+        connections.close_all()
+    return CheckResult(ok, round((time.perf_counter() - started) * 1000, 3), error)
+
+
+class Readiness:
+    """Runs checks concurrently, each under its own timeout, and caches the report."""
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._report: Report | None = None
+        self._pid = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight: dict[str, Future] = {}
+
+    @property
+    def cache_seconds(self) -> float:
+        return getattr(settings, "HEALTH_CHECK_CACHE_SECONDS", 2.0)
+
+    def report(self, force: bool = False) -> Report:
+        """The last report if it is recent enough, otherwise a new one."""
+        report = self._report
+        if not force and self._fresh(report):
+            return report
+        with self._lock:
+            report = self._report
+            if force or not self._fresh(report):
+                report = self._report = self.run(default_checks())
+                for name in report.failures + report.warnings:
+                    logger.warning(
+                        "Readiness check %s failed: %s%s",
+                        name,
+                        report.results[name].error,
+                        "" if report.results[name].required else " (not required)",
+                    )
+        return report
+
+    def run(self, checks: list[Check]) -> Report:
+        """Run ``checks`` now, uncached."""
+        executor = self._ensure_executor()
+        started = time.monotonic()
+        futures = {}
+        for check in checks:
+            running = self._in_flight.get(check.name)
+            futures[check] = running if running is not None else executor.submit(_timed, check.run)
+        results = {}
+        for check, future in futures.items():
+            remaining = started + check.timeout - time.monotonic()
+            try:
+                result = future.result(timeout=max(remaining, 0))
+            except FutureTimeout:
+                self._in_flight[check.name] = future
+                future.add_done_callback(
+                    lambda done, name=check.name: self._in_flight.pop(name, None)
+                )
+                result = CheckResult(
+                    False, round(check.timeout * 1000, 3), f"timed out after {check.timeout}s"
+                )
+            results[check.name] = replace(result, required=check.required)
+        return Report(results)
+
+    def clear(self) -> None:
+        self._report = None
+
+    def _fresh(self, report: Report | None) -> bool:
+        return report is not None and time.monotonic() - report.checked_at < self.cache_seconds
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        # Per process: a pool created before a fork has no threads in the child.
+        if self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="health")
+            self._in_flight = {}
+            self._pid = os.getpid()
+        return self._executor
+
+
+readiness = Readiness()
+
+
+@require_safe
+def healthz(request):
+    """Liveness: the process serves requests. No dependency is checked, so a
+    database outage doesn't get every worker restarted."""
+    response = JsonResponse({"status": "ok"})
+    add_never_cache_headers(response)
+    return response
+
+
+@require_safe
+def readyz(request):
+    """Readiness: the cached report, 503 while a check fails.
+
+    Check errors (host names, driver messages) are only shown with DEBUG;
+    they are logged either way.
+    """
+    report = readiness.report()
+    response = JsonResponse(report.as_dict(errors=settings.DEBUG), status=200 if report.ok else 503)
+    add_never_cache_headers(response)
+    return response
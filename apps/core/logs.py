@@ -0,0 +1,242 @@
+"""Off-thread, batched log output and request context on every record.
+
+``BatchingStreamHandler`` does no formatting or I/O in the thread that logs:
+it renders ``msg % args`` (so later mutation of the arguments can't change the
+record), puts the record on a bounded queue and returns. A background thread
+takes up to ``batch_size`` records at a time (waiting at most
+``flush_interval`` seconds for a batch to fill), formats them with the
+handler's formatter and writes them with one ``write()`` + ``flush()``.
+
+When the queue is full the record is dropped and counted, never waited for;
+the listener then writes a warning with the number dropped since the last
+one. ``stats()`` reports queued/written/dropped totals.
+
+``RequestContextFilter`` adds ``request_id``, ``user_id``, ``view_name`` and
+``duration_ms`` (time since the request started) to records logged while
+``RequestContextMiddleware`` is handling a request.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.utils.functional import LazyObject, empty
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Accept upstream ids (load balancer, client) only if they look like ids.
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+@dataclass
+class RequestContext:
+    request: object
+    request_id: str
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def duration_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def user_id(self):
+        # Don't evaluate AuthenticationMiddleware's lazy user from a log call:
+        # only report a user something else has already loaded.
+        user = self.request.__dict__.get("user")
+        if user is None or (isinstance(user, LazyObject) and user._wrapped is empty):
+            return None
+        return user.pk if getattr(user, "is_authenticated", False) else None
+
+    def view_name(self):
+        match = getattr(self.request, "resolver_match", None)
+        return match.view_name if match else None
+
+    def as_log_fields(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "user_id": self.user_id(),
+            "view_name": self.view_name(),
+            "duration_ms": self.duration_ms,
+        }
+
+
+current_request: ContextVar[RequestContext | None] = ContextVar("current_request", default=None)
+
+
+def request_id_for(request) -> str:
+    """The caller's ``X-Request-ID`` if it is well-formed, otherwise a new one."""
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    return incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request's context fields to every record."""
+
+    def filter(self, record):
+        context = current_request.get()
+        if context is not None:
+            for name, value in context.as_log_fields().items():
+                if not hasattr(record, name):
+                    setattr(record, name, value)
+        elif not hasattr(record, "request_id"):
+            # django.request logs 4xx/5xx after the middleware has returned,
+            # passing the request along.
+            request_id = getattr(getattr(record, "request", None), "request_id", None)
+            if request_id is not None:
+                record.request_id = request_id
+        return True
+
+
+class BatchingStreamHandler(logging.Handler):
+    """Queue records and write them to ``stream`` in batches from a background thread."""
+
+    def __init__(
+        self,
+        stream=None,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__()
+        self.stream = stream or sys.stderr
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queued = self.written = self.dropped = 0
+        self._reported_drops = 0
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+
+    # Caller's thread
+
+    def emit(self, record):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1  # emit() runs under the handler lock
+        else:
+            self.queued += 1
+
+    def prepare(self, record):
+        """Copy of ``record`` that is safe to format later in another thread."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            formatter = self.formatter or logging.Formatter()
+            record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def _ensure_started(self):
+        # Per process: a listener started before a fork (gunicorn --preload)
+        # doesn't exist in the child.
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self.queue_size)
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name="log-writer", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def flush(self, timeout: float = 5.0):
+        """Block until everything queued so far has been written."""
+        if self._pid != os.getpid():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=5.0)
+            except queue.Full:
+                pass  # listener is stuck; it is a daemon thread
+            else:
+                self._thread.join(timeout=5.0)
+        self._pid = None
+        super().close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    # Listener thread
+
+    def _run(self, records: queue.Queue):
+        stopping = False
+        while not stopping:
+            batch, waiters = [], []
+            item = records.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = records.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, batch):
+        lines = []
+        dropped = self.dropped - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            batch.append(self._drop_record(dropped))
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(batch[-1])
+        else:
+            self.written += len(lines)
+
+    def _drop_record(self, dropped: int):
+        return logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            f"Log queue full: dropped {dropped} record(s)",
+            None,
+            None,
+        )
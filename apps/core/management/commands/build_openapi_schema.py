@@ -0,0 +1,58 @@
+"""Precompute the OpenAPI schema served at ``/api/schema/``.
+
+    python manage.py build_openapi_schema                 # into OPENAPI_SCHEMA_DIR
+    python manage.py build_openapi_schema --output-dir build/openapi
+    python manage.py build_openapi_schema --check         # exit 1 if the stored one is stale
+
+Writes ``openapi.yaml``/``openapi.json`` (plus ``.gz``) and a manifest with the
+source fingerprint. Workers pointed at the same directory load it instead of
+generating the schema; a stored bundle whose fingerprint no longer matches the
+code is ignored and rebuilt.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.openapi import generate_schema_bundle, load_bundle, schema_fingerprint, write_bundle
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once and store it with its source fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output-dir", help="Default: OPENAPI_SCHEMA_DIR.")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify that the stored schema matches the current code.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["output_dir"] or getattr(settings, "OPENAPI_SCHEMA_DIR", None)
+        if not directory:
+            raise CommandError("Set OPENAPI_SCHEMA_DIR or pass --output-dir.")
+
+        fingerprint = schema_fingerprint()
+        if load_bundle(directory, fingerprint) is not None:
+            self.stdout.write(f"Schema in {directory} is up to date ({fingerprint}).")
+            return
+        if options["check"]:
+            raise CommandError(f"Schema in {directory} is missing or stale.")
+
+        started = time.perf_counter()
+        bundle = generate_schema_bundle(fingerprint)
+        write_bundle(bundle, directory)
+        sizes = ", ".join(
+            f"{fmt} {len(v.body) / 1024:.1f} KiB ({len(v.gzipped) / 1024:.1f} KiB gzip)"
+            for fmt, v in bundle.variants.items()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote schema {fingerprint} to {directory} in "
+                f"{time.perf_counter() - started:.2f}s: {sizes}"
+            )
+        )
@@ -0,0 +1,60 @@
+"""Run the readiness checks behind ``/readyz`` from the command line.
+
+    python manage.py check_ready                       # once; exit 1 if a check fails
+    python manage.py check_ready --wait 60 --skip migrations   # what scripts/run_web.sh does
+
+With ``--wait`` failed checks are retried until they pass or the time is up,
+sleeping an exponentially growing, jittered interval (capped at
+``--max-delay``) between attempts. ``--skip`` drops checks by name
+(``database:replica_1``) or kind (``database``, ``cache``, ``migrations``).
+Checks that aren't required (replicas, unless ``HEALTH_CHECK_REPLICAS_REQUIRED``)
+are reported but not waited for.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.health import default_checks, readiness
+
+
+class Command(BaseCommand):
+    help = "Check the databases, caches and migrations; optionally wait until they are ready."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wait", type=float, default=0, help="Keep retrying for up to this many seconds."
+        )
+        parser.add_argument("--skip", nargs="+", default=[], metavar="CHECK")
+        parser.add_argument("--max-delay", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        checks = default_checks(skip=tuple(options["skip"]))
+        deadline = time.monotonic() + options["wait"]
+        attempt = 0
+        while True:
+            attempt += 1
+            report = readiness.run(checks)
+            if report.ok:
+                break
+            failures = ", ".join(
+                f"{name} ({report.results[name].error})" for name in report.failures
+            )
+            # Full jitter: instances started together don't retry in lockstep.
+            delay = random.uniform(0, min(options["max_delay"], 0.25 * 2**attempt))
+            if time.monotonic() + delay > deadline:
+                raise CommandError(f"Not ready after {attempt} attempt(s): {failures}")
+            self.stderr.write(
+                f"Not ready (attempt {attempt}): {failures}; retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+        for name, result in report.results.items():
+            if result.ok:
+                self.stdout.write(f"{name}: ok in {result.duration_ms:.1f}ms")
+            else:
+                self.stderr.write(f"{name}: failed, not required ({result.error})")
+        self.stdout.write(self.style.SUCCESS(f"Ready after {attempt} attempt(s)."))
@@ -0,0 +1,69 @@
+"""Run ``migrate`` only when the migration files changed since it last ran.
+
+    python manage.py migrate_if_changed            # what scripts/run_web.sh does
+    python manage.py migrate_if_changed --check    # exit 1 if a migrate is due
+    python manage.py migrate_if_changed --force    # migrate regardless
+
+On a warm start this is one query instead of loading the migration graph and
+checking it against ``django_migrations``. Instances starting at once take
+turns on an advisory lock; the ones that wait find the fingerprint current
+and skip the migrate. See ``apps/core/migration_state.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.core.migration_state import (
+    migration_files_fingerprint,
+    migration_lock,
+    store_fingerprint,
+    stored_fingerprint,
+)
+
+
+class Command(BaseCommand):
+    help = "Apply migrations if the migration files differ from the last migrated fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report whether a migrate is due; exit 1 if it is.",
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Migrate even if the fingerprint matches."
+        )
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        fingerprint = migration_files_fingerprint()
+        if not options["force"] and stored_fingerprint(database) == fingerprint:
+            self.stdout.write(f"Migrations are up to date ({fingerprint}).")
+            return
+        if options["check"]:
+            raise CommandError(f"Migrations changed since the last migrate ({fingerprint}).")
+
+        with migration_lock(database):
+            # Another instance may have migrated while this one waited.
+            if not options["force"] and stored_fingerprint(database) == fingerprint:
+                self.stdout.write(f"Migrations were applied by another instance ({fingerprint}).")
+                return
+            started = time.perf_counter()
+            call_command(
+                "migrate",
+                database=database,
+                interactive=False,
+                verbosity=options["verbosity"],
+            )
+            store_fingerprint(fingerprint, database)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Migrated to {fingerprint} in {time.perf_counter() - started:.2f}s."
+            )
+        )
@@ -0,0 +1,183 @@
+"""Profile a cold start: import times and time to first request.
+
+    python manage.py profile_startup
+    python manage.py profile_startup --path /api/schema/ --top 30
+    python manage.py profile_startup --repeat 5 --json > startup.json
+
+Boots a fresh interpreter with ``-X importtime`` (this process has already
+imported everything), then times each phase of a worker start: loading
+settings, ``django.setup()`` (app registry, ``ready()`` hooks), building the
+WSGI handler (middleware) and serving the first request (URLconf, views).
+Import times are reported per top-level package and for the slowest modules.
+``-X importtime`` adds some overhead, so compare runs with each other rather
+than with production latencies.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PHASES = ("settings", "setup", "handler", "first_request")
+
+BOOT_SCRIPT = """
+import io, json, sys, time
+started = time.perf_counter()
+marks = {}
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+marks["settings"] = time.perf_counter()
+django.setup(set_prefix=False)
+marks["setup"] = time.perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+marks["handler"] = time.perf_counter()
+path = sys.argv[1]
+hosts = [h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")]
+host = hosts[0] if hosts else "localhost"
+if host not in settings.ALLOWED_HOSTS and "*" not in settings.ALLOWED_HOSTS:
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, host]  # only so the probe isn't a 400
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": path, "SCRIPT_NAME": "", "QUERY_STRING": "",
+    "SERVER_NAME": host, "SERVER_PORT": "80", "HTTP_HOST": host,
+    "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    "wsgi.url_scheme": "http", "wsgi.version": (1, 0), "wsgi.multithread": False,
+    "wsgi.multiprocess": True, "wsgi.run_once": False,
+}
+status = []
+body = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+b"".join(body)
+marks["first_request"] = time.perf_counter()
+print(json.dumps({
+    "status": status[0] if status else None,
+    "phases": {name: mark - started for name, mark in marks.items()},
+}))
+"""
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse the ``import time: self | cumulative | name`` lines of ``-X importtime``."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            record = ImportRecord(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            )
+        except ValueError:
+            continue  # the header line
+        records.append(record)
+    return records
+
+
+def summarize_imports(records: list[ImportRecord], top: int) -> dict:
+    by_package: dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.module.partition(".")[0]] += record.self_us
+    slowest = sorted(records, key=lambda r: r.cumulative_us, reverse=True)
+    return {
+        "modules": len(records),
+        "total_ms": round(sum(r.self_us for r in records) / 1000, 1),
+        "packages": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        "slowest": [
+            {
+                "module": r.module,
+                "self_ms": round(r.self_us / 1000, 1),
+                "cumulative_ms": round(r.cumulative_us / 1000, 1),
+            }
+            for r in slowest[:top]
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time and time to first request for a fresh worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/schema/", help="Path of the first request.")
+        parser.add_argument("--top", type=int, default=20, help="Modules/packages to list.")
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Boots to run; phases report the median."
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        runs = [self.boot(options["path"]) for _ in range(max(1, options["repeat"]))]
+        phases = {
+            name: round(statistics.median(run["phases"][name] for run in runs) * 1000, 1)
+            for name in PHASES
+        }
+        report = {
+            "settings_module": os.environ.get("DJANGO_SETTINGS_MODULE"),
+            "path": options["path"],
+            "status": runs[-1]["status"],
+            "phases_ms": phases,
+            "imports": summarize_imports(runs[-1]["imports"], options["top"]),
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(self.format_report(report))
+
+    def boot(self, path: str) -> dict:
+        env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+        env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT, path],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+            check=False,
+        )
+        if completed.returncode != 0:
+            errors = [
+                line for line in completed.stderr.splitlines() if not line.startswith("import time")
+            ]
+            raise CommandError("Startup failed:\n" + "\n".join(errors[-20:]))
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result["imports"] = parse_importtime(completed.stderr)
+        return result
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        imports = report["imports"]
+        lines = [f"Cold start ({report['settings_module']}), first request GET {report['path']}"]
+        lines += [f"  {'phase':<16}{'ms (cumulative)':>16}"]
+        lines += [f"  {name:<16}{ms:>16.1f}" for name, ms in report["phases_ms"].items()]
+        lines.append(f"  status: {report['status']}")
+        lines.append(
+            f"\n{imports['modules']} modules imported, {imports['total_ms']:.1f} ms in total"
+        )
+        lines.append(f"  {'package':<40}{'self ms':>10}")
+        lines += [f"  {name:<40}{ms:>10.1f}" for name, ms in imports["packages"].items()]
+        lines.append(f"\n  {'module':<56}{'self ms':>10}{'cumul ms':>10}")
+        lines += [
+            f"  {r['module']:<56}{r['self_ms']:>10.1f}{r['cumulative_ms']:>10.1f}"
+            for r in imports["slowest"]
+        ]
+        return "\n".join(lines)
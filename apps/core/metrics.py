@@ -0,0 +1,318 @@
+"""Prometheus metrics: requests, DB time and pools, cache hits, auth outcomes.
+
+``apps.core.middleware.MetricsMiddleware`` records every request and
+``metrics_view`` serves the result at ``/metrics`` in the text exposition
+format:
+
+- ``http_requests_total{view, method, status}`` and
+  ``http_request_duration_seconds{view, method}`` (histogram);
+- ``http_request_db_seconds{view}`` (histogram) and ``db_queries_total{view}``,
+  from ``SQLInstrumentationMiddleware``'s ``request.sql_stats``;
+- ``cache_requests_total{cache, namespace, result}`` (``l1_hit``, ``l2_hit``,
+  ``miss``), copied from ``tiered_cache_stats()`` at most every
+  ``SYNC_INTERVAL`` seconds; the hit ratio is a PromQL division;
+- ``db_pool_connections{alias, state}`` (``idle``/``in_use``) and
+  ``db_pool_requests_waiting{alias}`` gauges, and ``db_pool_checkouts_total``,
+  ``db_pool_checkout_wait_seconds_total`` and ``db_pool_checkout_timeouts_total``
+  counters, from the psycopg pools' ``get_stats()`` (``DATABASE_POOL``), synced
+  the same way; the mean checkout wait is a PromQL division;
+- ``auth_events_total{event, outcome}`` for views declared with
+  ``@auth_metric("login")`` etc.: ``success`` below status 400, else ``failure``.
+
+Views are labelled by URL name (``<unresolved>`` for 404s), never by path, so
+label cardinality stays bounded.
+
+Under gunicorn each worker writes its samples to memory-mapped files in
+``PROMETHEUS_MULTIPROC_DIR`` (set up by ``config/gunicorn.py``) and a scrape of
+any worker sums the files of all of them. When a worker exits, its counters
+and histograms are folded into one archive file per type so recycled workers
+don't leave a file each behind. Without the variable, ``/metrics`` reports
+this process only.
+
+prometheus_client is imported on first use, so nothing is loaded unless
+``METRICS_ENABLED`` installs the middleware and route.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .cache import tiered_cache_stats
+from .db import pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SYNC_INTERVAL = 1.0
+UNRESOLVED_VIEW = "<unresolved>"
+# Counters and histograms of exited workers, summed by the collector like any worker's.
+ARCHIVED_TYPES = ("counter", "histogram")
+
+_metrics: Metrics | None = None
+_metrics_lock = threading.Lock()
+
+
+def auth_metric(event: str):
+    """Count a view's responses as ``auth_events_total{event=...}``."""
+
+    def decorator(view):
+        view.auth_metric = event
+        return view
+
+    return decorator
+
+
+def get_auth_metric(view_func) -> str | None:
+    """The event declared on a resolved view callable or its class, if any."""
+    for candidate in (
+        view_func,
+        getattr(view_func, "view_class", None),
+        getattr(view_func, "cls", None),
+    ):
+        event = getattr(candidate, "auth_metric", None)
+        if event is not None:
+            return event
+    return None
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+class Metrics:
+    """The project's metric families, with label children cached per label set."""
+
+    def __init__(self, registry=None):
+        from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+        registry = registry or REGISTRY
+        self.requests = Counter(
+            "http_requests",
+            "HTTP responses by view, method and status.",
+            ["view", "method", "status"],
+            registry=registry,
+        )
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "Time to produce a response, by view and method.",
+            ["view", "method"],
+            buckets=LATENCY_BUCKETS,
+            registry=registry,
+        )
+        self.db_time = Histogram(
+            "http_request_db_seconds",
+            "Database time per request, by view.",
+            ["view"],
+            buckets=LATENCY_BUCKETS,
+            registry=registry,
+        )
+        self.db_queries = Counter(
+            "db_queries", "SQL queries issued by requests, by view.", ["view"], registry=registry
+        )
+        self.cache_requests = Counter(
+            "cache_requests",
+            "Tiered cache reads by cache, key namespace and result.",
+            ["cache", "namespace", "result"],
+            registry=registry,
+        )
+        self.auth_events = Counter(
+            "auth_events",
+            "Authentication outcomes (login, token refresh, ...).",
+            ["event", "outcome"],
+            registry=registry,
+        )
+        # Gauges are per worker; /metrics sums the live workers' values.
+        self.pool_connections = Gauge(
+            "db_pool_connections",
+            "Connections held by the database pools, by alias and state.",
+            ["alias", "state"],
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.pool_waiting = Gauge(
+            "db_pool_requests_waiting",
+            "Threads waiting for a pooled database connection.",
+            ["alias"],
+            multiprocess_mode="livesum",
+            registry=registry,
+        )
+        self.pool_checkouts = Counter(
+            "db_pool_checkouts",
+            "Connections taken from the database pools.",
+            ["alias"],
+            registry=registry,
+        )
+        self.pool_wait = Counter(
+            "db_pool_checkout_wait_seconds",
+            "Time spent waiting for a pooled connection.",
+            ["alias"],
+            registry=registry,
+        )
+        self.pool_timeouts = Counter(
+            "db_pool_checkout_timeouts",
+            "Checkouts that gave up after DATABASE_POOL_TIMEOUT.",
+            ["alias"],
+            registry=registry,
+        )
+        self._children: dict[tuple, tuple] = {}
+        self._seen: dict[tuple, float] = {}
+        self._sync_lock = threading.Lock()
+        self._next_sync = 0.0
+
+    def observe_request(self, request, response, duration: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else UNRESOLVED_VIEW
+        key = (view, request.method, response.status_code)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children.setdefault(
+                key,
+                (
+                    self.requests.labels(view, request.method, str(response.status_code)),
+                    self.latency.labels(view, request.method),
+                    self.db_time.labels(view),
+                    self.db_queries.labels(view),
+                ),
+            )
+        requests, latency, db_time, db_queries = children
+        requests.inc()
+        latency.observe(duration)
+        sql_stats = getattr(request, "sql_stats", None)
+        if sql_stats is not None:
+            db_time.observe(sql_stats.duration)
+            if sql_stats.count:
+                db_queries.inc(sql_stats.count)
+        event = getattr(request, "auth_metric", None)
+        if event is not None:
+            outcome = "success" if response.status_code < 400 else "failure"
+            self.auth_events.labels(event, outcome).inc()
+        self.sync()
+
+    def sync(self, force: bool = False) -> None:
+        """Copy the tiered cache and connection pool statistics into the metrics.
+
+        Throttled to once per ``SYNC_INTERVAL`` unless ``force``.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        if not self._sync_lock.acquire(blocking=force):
+            return  # another thread is syncing
+        try:
+            self._next_sync = now + SYNC_INTERVAL
+            self._sync_cache_stats()
+            self._sync_pool_stats()
+        finally:
+            self._sync_lock.release()
+
+    def _add_since_last_sync(self, child, key: tuple, total: float) -> None:
+        delta = total - self._seen.get(key, 0)
+        if delta > 0:
+            child.inc(delta)
+        # A negative delta is a reset (reset_stats(), a new pool): restart from the new value.
+        self._seen[key] = total
+
+    def _sync_cache_stats(self) -> None:
+        for location, namespaces in tiered_cache_stats().items():
+            for namespace, stats in namespaces.items():
+                for field, result in (
+                    ("l1_hits", "l1_hit"),
+                    ("l2_hits", "l2_hit"),
+                    ("misses", "miss"),
+                ):
+                    self._add_since_last_sync(
+                        self.cache_requests.labels(location or "default", namespace, result),
+                        ("cache", location, namespace, result),
+                        stats[field],
+                    )
+
+    def _sync_pool_stats(self) -> None:
+        for alias, stats in pool_stats().items():
+            size, idle = stats.get("pool_size", 0), stats.get("pool_available", 0)
+            self.pool_connections.labels(alias, "idle").set(idle)
+            self.pool_connections.labels(alias, "in_use").set(size - idle)
+            self.pool_waiting.labels(alias).set(stats.get("requests_waiting", 0))
+            for counter, field, scale in (
+                (self.pool_checkouts, "requests_num", 1),
+                (self.pool_wait, "requests_wait_ms", 1000),
+                (self.pool_timeouts, "requests_errors", 1),
+            ):
+                self._add_since_last_sync(
+                    counter.labels(alias), ("pool", alias, field), stats.get(field, 0) / scale
+                )
+
+
+def get_metrics() -> Metrics:
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = Metrics()
+    return _metrics
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition-format body and content type: all workers' samples, or this process's."""
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+    from prometheus_client.multiprocess import MultiProcessCollector
+
+    get_metrics().sync(force=True)
+    path = multiprocess_dir()
+    if path is None:
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=path)
+    try:
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    except FileNotFoundError:  # an exited worker's file was archived mid-scrape
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def archive_worker(pid: int, path: str | None = None) -> None:
+    """Fold an exited worker's counter/histogram files into the archive files.
+
+    Call from the process manager (gunicorn's ``child_exit``), one at a time.
+    Live gauges of the worker are removed as prometheus_client expects.
+    """
+    from prometheus_client import multiprocess
+    from prometheus_client.mmap_dict import MmapedDict
+
+    path = path or multiprocess_dir()
+    if path is None:
+        return
+    for kind in ARCHIVED_TYPES:
+        worker_file = os.path.join(path, f"{kind}_{pid}.db")
+        if not os.path.exists(worker_file):
+            continue
+        archive = MmapedDict(os.path.join(path, f"{kind}_archive.db"))
+        try:
+            for key, value, timestamp, _pos in MmapedDict.read_all_values_from_file(worker_file):
+                current, _ = archive.read_value(key)
+                archive.write_value(key, current + value, timestamp)
+        finally:
+            archive.close()
+        os.remove(worker_file)
+    multiprocess.mark_process_dead(pid, path)
+
+
+def reset_multiprocess_dir(path: str) -> None:
+    """Empty (creating it if needed) the directory at master start-up."""
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def metrics_view(request):
+    """``GET /metrics``; with ``METRICS_TOKEN`` set, only for ``Bearer <token>``."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,119 @@
+"""Project-wide middleware."""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .logs import REQUEST_ID_HEADER, RequestContext, current_request, request_id_for
+from .metrics import get_auth_metric, get_metrics
+from .sql import QueryBudgetExceeded, QueryRecorder, current_queries, get_query_budget
+
+sql_logger = logging.getLogger("apps.core.sql")
+
+
+class RequestContextMiddleware:
+    """Give the request an id and expose it to logging for its duration.
+
+    The id is the caller's ``X-Request-ID`` when well-formed, otherwise a new
+    one; it is set as ``request.request_id`` and echoed in the response.
+    ``RequestContextFilter`` adds it, the user id, view name and elapsed time
+    to every record logged meanwhile. Keep it first in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.request_id = request_id_for(request)
+        token = current_request.set(RequestContext(request, request.request_id))
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+
+class MetricsMiddleware:
+    """Record latency, status, DB time and auth outcome for every request.
+
+    Metrics are defined and served by ``apps.core.metrics``. Place it outside
+    ``SQLInstrumentationMiddleware`` so the request's SQL stats are complete
+    when it reads them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.metrics = get_metrics()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.metrics.observe_request(request, response, time.perf_counter() - started)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.auth_metric = get_auth_metric(view_func)
+
+
+class SQLInstrumentationMiddleware:
+    """Count queries, DB time and the slowest statement for every request.
+
+    Results are attached as ``request.sql_stats``, logged as one structured
+    record per request (``db_*`` fields in the JSON log), optionally exposed
+    as a ``Server-Timing`` header, and checked against the view's declared
+    query budget. Keep it first in MIDDLEWARE so every query is counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.sql_stats = recorder
+        request.query_budget = None
+        token = current_queries.set(recorder)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            current_queries.reset(token)
+
+        if getattr(settings, "SQL_SERVER_TIMING", False):
+            response["Server-Timing"] = (
+                f'db;dur={recorder.duration_ms};desc="{recorder.count} queries"'
+            )
+        if getattr(settings, "SQL_LOG_REQUESTS", True):
+            sql_logger.info(
+                "%s %s: %d queries in %.1fms",
+                request.method,
+                request.path,
+                recorder.count,
+                recorder.duration_ms,
+                extra={"path": request.path, "method": request.method, **recorder.as_log_fields()},
+            )
+        self.check_budget(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func)
+
+    @staticmethod
+    def check_budget(request, recorder: QueryRecorder) -> None:
+        budget = request.query_budget
+        if budget is None or recorder.count <= budget:
+            return
+        message = (
+            f"{request.method} {request.path} issued {recorder.count} queries, "
+            f"budget is {budget} (slowest: {recorder.slowest_sql})"
+        )
+        if getattr(settings, "SQL_QUERY_BUDGETS_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        sql_logger.warning(message, extra=recorder.as_log_fields())
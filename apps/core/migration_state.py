@@ -0,0 +1,104 @@
+"""Skip ``migrate`` when the migration files haven't changed since the last run.
+
+``migration_files_fingerprint()`` hashes the migration modules of every
+installed app, read from disk without loading the migration graph. After a
+full ``migrate`` the fingerprint is stored in ``MigrationFingerprint``; on
+the next start ``manage.py migrate_if_changed`` compares the two with one
+query and only migrates when they differ.
+
+Instances starting together take turns on a PostgreSQL advisory lock: the
+first applies the migrations, the others wait, re-read the fingerprint and
+find it current. Any other ``migrate`` that applies or unapplies something
+(e.g. rolling an app back by hand) drops the stored fingerprint, so the next
+``migrate_if_changed`` runs ``migrate`` again rather than trusting it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+
+from .models import MigrationFingerprint
+
+# pg_advisory_lock() key, shared by every instance of the app.
+MIGRATION_LOCK_ID = 0x6D696772617465  # "migrate"
+LOCK_POLL_INTERVAL = 0.5
+
+
+def migration_files_fingerprint() -> str:
+    """Hash of the migration modules of the installed apps."""
+    digest = hashlib.sha256()
+    for app_config in sorted(apps.get_app_configs(), key=lambda config: config.label):
+        module_name, _explicit = MigrationLoader.migrations_module(app_config.label)
+        if module_name is None:
+            continue  # migrations disabled in MIGRATION_MODULES
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ModuleNotFoundError:
+            continue
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for directory in spec.submodule_search_locations:
+            for path in sorted(Path(directory).glob("*.py")):
+                digest.update(f"{app_config.label}/{path.name}".encode())
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()[:32]
+
+
+def stored_fingerprint(using: str = DEFAULT_DB_ALIAS) -> str | None:
+    """The fingerprint of the last ``migrate_if_changed``, if it still holds."""
+    try:
+        return (
+            MigrationFingerprint.objects.using(using).values_list("fingerprint", flat=True).first()
+        )
+    except DatabaseError:
+        return None  # never migrated: the table doesn't exist yet
+
+
+def store_fingerprint(fingerprint: str, using: str = DEFAULT_DB_ALIAS) -> None:
+    MigrationFingerprint.objects.using(using).update_or_create(
+        pk=1, defaults={"fingerprint": fingerprint}
+    )
+
+
+def forget_fingerprint(sender, using=DEFAULT_DB_ALIAS, plan=None, **kwargs) -> None:
+    """``pre_migrate`` receiver: a migrate that changes the schema invalidates it."""
+    if not plan:
+        return
+    table = MigrationFingerprint._meta.db_table
+    connection = connections[using]
+    if table in connection.introspection.table_names():
+        MigrationFingerprint.objects.using(using).all().delete()
+
+
+@contextmanager
+def migration_lock(using: str = DEFAULT_DB_ALIAS):
+    """Hold a session-level advisory lock, so one instance migrates at a time.
+
+    Only PostgreSQL has one; elsewhere (SQLite in development) this does nothing.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        yield
+        return
+    # Poll rather than block in pg_advisory_lock(): a waiting statement is an
+    # open transaction, and CREATE INDEX CONCURRENTLY in the migrations being
+    # applied waits for every open transaction to end: a deadlock.
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+            if cursor.fetchone()[0]:
+                break
+        time.sleep(LOCK_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class MigrationFingerprint(models.Model):
+    """Hash of the migration files the database was last fully migrated to.
+
+    A single row, written by ``manage.py migrate_if_changed`` and dropped by
+    any ``migrate`` that changes the schema (see ``migration_state.py``).
+    """
+
+    fingerprint = models.CharField(max_length=64)
+    applied_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.fingerprint
@@ -0,0 +1,228 @@
+"""Precomputed OpenAPI schema.
+
+drf-spectacular rebuilds the whole schema on every ``/api/schema/`` request,
+which costs hundreds of milliseconds and is not safe under concurrent
+requests. Instead the schema is generated once per fingerprint, rendered to
+YAML and JSON, gzipped, and kept in memory with a strong ETag per body.
+
+The fingerprint covers what the schema is derived from: the source of every
+local app that serves a routed view (views, serializers, schema extensions,
+URLconfs), the versions of third-party packages that do, and the
+REST_FRAMEWORK/SPECTACULAR_SETTINGS. When ``OPENAPI_SCHEMA_DIR`` is set the
+rendered bundle is also read from / written to that directory, so
+``manage.py build_openapi_schema`` can produce it ahead of time and workers
+only regenerate it when the code it was built from has changed.
+
+``AutoSchema`` is the project's DEFAULT_SCHEMA_CLASS. DRF imports it the first
+time a view's schema is needed, and importing it imports every installed
+app's ``schema`` module (drf-spectacular extensions), so the extensions are
+registered in time for schema generation without being loaded at worker boot.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+from importlib import metadata
+from pathlib import Path
+from typing import NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from django.utils.http import quote_etag
+from django.utils.module_loading import autodiscover_modules
+from drf_spectacular.openapi import AutoSchema as SpectacularAutoSchema
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+autodiscover_modules("schema")
+
+MANIFEST_NAME = "manifest.json"
+
+
+class AutoSchema(SpectacularAutoSchema):
+    pass
+
+
+class SchemaVariant(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+
+class SchemaBundle(NamedTuple):
+    fingerprint: str
+    variants: dict[str, SchemaVariant]
+
+
+def make_variant(body: bytes) -> SchemaVariant:
+    # mtime=0 keeps the gzip bytes, and so their ETag, stable across builds.
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    return SchemaVariant(
+        body=body,
+        gzipped=gzipped,
+        etag=quote_etag(hashlib.sha256(body).hexdigest()[:32]),
+        gzip_etag=quote_etag(hashlib.sha256(gzipped).hexdigest()[:32]),
+    )
+
+
+def iter_view_classes(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns)
+        else:
+            callback = pattern.callback
+            yield getattr(callback, "cls", None) or getattr(callback, "view_class", callback)
+
+
+def _package_version(module_name: str) -> str:
+    top = module_name.partition(".")[0]
+    version = getattr(sys.modules.get(top), "__version__", None)
+    if version is None:
+        for dist in metadata.packages_distributions().get(top, ()):
+            version = metadata.version(dist)
+            break
+    return f"{top}=={version or ''}"
+
+
+def schema_fingerprint(urlconf: str | None = None) -> str:
+    """Hash of everything the generated schema depends on."""
+    urlconf = urlconf or settings.ROOT_URLCONF
+    base_dir = Path(settings.BASE_DIR).resolve()
+    resolver = get_resolver(urlconf)
+    local_files: set[Path] = {Path(inspect.getfile(resolver.urlconf_module)).resolve()}
+    packages: set[str] = {_package_version("drf_spectacular")}
+
+    for view in iter_view_classes(resolver.url_patterns):
+        module = inspect.getmodule(view)
+        if module is None or not getattr(module, "__file__", None):
+            continue
+        path = Path(module.__file__).resolve()
+        if not path.is_relative_to(base_dir):
+            packages.add(_package_version(module.__name__))
+            continue
+        app_config = apps.get_containing_app_config(module.__name__)
+        if app_config is None:
+            local_files.add(path)
+        else:
+            local_files.update(
+                p.resolve()
+                for p in Path(app_config.path).rglob("*.py")
+                if "migrations" not in p.parts and "tests" not in p.parts
+            )
+
+    digest = hashlib.sha256()
+    for name in sorted(packages):
+        digest.update(name.encode())
+    for path in sorted(local_files):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    for name in ("REST_FRAMEWORK", "SPECTACULAR_SETTINGS"):
+        value = getattr(settings, name, {})
+        digest.update(json.dumps(value, sort_keys=True, default=repr).encode())
+    return digest.hexdigest()[:32]
+
+
+def generate_schema_bundle(fingerprint: str | None = None) -> SchemaBundle:
+    """Generate the schema the way ``SpectacularAPIView`` does and render it."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF
+    )
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return SchemaBundle(
+        fingerprint=fingerprint or schema_fingerprint(),
+        variants={
+            "yaml": make_variant(OpenApiYamlRenderer().render(schema, renderer_context={})),
+            "json": make_variant(OpenApiJsonRenderer().render(schema, renderer_context={})),
+        },
+    )
+
+
+def write_bundle(bundle: SchemaBundle, directory: str | Path) -> Path:
+    """Write ``openapi.<fmt>`` and ``.gz`` files plus a manifest; return the manifest path."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for fmt, variant in bundle.variants.items():
+        _write_atomic(directory / f"openapi.{fmt}", variant.body)
+        _write_atomic(directory / f"openapi.{fmt}.gz", variant.gzipped)
+    # Written last so readers never see a manifest ahead of its files.
+    manifest = directory / MANIFEST_NAME
+    payload = {"fingerprint": bundle.fingerprint, "formats": list(bundle.variants)}
+    _write_atomic(manifest, json.dumps(payload).encode())
+    return manifest
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Several workers may write the same bundle at once; rename is atomic.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def load_bundle(directory: str | Path, fingerprint: str) -> SchemaBundle | None:
+    """Return the bundle stored in ``directory`` if it was built for ``fingerprint``."""
+    directory = Path(directory)
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text())
+        if manifest.get("fingerprint") != fingerprint:
+            return None
+        variants = {
+            fmt: make_variant((directory / f"openapi.{fmt}").read_bytes())
+            for fmt in manifest["formats"]
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+    return SchemaBundle(fingerprint, variants)
+
+
+class SchemaCache:
+    """Process-wide holder of the rendered schema, built at most once."""
+
+    def __init__(self, directory: str | Path | None = None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._bundle: SchemaBundle | None = None
+        self.generations = 0
+
+    @property
+    def directory(self) -> str | Path | None:
+        if self._directory is not None:
+            return self._directory
+        return getattr(settings, "OPENAPI_SCHEMA_DIR", None)
+
+    def get(self) -> SchemaBundle:
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        with self._lock:
+            if self._bundle is None:
+                self._bundle = self._load_or_generate()
+            return self._bundle
+
+    def _load_or_generate(self) -> SchemaBundle:
+        fingerprint = schema_fingerprint()
+        directory = self.directory
+        if directory and (bundle := load_bundle(directory, fingerprint)) is not None:
+            return bundle
+        bundle = generate_schema_bundle(fingerprint)
+        self.generations += 1
+        if directory:
+            try:
+                write_bundle(bundle, directory)
+            except OSError:
+                pass  # a read-only directory only costs the next worker a rebuild
+        return bundle
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bundle = None
+
+
+openapi_schema = SchemaCache()
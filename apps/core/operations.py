@@ -0,0 +1,69 @@
+"""Migration operations shared by the apps."""
+
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """AddIndex that doesn't lock writes while building on PostgreSQL.
+
+    Elsewhere it is a plain AddIndex. Migrations using it need ``atomic = False``
+    (CREATE INDEX CONCURRENTLY can't run inside a transaction).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class AddConstraintConcurrently(migrations.AddConstraint):
+    """AddConstraint whose unique index is built without locking writes on PostgreSQL.
+
+    For constraints PostgreSQL enforces through a unique index (expressions,
+    conditions, included columns); elsewhere it is a plain AddConstraint, and
+    migrations using it need ``atomic = False``. A failed concurrent build
+    leaves an INVALID index behind under the constraint's name, so any index
+    of that name is dropped first and running the migration again recovers.
+    """
+
+    sql_create_unique_index_concurrently = (
+        "CREATE UNIQUE INDEX CONCURRENTLY %(name)s ON %(table)s "
+        "(%(columns)s)%(include)s%(nulls_distinct)s%(condition)s"
+    )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        statement = self.constraint.create_sql(model, schema_editor)
+        if statement.template != schema_editor.sql_create_unique_index:
+            raise ValueError(
+                f"{self.constraint.name} isn't built as a unique index; use AddConstraint."
+            )
+        statement.template = self.sql_create_unique_index_concurrently
+        self._drop_index(schema_editor)
+        schema_editor.execute(statement)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            self._drop_index(schema_editor)
+
+    def _drop_index(self, schema_editor):
+        schema_editor.execute(
+            schema_editor.sql_delete_index_concurrently
+            % {"name": schema_editor.quote_name(self.constraint.name)}
+        )
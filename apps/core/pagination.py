@@ -0,0 +1,139 @@
+"""Keyset ("seek") pagination, the project's default paginator.
+
+Pages are fetched with ``WHERE a >= :a AND (a > :a OR (a = :a AND b > :b))
+ORDER BY a, b LIMIT n + 1`` (the row comparison ``(a, b) > (:a, :b)`` spelled
+with ``Q`` objects; the redundant ``a >= :a`` bounds the index scan) instead
+of ``OFFSET``, so page 1000 costs the same as page 1
+(one index range scan over the ordering columns) and no ``COUNT(*)`` is run.
+The cursor is the ordering values of the last row seen, encoded as an opaque
+token; ``next``/``previous`` links carry it.
+
+The ordering must use non-null columns sorted the same way and end in a
+unique one (the primary key by default), so every row's position is unambiguous.
+Subclass and set ``ordering`` per endpoint, with a matching composite index.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import NamedTuple
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursor(NamedTuple):
+    position: tuple
+    reverse: bool
+
+
+class KeysetPagination(CursorPagination):
+    ordering = ("pk",)
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+        if len({name.startswith("-") for name in ordering}) > 1:
+            raise ImproperlyConfigured(f"{type(self).__name__}: mixed ordering directions")
+        last = ordering[-1].lstrip("-")
+        opts = queryset.model._meta
+        if last != "pk" and not opts.get_field(last).unique:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}: the last ordering field must be unique, not {last!r}"
+            )
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        opts = queryset.model._meta
+        self.names = [name.lstrip("-") for name in self.ordering]
+        self.fields = [opts.pk if name == "pk" else opts.get_field(name) for name in self.names]
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        descending = self.ordering[0].startswith("-") != reverse
+        queryset = queryset.order_by(*(("-" if descending else "") + n for n in self.names))
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                keyset_after(self.names, self.cursor.position, "lt" if descending else "gt")
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else self.cursor is not None
+        return self.page
+
+    def position_of(self, row) -> tuple:
+        if isinstance(row, dict):
+            return tuple(row[name] for name in self.names)
+        return tuple(getattr(row, name) for name in self.names)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.position_of(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(KeysetCursor(position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position_of(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(KeysetCursor(position, reverse=True))
+
+    def encode_cursor(self, cursor: KeysetCursor) -> str:
+        payload = {"p": [_dump(value) for value in cursor.position], "r": int(cursor.reverse)}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token.decode().rstrip("=")
+        )
+
+    def decode_cursor(self, request) -> KeysetCursor | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            values = payload["p"]
+            if len(values) != len(self.fields):
+                raise ValueError("cursor does not match the ordering")
+            position = tuple(
+                field.to_python(value) for field, value in zip(self.fields, values, strict=True)
+            )
+            return KeysetCursor(position, reverse=bool(payload.get("r")))
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+
+def keyset_after(names, position, op: str = "gt") -> Q:
+    """Rows after ``position`` in ``names`` order: ``(names) > (position)`` for ``gt``."""
+    after = Q()
+    equal = {}
+    for name, value in zip(names, position, strict=True):
+        after |= Q(**equal, **{f"{name}__{op}": value})
+        equal[name] = value
+    return Q(**{f"{names[0]}__{op}e": position[0]}) & after
+
+
+def _dump(value):
+    """JSON-safe cursor value that ``field.to_python()`` reads back exactly."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()  # keeps microseconds, unlike DjangoJSONEncoder
+    return str(value)
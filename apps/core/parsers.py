@@ -0,0 +1,47 @@
+"""``FastJSONParser``: DRF's ``JSONParser`` decoding with orjson when it is installed.
+
+It returns the same data and raises the same ``ParseError`` as ``JSONParser``.
+orjson decodes UTF-8 bodies; anything it rejects is parsed again by
+``JSONParser``, which then either raises the usual error or accepts what
+orjson doesn't (``NaN`` with ``STRICT_JSON`` off, numbers out of float range).
+Bodies with integers of 19 digits or more go straight to ``JSONParser``:
+orjson would read those beyond 64 bits as floats.
+"""
+
+from __future__ import annotations
+
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # the fast-json extra
+    orjson = None
+
+_LONG_NUMBER = re.compile(rb"\d{19}")
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if orjson is None or stream is None or not _is_utf8(parser_context):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if not _LONG_NUMBER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+def _is_utf8(parser_context) -> bool:
+    encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
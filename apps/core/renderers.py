@@ -0,0 +1,192 @@
+"""Renderers: JSON through orjson when it is installed, NDJSON and CSV.
+
+``FastJSONRenderer`` (the default, see ``config/settings/restframework.py``)
+renders what DRF's ``JSONRenderer`` renders, byte for byte, using orjson when
+the ``fast-json`` extra is installed and DRF's encoder otherwise. orjson
+encodes containers, strings, ints, floats and UUIDs itself; datetimes,
+decimals, lazy strings and every other type go through DRF's
+``JSONEncoder.default`` as before, with the floats it returns written by
+``repr``. Output orjson would write differently - a float below 1e-4, an
+integer beyond 64 bits, anything it refuses to encode - is rendered again
+with the standard library, as are indented responses
+(``Accept: application/json; indent=4``). The one difference: NaN and
+infinite floats, which ``JSONRenderer`` refuses with ``STRICT_JSON``, are
+written as ``null`` (finding them would take a second pass over the data);
+a ``Decimal("NaN")`` is still refused.
+
+NDJSON (``application/x-ndjson``) is one compact JSON document per line,
+encoded like DRF's ``JSONRenderer`` (``UNICODE_JSON``, DRF's encoder for
+dates, UUIDs, decimals ...). Streaming views write ``ndjson_line()`` /
+``csv_lines()`` into a ``StreamingResponse`` (``apps/core/streaming.py``);
+the renderers let the same views be negotiated (``Accept``, ``?format=``) and
+render their error responses.
+
+CSV cells that a spreadsheet would run as a formula (text starting with
+``=``, ``+``, ``-``, ``@``, a tab or a carriage return) are written with a
+leading ``'``, so user-supplied names open as text: the quote is part of the
+value for anything else reading the file.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Sequence
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # the fast-json extra
+    orjson = None
+
+if orjson is not None and not hasattr(orjson, "Fragment"):
+    orjson = None  # before 3.9 there is no way to keep Decimal output as it was
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Spreadsheets evaluate cells starting with these (CSV/formula injection).
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+)
+
+
+def fast_dumps(data, encoder_class: type[json.JSONEncoder] = JSONEncoder) -> bytes | None:
+    """``data`` as compact, unescaped, strict JSON, or ``None`` to use ``json.dumps``.
+
+    ``None`` when orjson isn't installed, can't encode ``data``, or would
+    write it differently from the standard library.
+    """
+    if orjson is None:
+        return None
+    default = encoder_class().default
+
+    def encode(obj):
+        value = default(obj)
+        if isinstance(value, float):  # e.g. from a Decimal
+            # Python's repr, and ValueError (not inf) for NaN, as json.dumps does.
+            return orjson.Fragment(json.dumps(value, allow_nan=False).encode())
+        return value
+
+    try:
+        ret = orjson.dumps(data, default=encode, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None
+    if _floats_differ(ret):
+        return None
+    # What JSONRenderer does, for output that is a strict JavaScript subset.
+    # (One byte first: searching for three is slower than encoding.)
+    if b"\xe2" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+def _floats_differ(ret: bytes) -> bool:
+    """Whether ``ret`` may hold a float orjson writes differently from ``repr``.
+
+    Those are 1e-05 to 1e-06 (orjson: ``0.00001``) and 1e-07 to 1e-09
+    (``1e-7``). Look-alikes in strings only cost a second render; a UUID's
+    ``...5e-4a...`` doesn't count, as a number ends at ``,``, ``]`` or ``}``.
+    """
+    if b".0000" in ret:
+        return True
+    at = ret.find(b"e-")
+    while at != -1:
+        if (
+            ret[at - 1 : at].isdigit()
+            and ret[at + 2 : at + 3].isdigit()
+            and ret[at + 3 : at + 4] in (b"", b",", b"]", b"}")
+        ):
+            return True
+        at = ret.find(b"e-", at + 2)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` using orjson when it is installed; the output is the same."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        ):
+            ret = fast_dumps(data, self.encoder_class)
+            if ret is not None:
+                return ret
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def ndjson_line(obj) -> bytes:
+    if api_settings.UNICODE_JSON and api_settings.STRICT_JSON:
+        line = fast_dumps(obj)
+        if line is not None:
+            return line + b"\n"
+    line = json.dumps(
+        obj,
+        cls=JSONEncoder,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(",", ":"),
+    )
+    return (line.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029") + "\n").encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = NDJSON_MEDIA_TYPE
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, list):
+            return b"".join(ndjson_line(item) for item in data)
+        return ndjson_line(data)
+
+
+def csv_lines(rows: Iterable[Sequence]) -> bytes:
+    """``rows`` as CSV records (``None`` as an empty cell, formulas escaped)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+    """A header row from the keys, then a record per dict (one for a single dict)."""
+
+    media_type = CSV_MEDIA_TYPE
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not data:
+            return b""
+        records = data if isinstance(data, list) else [data]
+        header = list(records[0])
+        return csv_lines(
+            [header, *([_cell(record.get(name)) for name in header] for record in records)]
+        )
+
+
+def _cell(value):
+    # Error details are lists of messages.
+    return " ".join(map(str, value)) if isinstance(value, list) else value
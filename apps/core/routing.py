@@ -0,0 +1,130 @@
+"""Read replicas: ``DATABASE_REPLICA_URLS`` aliases behind ``ReplicaRouter``.
+
+Reads go to a replica only inside ``replica_reads(user_id)`` or through
+``.using(read_alias(user_id))``, which the hot read paths opt into
+(``CurrentUserView``, the JWT user-state lookup, admin changelists);
+everything else, and every write, uses ``default``. Code that
+reads and then writes (registration, login, token rotation) therefore never
+acts on a lagging copy.
+
+Read-your-writes: a user who writes stays on the primary for
+``DATABASE_REPLICA_STICKINESS`` seconds, so they don't see their change
+disappear while it replicates. A user is pinned when their row is saved or
+deleted (``custom_user.signals``) and when a request they are authenticated
+for writes anything (``ReplicaRouter.db_for_write``). Pins live in the
+default cache so all workers see them; that takes a shared ``CACHE_URL``
+(with the per-process default, only the worker that handled the write does).
+
+Without ``DATABASE_REPLICA_URLS`` the router isn't installed and both
+always pick ``default``.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .logs import current_request
+
+PIN_KEY = "db:primary-pin:{}"
+
+# Alias the current replica_reads() block reads from.
+_read_alias: ContextVar[str | None] = ContextVar("replica_read_alias", default=None)
+
+
+def replica_aliases() -> list[str]:
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+class PrimaryPins:
+    """Users whose reads stay on the primary for a while after they wrote."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        # Pins made by this process: skips the cache for our own users and
+        # stops every write of a request from re-setting the same pin.
+        self._local: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def window(self) -> float:
+        return getattr(settings, "DATABASE_REPLICA_STICKINESS", 5)
+
+    def pin(self, user_id) -> None:
+        if user_id is None or not replica_aliases() or self.window <= 0:
+            return
+        key, now = str(user_id), time.time()
+        until = self._local.get(key, 0.0)
+        if until - now > self.window / 2:
+            return  # pinned recently enough
+        until = now + self.window
+        with self._lock:
+            if len(self._local) >= self.maxsize:
+                self._local = {k: v for k, v in self._local.items() if v > now}
+            self._local[key] = until
+        cache.set(PIN_KEY.format(key), until, timeout=self.window)
+
+    def is_pinned(self, user_id) -> bool:
+        if user_id is None:
+            return False
+        key, now = str(user_id), time.time()
+        if self._local.get(key, 0.0) > now:
+            return True
+        # The value is the deadline: an L1 copy may outlive the cache timeout.
+        return cache.get(PIN_KEY.format(key), 0.0) > now
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+primary_pins = PrimaryPins()
+
+
+def read_alias(user_id=None) -> str:
+    """Alias to read from for ``user_id``: a replica, or the primary if they are pinned.
+
+    For querysets evaluated after the code that builds them returns (e.g. by
+    a template), pass it to ``.using()`` rather than relying on ``replica_reads()``.
+    """
+    replicas = replica_aliases()
+    if not replicas or primary_pins.is_pinned(user_id):
+        return DEFAULT_DB_ALIAS
+    return random.choice(replicas)
+
+
+@contextmanager
+def replica_reads(user_id=None):
+    """Send this block's reads to ``read_alias(user_id)``, which it yields."""
+    alias = read_alias(user_id)
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Route reads inside ``replica_reads()`` to its replica, all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        context = current_request.get()
+        if context is not None:
+            primary_pins.pin(context.user_id())
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
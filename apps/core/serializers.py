@@ -0,0 +1,110 @@
+"""Fast read path for ``ModelSerializer`` output, built from ``.values()`` rows.
+
+DRF serializes a list by building a model instance per row, then calling
+``get_attribute()`` and ``to_representation()`` for every field of every row.
+``ValuesReader`` resolves a serializer's readable fields to model columns once,
+selects only those columns with ``.values()`` and turns each row into the same
+dict the serializer would produce: text and integer columns are copied as-is,
+ISO 8601 datetimes are converted with the timezone resolved once per call
+instead of once per value, and every other field still goes through its own
+``to_representation()``.
+
+Only serializers whose readable fields map straight onto concrete, non-relation
+columns can be compiled; anything else raises ``ImproperlyConfigured``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+# Field classes whose to_representation() is exactly str() / int().
+_PASSTHROUGH = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.IntegerField: int,
+}
+
+
+class ValuesReader:
+    """Read-only representation of ``serializer_class`` over ``.values()`` rows."""
+
+    fields_query_param = "fields"
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer], fields=None):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        readable = {name: f for name, f in serializer.fields.items() if not f.write_only}
+        if fields is not None:
+            unknown = [name for name in fields if name not in readable]
+            if unknown:
+                raise ValidationError(
+                    {self.fields_query_param: [f"Unknown field(s): {', '.join(unknown)}."]}
+                )
+            readable = {name: f for name, f in readable.items() if name in fields}
+
+        self.columns = []
+        for name, field in readable.items():
+            source = field.source
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or model_field.is_relation:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} is not a plain column ({source!r})"
+                )
+            self.columns.append((name, source, field))
+
+    @classmethod
+    def from_request(cls, serializer_class, request) -> ValuesReader:
+        """Reader for the comma-separated ``?fields=`` of ``request`` (all fields if absent)."""
+        raw = request.query_params.get(cls.fields_query_param)
+        fields = [name.strip() for name in raw.split(",") if name.strip()] if raw else None
+        return cls(serializer_class, fields)
+
+    def values(self, queryset, extra: Iterable[str] = ()):
+        """Select only the serialized columns, plus ``extra`` ones (e.g. the ordering)."""
+        sources = [source for _name, source, _field in self.columns]
+        return queryset.values(*dict.fromkeys([*sources, *extra]))
+
+    def to_representation(self, rows) -> list[dict]:
+        columns = [(name, source, _converter(field)) for name, source, field in self.columns]
+        return [
+            {
+                name: None if (value := row[source]) is None else convert(value)
+                for name, source, convert in columns
+            }
+            for row in rows
+        ]
+
+
+def _converter(field):
+    if type(field) in _PASSTHROUGH:
+        return _PASSTHROUGH[type(field)]
+    if type(field) is serializers.DateTimeField:
+        return _datetime_converter(field)
+    return field.to_representation
+
+
+def _datetime_converter(field):
+    """``DateTimeField.to_representation`` for aware values, timezone looked up once."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)  # naive: DRF's make_aware checks
+        try:
+            text = value.astimezone(tz).isoformat()
+        except OverflowError:
+            return field.to_representation(value)  # raises DRF's overflow error
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
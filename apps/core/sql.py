@@ -0,0 +1,110 @@
+"""Per-request SQL accounting and query budgets.
+
+``QueryRecorder`` is installed with ``connection.execute_wrapper`` by
+``SQLInstrumentationMiddleware`` and counts queries, total DB time and the
+slowest statement. Views declare how many queries they may issue:
+
+    @query_budget(2)
+    class CurrentUserView(APIView): ...
+
+With ``SQL_QUERY_BUDGETS_STRICT`` (on in test settings) a request that
+exceeds its view's budget raises ``QueryBudgetExceeded``, failing the test
+that made it; otherwise the overrun is logged as a warning.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+# Recorder for the request being handled, for log filters and other observers.
+current_queries: ContextVar[QueryRecorder | None] = ContextVar("current_queries", default=None)
+
+SLOWEST_SQL_MAX_CHARS = 500
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable accumulating query count and timings."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = 0.0
+        self.slowest_sql = ""
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest:
+                self.slowest = elapsed
+                self.slowest_sql = sql[:SLOWEST_SQL_MAX_CHARS]
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 3)
+
+    @property
+    def slowest_ms(self) -> float:
+        return round(self.slowest * 1000, 3)
+
+    def as_log_fields(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": self.duration_ms,
+            "db_slowest_ms": self.slowest_ms,
+            "db_slowest_sql": self.slowest_sql,
+        }
+
+
+def query_budget(max_queries: int):
+    """Declare the most queries a view (class or function) may issue per request."""
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+def get_query_budget(view_func) -> int | None:
+    """Return the budget declared on a resolved view callable, if any.
+
+    ``as_view()`` callables expose their class as ``view_class`` (Django) or
+    ``cls`` (DRF); budgets declared on either are found.
+    """
+    for candidate in (
+        view_func,
+        getattr(view_func, "view_class", None),
+        getattr(view_func, "cls", None),
+    ):
+        budget = getattr(candidate, "query_budget", None)
+        if budget is not None:
+            return budget
+    return None
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, using: str = DEFAULT_DB_ALIAS):
+    """Test helper: fail if the block issues more than ``max_queries`` queries."""
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > max_queries:
+        statements = "\n".join(
+            f"{i}. {query['sql']}" for i, query in enumerate(context.captured_queries, 1)
+        )
+        raise QueryBudgetExceeded(
+            f"{len(context)} queries executed, budget is {max_queries}:\n{statements}"
+        )
@@ -0,0 +1,31 @@
+"""``StreamingResponse``: a streaming response that streams under ASGI too.
+
+Given a sync iterator, Django's ``StreamingHttpResponse`` streams it under
+WSGI, but an ASGI server gets it through one ``sync_to_async(list)`` call:
+the whole body is built in memory before the first byte is sent. Streaming
+views here iterate the database in a worker thread (server-side cursors,
+per-batch commits), so they stay sync; ``StreamingResponse`` pulls their
+parts one ``sync_to_async`` call at a time instead. Each call is a thread
+hop, so iterators should yield a chunk of rows per part, not a line.
+"""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+class StreamingResponse(StreamingHttpResponse):
+    async def __aiter__(self):
+        if self.is_async:
+            async for part in super().__aiter__():
+                yield part
+            return
+        parts = self.streaming_content
+        # Thread sensitive: the same thread as the view, whose connection
+        # (and open cursor) the iterator uses.
+        next_part = sync_to_async(next, thread_sensitive=True)
+        while (part := await next_part(parts, _DONE)) is not _DONE:
+            yield part
@@ -0,0 +1,65 @@
+import re
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from .openapi import openapi_schema
+
+accepts_gzip = re.compile(r"\bgzip\b")
+
+# Fingerprinted URLs (?v=<fingerprint>) never change content, so caches may keep them.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def schema_filename(renderer) -> str:
+    """The download name the stock view gives an unversioned schema."""
+    title = getattr(settings, "SPECTACULAR_SETTINGS", {}).get("TITLE") or "schema"
+    return f"{title}.{renderer.format}"
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """``SpectacularAPIView`` serving the precomputed schema from ``openapi_schema``.
+
+    Same negotiation, permissions and bytes as the stock view, plus a strong
+    ETag (304 on ``If-None-Match``), gzip when accepted, and immutable caching
+    for ``?v=<fingerprint>``. Requests selecting a language, API version or
+    JSON indent fall back to generating the schema on the fly.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if (
+            request.GET.get("lang")
+            or request.GET.get("version")
+            or request.version
+            or self.api_version
+            or ";" in (request.accepted_media_type or "")
+        ):
+            return super().get(request, *args, **kwargs)
+
+        bundle = openapi_schema.get()
+        variant = bundle.variants[renderer.format]
+        gzipped = bool(accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(
+            variant.gzipped if gzipped else variant.body, content_type=content_type
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        response["ETag"] = variant.gzip_etag if gzipped else variant.etag
+        response["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL
+            if request.GET.get("v") == bundle.fingerprint
+            else REVALIDATE_CACHE_CONTROL
+        )
+        response["Content-Disposition"] = f'inline; filename="{schema_filename(renderer)}"'
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return get_conditional_response(request, etag=response["ETag"], response=response)
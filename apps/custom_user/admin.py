@@ -1,5 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models.functions import Lower
+
+from apps.core.counting import EstimatedCountPaginator
+from apps.core.routing import read_alias
 
 from .models import CustomUser
 
@@ -8,9 +12,15 @@ from .models import CustomUser
 class CustomUserAdmin(UserAdmin):
     model = CustomUser
     list_display = ("email", "first_name", "last_name", "is_staff", "is_active")
+    # is_staff=True and is_active=False pages read the partial Lower("email")
+    # indexes; the unique one serves the rest.
     list_filter = ("is_staff", "is_active")
-    ordering = ("email",)
+    ordering = (Lower("email").asc(),)
     search_fields = ("email", "first_name", "last_name")
+    # No exact COUNT(*) of the whole table or of each filter choice.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
 
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -30,6 +40,19 @@ class CustomUserAdmin(UserAdmin):
         ("Important Dates", {"fields": ("last_login", "date_joined")}),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if request.method == "GET" and match and match.url_name.endswith("_changelist"):
+            # List pages read from a replica; change forms and actions use the primary.
+            queryset = queryset.using(read_alias(request.user.pk))
+        return queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
     add_fieldsets = (
         (
             None,
@@ -5,4 +5,4 @@ class CustomUserConfig(AppConfig):
     name = "apps.custom_user"
 
     def ready(self):
-        import apps.custom_user.schema  # noqa: F401  registers JWTScheme with drf-spectacular
+        import apps.custom_user.signals  # noqa: F401  cache invalidation receivers
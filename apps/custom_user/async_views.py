@@ -0,0 +1,156 @@
+"""Native async versions of the password-hashing endpoints.
+
+Served instead of the DRF views when ``ASYNC_AUTH_VIEWS`` is on, which
+``config/asgi.py`` enables by default. Validation and ORM access use Django's
+async ORM / ``sync_to_async``; the PBKDF2 work runs on the bounded pool from
+``hashing.py``. When that pool is full the views answer 429 with Retry-After
+instead of queueing more work.
+
+Request and response bodies match the DRF views, which are also what
+drf-spectacular documents (see ``HashingView.as_view``).
+"""
+
+from __future__ import annotations
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import update_last_login
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework_simplejwt.authentication import AUTH_HEADER_TYPES
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.views import TokenObtainPairView as DRFTokenObtainPairView
+
+from apps.core.renderers import FastJSONRenderer
+
+from . import views
+from .hashing import PoolSaturated, get_hashing_pool
+from .serializers import UserRegistrationSerializer, UserSerializer
+from .tokens import ClaimsTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class HashingView(View):
+    """Base class: JSON in/out, CSRF-exempt, 429 when the hashing pool is full."""
+
+    # DRF view documented by drf-spectacular in place of this one.
+    schema_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if cls.schema_view is not None:
+            view.cls = cls.schema_view
+            view.initkwargs = {}
+        return csrf_exempt(view)
+
+    @property
+    def pool(self):
+        return get_hashing_pool()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            data = self.parse(request)
+        except ValueError as exc:
+            return self.render({"detail": f"JSON parse error - {exc}"}, status.HTTP_400_BAD_REQUEST)
+        request.data = data
+
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except PoolSaturated as exc:
+            response = self.render(
+                {"detail": exceptions.Throttled(wait=exc.retry_after).detail},
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            response["Retry-After"] = str(exc.retry_after)
+            return response
+
+    @staticmethod
+    def parse(request):
+        if request.content_type == "application/json":
+            return json.loads(request.body or b"{}")
+        return request.POST
+
+    @staticmethod
+    def render(data, status_code) -> HttpResponse:
+        return HttpResponse(
+            FastJSONRenderer().render(data),
+            status=status_code,
+            content_type="application/json",
+        )
+
+
+class RegisterView(HashingView):
+    """Async twin of ``views.RegisterView``."""
+
+    schema_view = views.RegisterView
+
+    async def post(self, request, *args, **kwargs):
+        serializer = UserRegistrationSerializer(data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return self.render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        validated = dict(serializer.validated_data)
+        password_hash = await self.pool.run(make_password, validated.pop("password"))
+        user = User.objects.build_user(password_hash=password_hash, **validated)
+        await user.asave()
+
+        refresh = ClaimsTokenObtainPairSerializer.get_token(user)
+        user_data = UserSerializer(user).data
+        user_data.update(
+            {
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+            }
+        )
+        return self.render(user_data, status.HTTP_201_CREATED)
+
+
+class TokenObtainPairView(HashingView):
+    """Async twin of simplejwt's ``TokenObtainPairView``."""
+
+    schema_view = DRFTokenObtainPairView
+
+    async def post(self, request, *args, **kwargs):
+        serializer = ClaimsTokenObtainPairSerializer()
+        try:
+            # Field validation only; validate() would hash on this thread.
+            credentials = serializer.to_internal_value(request.data)
+        except exceptions.ValidationError as exc:
+            return self.render(exc.detail, status.HTTP_400_BAD_REQUEST)
+
+        password = credentials["password"]
+        user = await User._default_manager.filter_email(credentials[User.USERNAME_FIELD]).afirst()
+
+        if user is None:
+            # Hash anyway so response time doesn't reveal unknown accounts.
+            await self.pool.run(make_password, password)
+            return self.no_active_account()
+        if not await self.pool.run(check_password, password, user.password):
+            return self.no_active_account()
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            return self.no_active_account()
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+
+        refresh = serializer.get_token(user)
+        return self.render(
+            {"refresh": str(refresh), "access": str(refresh.access_token)},
+            status.HTTP_200_OK,
+        )
+
+    def no_active_account(self) -> HttpResponse:
+        response = self.render(
+            {"detail": ClaimsTokenObtainPairSerializer.default_error_messages["no_active_account"]},
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        response["WWW-Authenticate"] = f'{AUTH_HEADER_TYPES[0]} realm="api"'
+        return response
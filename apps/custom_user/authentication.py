@@ -0,0 +1,155 @@
+"""DB-free JWT authentication.
+
+simplejwt's ``JWTAuthentication`` loads the full user row on every request. Here
+``request.user`` is rebuilt from the token claims instead. The only per-request
+lookup is the user's *state* (``is_active``, password hash for revocation and a
+fingerprint of the claim values), served from a short-TTL in-process cache.
+
+Fields that are not carried in the token are deferred; touching any of them
+loads the rest of the row in a single query.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.core.routing import replica_reads
+
+from .tokens import USER_CLAIM_FIELDS, claims_fingerprint, user_claims
+
+
+class UserState(NamedTuple):
+    is_active: bool
+    revoke_hash: str
+    claims_hash: str
+
+
+class UserStateCache:
+    """Per-process TTL cache of the columns needed to trust a token.
+
+    Entries are dropped locally by the post_save/post_delete receivers in
+    ``signals.py``; other workers pick up changes once the TTL expires.
+    """
+
+    def __init__(self, ttl: float | None = None, maxsize: int = 10_000):
+        self._ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[object, tuple[float, UserState | None]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "JWT_USER_STATE_TTL", 30)
+
+    def get(self, user_id) -> UserState | None:
+        """Return the cached state for ``user_id`` (``None`` if the user is gone)."""
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        state = self._load(user_id)
+        ttl = self.ttl
+        if ttl > 0:
+            with self._lock:
+                if user_id not in self._entries and len(self._entries) >= self.maxsize:
+                    # Dicts keep insertion order: evict the oldest entry.
+                    self._entries.pop(next(iter(self._entries)), None)
+                self._entries[user_id] = (now + ttl, state)
+        return state
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _load(user_id) -> UserState | None:
+        User = get_user_model()
+        fields = ("is_active", "password", *USER_CLAIM_FIELDS)
+        with replica_reads(user_id):
+            user = User.objects.only(*fields).filter(pk=user_id).first()
+        if user is None:
+            return None
+        return UserState(
+            is_active=user.is_active,
+            revoke_hash=get_md5_hash_password(user.password),
+            claims_hash=claims_fingerprint(user_claims(user)),
+        )
+
+
+user_state_cache = UserStateCache()
+
+
+def user_from_claims(user_id, claims: dict, *, is_active: bool):
+    """Build a user instance from token claims without querying the database.
+
+    Attributes missing from ``claims`` are deferred. ``CustomUser.refresh_from_db``
+    loads all of them together the first time one is read.
+    """
+    User = get_user_model()
+    values = {
+        User._meta.pk.attname: User._meta.pk.to_python(user_id),
+        "is_active": is_active,
+        **claims,
+    }
+    if isinstance(values.get("date_joined"), str):
+        values["date_joined"] = parse_datetime(values["date_joined"])
+
+    field_names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    user = User.from_db(None, field_names, [values[name] for name in field_names])
+    user._from_claims = True
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that builds ``request.user`` from token claims."""
+
+    state_cache = user_state_cache
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        state = self.state_cache.get(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not state.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != state.revoke_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        claims = {
+            field: validated_token[field]
+            for field in USER_CLAIM_FIELDS
+            if field in validated_token.payload
+        }
+        if claims_fingerprint(claims) != state.claims_hash:
+            # Legacy token or the profile changed since it was issued: trust
+            # only the id and let the row load on demand.
+            claims = {}
+
+        return user_from_claims(user_id, claims, is_active=state.is_active)
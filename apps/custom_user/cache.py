@@ -0,0 +1,94 @@
+"""Per-user cache of rendered ``/auth/me/`` responses.
+
+Entries hold the JSON bytes together with their ETag so a hit never
+re-serializes or re-renders. The ETag is a hash of the body, so every worker
+sends the same one for the same data however often the entry is refilled;
+there is no Last-Modified, as the user row records no change time and the
+time of a fill would change with no change to the data. They live in a Django cache (shared
+across workers when CACHE_URL points at a shared backend) and are dropped by the
+post_save/post_delete receivers in ``signals.py``; other workers may still
+serve their L1 copy for up to ``CACHE_L1_TIMEOUT`` seconds (``apps/core/cache.py``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import quote_etag
+
+
+class CachedResponse(NamedTuple):
+    data: dict
+    body: bytes
+    etag: str
+
+
+class CurrentUserResponseCache:
+    """Rendered responses keyed by user id, with per-process hit/miss counters."""
+
+    key_prefix = "custom_user:me:v2:"  # v1 entries also held Last-Modified
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        self._alias = alias
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def cache(self):
+        return caches[self._alias or getattr(settings, "CURRENT_USER_CACHE_ALIAS", "default")]
+
+    @property
+    def timeout(self) -> int:
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, "CURRENT_USER_CACHE_TIMEOUT", 300)
+
+    def key(self, user_id) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def get(self, user_id) -> CachedResponse | None:
+        entry = self.cache.get(self.key(user_id))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return CachedResponse(*entry) if entry is not None else None
+
+    def set(self, user_id, data, body: bytes) -> CachedResponse:
+        entry = CachedResponse(
+            data=dict(data),
+            body=body,
+            etag=quote_etag(hashlib.sha256(body).hexdigest()[:32]),
+        )
+        self.cache.set(self.key(user_id), tuple(entry), self.timeout)
+        return entry
+
+    def invalidate(self, user_id) -> None:
+        self.cache.delete(self.key(user_id))
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+
+current_user_cache = CurrentUserResponseCache()
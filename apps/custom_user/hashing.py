@@ -0,0 +1,138 @@
+"""Bounded worker pool for password hashing.
+
+PBKDF2 is deliberately slow. Running it on the request worker (or on
+asgiref's shared thread pool) lets a burst of signups/logins starve every
+other endpoint. ``HashingPool`` caps in-flight hashing work at
+``WORKERS + MAX_QUEUE``; submissions beyond that raise ``PoolSaturated`` so
+callers can shed load instead of queueing without bound.
+
+Configured through ``settings.PASSWORD_HASHING_POOL``:
+
+    KIND         "thread" (default) or "process"
+    WORKERS      pool size (default: the CPUs, divided by WEB_CONCURRENCY if set)
+    MAX_QUEUE    extra submissions allowed to wait (default: 2 * WORKERS)
+    RETRY_AFTER  seconds suggested to clients when saturated (default: 1)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+
+from django.conf import settings
+
+from apps.core.cpus import available_cpus
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool already holds its maximum number of tasks."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing pool saturated; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def setup_worker_process() -> None:
+    # Child processes need configured settings for PASSWORD_HASHERS.
+    import django
+
+    django.setup()
+
+
+def default_pool_size() -> int:
+    """The CPUs this process may use (cgroup quota and affinity included).
+
+    With ``WEB_CONCURRENCY`` set, every one of that many web worker processes
+    has its own pool, so each gets its share (at least 1) and the pools on a
+    host hash on about every CPU once. Otherwise the process count isn't known
+    (a single uvicorn/daphne process, gunicorn's CPU-derived default), and the
+    pool uses all of them rather than shrinking to one worker.
+    """
+    cpus = available_cpus()
+    processes = int(os.environ.get("WEB_CONCURRENCY") or 0)
+    return max(1, cpus // processes) if processes > 0 else cpus
+
+
+class HashingPool:
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int | None = None,
+        max_queue: int | None = None,
+        retry_after: int = 1,
+    ):
+        if kind not in {"thread", "process"}:
+            raise ValueError(f"Unknown hashing pool kind: {kind!r}")
+        self.kind = kind
+        self.workers = workers or default_pool_size()
+        self.max_queue = self.workers * 2 if max_queue is None else max_queue
+        self.retry_after = retry_after
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers, initializer=setup_worker_process
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="password-hashing"
+                        )
+        return self._executor
+
+    def submit(self, fn, /, *args) -> Future:
+        """Schedule ``fn(*args)`` or raise ``PoolSaturated`` if the pool is full."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise PoolSaturated(self.retry_after)
+            self._in_flight += 1
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, /, *args):
+        """Await ``fn(*args)`` on the pool from async code."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+
+@cache
+def get_hashing_pool() -> HashingPool:
+    """Return the process-wide pool built from ``settings.PASSWORD_HASHING_POOL``."""
+    config = getattr(settings, "PASSWORD_HASHING_POOL", {})
+    return HashingPool(
+        kind=config.get("KIND", "thread"),
+        workers=config.get("WORKERS"),
+        max_queue=config.get("MAX_QUEUE"),
+        retry_after=config.get("RETRY_AFTER", 1),
+    )
@@ -0,0 +1,259 @@
+"""Streaming bulk user import.
+
+Rows are read lazily (CSV with a header row, or JSON Lines) and processed in
+fixed-size batches, so memory stays flat however large the input is. Each
+batch:
+
+1. normalizes and validates emails/names, rejecting in-batch duplicates and
+   emails that already exist (case-insensitively),
+2. hashes passwords in parallel across a process pool,
+3. writes in one transaction: Postgres ``COPY`` into a temp table followed by
+   ``INSERT ... ON CONFLICT DO NOTHING`` when available, ``bulk_create``
+   otherwise.
+
+Duplicates across batches are caught by step 1 because earlier batches are
+already committed, so no global "seen" set is kept.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connections, transaction
+from django.db.models.functions import Lower
+
+from .hashing import setup_worker_process
+
+# Optional profile columns copied onto the user when present.
+IMPORT_FIELDS = ("first_name", "last_name")
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class RejectedRow:
+    row: int
+    email: str
+    reason: str
+
+
+@dataclass
+class BatchResult:
+    number: int
+    first_row: int
+    last_row: int
+    created: int
+    rejected: list[RejectedRow] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.last_row - self.first_row + 1
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_rows(stream, fmt: str) -> Iterator[tuple[int, dict]]:
+    """Yield ``(row_number, row)`` pairs, numbered from 1."""
+    if fmt == "csv":
+        yield from enumerate(csv.DictReader(stream), start=1)
+    elif fmt == "jsonl":
+        number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else {"_invalid": line.strip()}
+    else:
+        raise ValueError(f"Unknown import format: {fmt!r} (expected one of {FORMATS})")
+
+
+def normalize_email(raw) -> str:
+    User = get_user_model()
+    return User.objects.normalize_email(str(raw or "").strip())
+
+
+class UserImporter:
+    """Validate, hash and insert users batch by batch."""
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 1000,
+        hash_workers: int | None = None,
+        use_copy: bool | None = None,
+        using: str = "default",
+    ):
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers
+        self.using = using
+        connection = connections[using]
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.User = get_user_model()
+        self._executor: Executor | None = None
+
+    def __enter__(self):
+        if self.hash_workers != 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.hash_workers, initializer=setup_worker_process
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, rows: Iterable[tuple[int, dict]]) -> Iterator[BatchResult]:
+        """Import ``rows``, yielding one result per committed batch."""
+        rows = iter(rows)
+        number = 0
+        while batch := list(islice(rows, self.batch_size)):
+            number += 1
+            yield self.import_batch(number, batch)
+
+    def import_batch(self, number: int, batch: list[tuple[int, dict]]) -> BatchResult:
+        started = time.perf_counter()
+        users, passwords, rejected = self.prepare(batch)
+        if users:
+            for user, password_hash in zip(users, self.hash_passwords(passwords), strict=True):
+                user.password = password_hash
+            created = self.write(users)
+        else:
+            created = 0
+        return BatchResult(
+            number=number,
+            first_row=batch[0][0],
+            last_row=batch[-1][0],
+            created=created,
+            rejected=rejected,
+            seconds=time.perf_counter() - started,
+        )
+
+    def prepare(self, batch):
+        """Return ``(users, raw_passwords, rejected)`` for one batch."""
+        candidates: dict[str, tuple[int, dict, str]] = {}
+        rejected: list[RejectedRow] = []
+
+        for number, row in batch:
+            if "_invalid" in row:
+                rejected.append(RejectedRow(number, "", "invalid JSON object"))
+                continue
+            email = normalize_email(row.get("email"))
+            reason = self.validate(email, row)
+            if reason is None and not isinstance(row.get("password") or "", str):
+                reason = "password must be a string"
+            if reason is None and email.lower() in candidates:
+                reason = "duplicate email in input"
+            if reason is not None:
+                rejected.append(RejectedRow(number, email, reason))
+                continue
+            candidates[email.lower()] = (number, row, email)
+
+        existing = set(
+            self.User.objects.using(self.using)
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=list(candidates))
+            .values_list("email_lower", flat=True)
+        )
+
+        users, passwords = [], []
+        for key, (number, row, email) in candidates.items():
+            if key in existing:
+                rejected.append(RejectedRow(number, email, "email already exists"))
+                continue
+            extra = {name: str(row[name]).strip() for name in IMPORT_FIELDS if row.get(name)}
+            users.append(self.User.objects.build_user(email, **extra))
+            passwords.append(row.get("password") or None)
+
+        rejected.sort(key=lambda r: r.row)
+        return users, passwords, rejected
+
+    def validate(self, email: str, row: dict) -> str | None:
+        if not email:
+            return "missing email"
+        try:
+            validate_email(email)
+        except ValidationError:
+            return "invalid email"
+        if len(email) > self.User._meta.get_field("email").max_length:
+            return "invalid email"
+        for name in IMPORT_FIELDS:
+            max_length = self.User._meta.get_field(name).max_length
+            if len(str(row.get(name) or "").strip()) > max_length:
+                return f"{name} longer than {max_length} characters"
+        return None
+
+    def hash_passwords(self, passwords: list[str | None]) -> list[str]:
+        """Hash in parallel; ``None`` gives an unusable password."""
+        if self._executor is None:
+            return [make_password(p) for p in passwords]
+        workers = self.hash_workers or os.cpu_count() or 1
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(self._executor.map(make_password, passwords, chunksize=chunksize))
+
+    def write(self, users) -> int:
+        """Insert ``users`` in one transaction; return how many rows were created.
+
+        Rows whose email was taken after ``prepare()`` checked it (by another
+        import or a registration) are skipped, not counted.
+        """
+        with transaction.atomic(using=self.using):
+            if self.use_copy:
+                return self._copy(users)
+            # bulk_create(ignore_conflicts=True) doesn't say which rows it
+            # inserted: count the batch's emails before and after.
+            batch = (
+                self.User.objects.using(self.using)
+                .annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=[user.email.lower() for user in users])
+            )
+            before = batch.count()
+            self.User.objects.using(self.using).bulk_create(
+                users, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            return batch.count() - before
+
+    def _copy(self, users) -> int:
+        connection = connections[self.using]
+        opts = self.User._meta
+        fields = [f for f in opts.concrete_fields if not f.primary_key]
+        qn = connection.ops.quote_name
+        table = qn(opts.db_table)
+        columns = ", ".join(qn(f.column) for f in fields)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE import_users_batch ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            with cursor.cursor.copy(f"COPY import_users_batch ({columns}) FROM STDIN") as copy:
+                for user in users:
+                    copy.write_row(
+                        [f.get_db_prep_save(getattr(user, f.attname), connection) for f in fields]
+                    )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM import_users_batch ON CONFLICT DO NOTHING"
+            )
+            created = cursor.rowcount
+            # ON COMMIT DROP doesn't fire when the import runs inside an outer transaction.
+            cursor.execute("DROP TABLE import_users_batch")
+            return created
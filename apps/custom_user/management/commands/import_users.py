@@ -0,0 +1,121 @@
+"""Bulk-import users from CSV or JSON Lines.
+
+    python manage.py import_users users.csv
+    python manage.py import_users users.jsonl --batch-size 5000 --rejects rejects.jsonl
+    python manage.py import_users users.csv --resume   # continue after a failure
+
+Columns/keys: ``email`` (required), ``password``, ``first_name``, ``last_name``.
+Rows without a password get an unusable one.
+
+After every committed batch the number of consumed input rows is written to
+the checkpoint file (default ``<input>.checkpoint``). ``--resume`` skips those
+rows; the checkpoint is removed once the import finishes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.custom_user.importing import FORMATS, UserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Stream users from a CSV/JSONL file into the database in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=None,
+            help="Processes used for password hashing (default: CPU count, 0: inline).",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even when Postgres COPY is available.",
+        )
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--resume", action="store_true", help="Skip rows already imported.")
+        parser.add_argument("--rejects", help="Write rejected rows here as JSON Lines.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or self.guess_format(path)
+        checkpoint = Path(options["checkpoint"] or f"{path}.checkpoint")
+        if path == "-" and not options["checkpoint"]:
+            checkpoint = Path("import_users.checkpoint")
+
+        progress = {"rows": 0, "created": 0, "rejected": 0}
+        if options["resume"] and checkpoint.exists():
+            progress = json.loads(checkpoint.read_text())
+            self.stdout.write(f"Resuming after row {progress['rows']} ({checkpoint})")
+
+        importer = UserImporter(
+            batch_size=options["batch_size"],
+            hash_workers=options["hash_workers"],
+            use_copy=False if options["no_copy"] else None,
+            using=options["database"],
+        )
+        rejects = open(options["rejects"], "a") if options["rejects"] else None
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+
+        started = time.perf_counter()
+        try:
+            rows = islice(read_rows(stream, fmt), progress["rows"], None)
+            with importer:
+                for batch in importer.run(rows):
+                    progress["rows"] = batch.last_row
+                    progress["created"] += batch.created
+                    progress["rejected"] += len(batch.rejected)
+                    for row in batch.rejected:
+                        if rejects:
+                            rejects.write(json.dumps(row.__dict__) + "\n")
+                        elif options["verbosity"] >= 2:
+                            self.stderr.write(f"  row {row.row} {row.email!r}: {row.reason}")
+                    self.write_checkpoint(checkpoint, progress)
+                    self.stdout.write(
+                        f"batch {batch.number}: rows {batch.first_row}-{batch.last_row}, "
+                        f"{batch.created} created, {len(batch.rejected)} rejected, "
+                        f"{batch.rows_per_second:,.0f} rows/s"
+                    )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if rejects:
+                rejects.close()
+
+        checkpoint.unlink(missing_ok=True)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {progress['created']} users, rejected {progress['rejected']} rows "
+                f"in {elapsed:.1f}s."
+            )
+        )
+
+    @staticmethod
+    def guess_format(path: str) -> str:
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            return "csv"
+        if suffix in {".jsonl", ".ndjson"}:
+            return "jsonl"
+        raise CommandError("Cannot infer the input format; pass --format csv|jsonl.")
+
+    @staticmethod
+    def write_checkpoint(checkpoint: Path, progress: dict) -> None:
+        # Write-then-rename so a crash never leaves a truncated checkpoint.
+        tmp = checkpoint.with_name(checkpoint.name + ".tmp")
+        tmp.write_text(json.dumps(progress))
+        os.replace(tmp, checkpoint)
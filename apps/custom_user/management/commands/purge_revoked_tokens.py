@@ -0,0 +1,46 @@
+"""Delete revoked refresh tokens that have expired.
+
+    python manage.py purge_revoked_tokens            # e.g. from cron
+    python manage.py purge_revoked_tokens --stats    # also report the filter a worker would build
+
+Workers already purge every ``JWT_REVOCATION["PURGE_INTERVAL"]`` seconds;
+run this instead when that is set to 0.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.custom_user.revocation import RevocationStore
+
+
+class Command(BaseCommand):
+    help = "Delete expired rows from the refresh-token revocation table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Build the Bloom filter from the remaining rows and report its size.",
+        )
+
+    def handle(self, *args, **options):
+        store = RevocationStore()
+        deleted = store.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired revoked token(s)."))
+        if not options["stats"]:
+            return
+
+        started = time.perf_counter()
+        store.rebuild()
+        elapsed = time.perf_counter() - started
+        stats = store.stats()
+        self.stdout.write(
+            f"Filter: {stats['entries']} entries (capacity {stats['capacity']}), "
+            f"{stats['memory_bytes'] / 1024:.1f} KiB, {stats['hashes']} hashes, "
+            f"fill {stats['fill_ratio']:.1%}, "
+            f"estimated false-positive rate {stats['estimated_error_rate']:.4%}, "
+            f"built in {elapsed * 1000:.0f} ms"
+        )
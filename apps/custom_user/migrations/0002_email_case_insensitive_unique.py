@@ -0,0 +1,73 @@
+"""Make email unique case-insensitively through a Lower("email") index.
+
+1. Report rows whose emails differ only by case; they would make the unique
+   index fail, so the migration stops and lists them for manual merging.
+2. Build the functional unique index (CONCURRENTLY on PostgreSQL, so logins
+   and signups keep writing to the table while it builds; an INVALID index
+   left by a failed build is dropped first).
+3. Drop the old case-sensitive unique constraint and index on email.
+"""
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+from apps.core.operations import AddConstraintConcurrently
+
+REPORT_LIMIT = 50
+
+
+def report_case_duplicates(apps, schema_editor):
+    User = apps.get_model("custom_user", "CustomUser")
+    users = User.objects.using(schema_editor.connection.alias).annotate(email_lower=Lower("email"))
+    groups = list(
+        users.values("email_lower")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .order_by("email_lower")
+        .values_list("email_lower", flat=True)
+    )
+    if not groups:
+        return
+
+    lines = []
+    for email_lower in groups[:REPORT_LIMIT]:
+        rows = users.filter(email_lower=email_lower).order_by("id").values_list("id", "email")
+        lines.append(", ".join(f"#{pk} {email}" for pk, email in rows))
+    if len(groups) > REPORT_LIMIT:
+        lines.append(f"... and {len(groups) - REPORT_LIMIT} more")
+    raise RuntimeError(
+        f"{len(groups)} email address(es) are used by several users differing only in case:\n"
+        + "\n".join(f"  {line}" for line in lines)
+        + "\nMerge or rename these accounts, then run migrate again."
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("custom_user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(report_case_duplicates, migrations.RunPython.noop),
+        AddConstraintConcurrently(
+            model_name="customuser",
+            constraint=models.UniqueConstraint(
+                Lower("email"),
+                name="custom_user_email_ci_unique",
+                violation_error_message="user with this email address already exists.",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customuser",
+            name="email",
+            field=models.EmailField(
+                help_text="Required. Enter a valid email address.",
+                max_length=254,
+                verbose_name="email address",
+            ),
+        ),
+    ]
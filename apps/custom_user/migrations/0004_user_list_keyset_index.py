@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("custom_user", "0003_revoked_token"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(fields=["date_joined", "id"], name="custom_user_joined_id_idx"),
+        ),
+    ]
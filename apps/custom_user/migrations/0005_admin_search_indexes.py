@@ -0,0 +1,78 @@
+import logging
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from apps.core.operations import AddIndexConcurrently
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+
+
+def trigram_available(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_search_indexes(apps, schema_editor):
+    """Indexes behind ``CustomUserQuerySet.search()``, which differs by vendor.
+
+    PostgreSQL: GIN trigram indexes on the ``UPPER(col::text)`` that
+    ``icontains`` compiles to. Other backends: ``LOWER(col)`` indexes for the
+    prefix ranges (email already has the unique one).
+    """
+    table = schema_editor.quote_name(apps.get_model("custom_user", "CustomUser")._meta.db_table)
+    if schema_editor.connection.vendor != "postgresql":
+        for field in SEARCH_FIELDS[1:]:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS custom_user_{field}_lower_idx "
+                f"ON {table} (LOWER({field}))"
+            )
+        return
+    if not trigram_available(schema_editor):
+        logger.warning("pg_trgm is not available; admin search will scan the user table.")
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS custom_user_{field}_trgm_idx "
+            f"ON {table} USING gin ((UPPER({field}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    postgres = schema_editor.connection.vendor == "postgresql"
+    for field in SEARCH_FIELDS:
+        if postgres:
+            schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS custom_user_{field}_trgm_idx")
+        else:
+            schema_editor.execute(f"DROP INDEX IF EXISTS custom_user_{field}_lower_idx")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("custom_user", "0004_user_list_keyset_index"),
+    ]
+
+    operations = [
+        # Vendor-specific and not part of the model state.
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(
+                Lower("email"), condition=Q(is_staff=True), name="custom_user_staff_email_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(
+                Lower("email"), condition=Q(is_active=False), name="custom_user_inactive_email_idx"
+            ),
+        ),
+    ]
@@ -3,13 +3,76 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import connections, models
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Lower, Now
 from django.utils import timezone
+from django.utils.text import smart_split, unescape_string_literal
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserQuerySet(models.QuerySet):
+    def filter_email(self, email):
+        """Match ``email`` case-insensitively.
+
+        Compares ``LOWER(email)`` so the lookup is a single probe of the
+        ``custom_user_email_ci_unique`` index; ``email__iexact`` compiles to
+        ``UPPER()`` on PostgreSQL and can't use it.
+        """
+        return self.alias(email_lower=Lower("email")).filter(email_lower=Lower(Value(email)))
+
+    def search(self, text):
+        """Users matching every whitespace-separated term of ``text``.
+
+        A term matches when it occurs in the email, first name or last name.
+        On PostgreSQL that is the admin's ``icontains``, served by the trigram
+        indexes of migration ``0005``. Elsewhere a term must start one of the
+        three (a ``LOWER()`` range, served by the expression indexes).
+        """
+        fields = ("email", "first_name", "last_name")
+        postgres = connections[self.db].vendor == "postgresql"
+        queryset = self
+        if not postgres:
+            queryset = queryset.alias(**{f"{name}_lower": Lower(name) for name in fields})
+        for bit in smart_split(text):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            if postgres:
+                matches = [Q(**{f"{name}__icontains": bit}) for name in fields]
+            else:
+                low, high = Lower(Value(bit)), Concat(Lower(Value(bit)), Value("\U0010ffff"))
+                matches = [
+                    Q(**{f"{name}_lower__gte": low, f"{name}_lower__lt": high}) for name in fields
+                ]
+            queryset = queryset.filter(Q(*matches, _connector=Q.OR))
+        return queryset
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     """Manager for CustomUser with email as unique identifier."""
 
+    def get_by_email(self, email):
+        return self.filter_email(email).get()
+
+    def get_by_natural_key(self, username):
+        return self.get_by_email(username)
+
+    def build_user(self, email, password_hash=None, **extra_fields):
+        """Return an unsaved user whose password is an already-hashed value.
+
+        Lets callers run the expensive hashing elsewhere (a worker pool, a
+        process pool for bulk imports). ``password_hash=None`` gives an
+        unusable password, like ``create_user(password=None)``.
+        """
+        if not email:
+            raise ValueError("The Email field must be set")
+        email = self.normalize_email(email)
+        user = self.model(email=email, **extra_fields)
+        if password_hash is None:
+            user.set_unusable_password()
+        else:
+            user.password = password_hash
+        return user
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set")
@@ -46,11 +109,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         phone_number = models.CharField(max_length=15, blank=True)
     """
 
+    # Stored as entered; uniqueness and lookups are case-insensitive through
+    # the Lower("email") index in Meta.constraints.
     email = models.EmailField(
-        unique=True,
         help_text="Required. Enter a valid email address.",
         verbose_name="email address",
-        db_index=True,
     )
     first_name = models.CharField("first name", max_length=50, blank=True)
     last_name = models.CharField("last name", max_length=50, blank=True)
@@ -66,6 +129,48 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Users rebuilt from JWT claims (see authentication.py) fetch every
+        # deferred column on first touch instead of one query per attribute.
+        if fields is not None and getattr(self, "_from_claims", False):
+            fields = {*fields, *self.get_deferred_fields()}
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
     class Meta:
         verbose_name = "user"
         verbose_name_plural = "users"
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="custom_user_email_ci_unique",
+                violation_error_message="user with this email address already exists.",
+            ),
+        ]
+        indexes = [
+            # Keyset pagination of the user list (views.UserListView).
+            models.Index(fields=["date_joined", "id"], name="custom_user_joined_id_idx"),
+            # The admin changelist filtered to its rare list_filter values, in
+            # its Lower("email") order. The common values use the unique index.
+            models.Index(
+                Lower("email"), condition=Q(is_staff=True), name="custom_user_staff_email_idx"
+            ),
+            models.Index(
+                Lower("email"), condition=Q(is_active=False), name="custom_user_inactive_email_idx"
+            ),
+        ]
+
+
+class RevokedToken(models.Model):
+    """A revoked refresh token, kept until it would have expired anyway.
+
+    Looked up only when the in-process Bloom filter in ``revocation.py``
+    can't rule a ``jti`` out; rows are purged once ``expires_at`` passes.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    # Database clock, so workers on different hosts agree on the sync watermark.
+    revoked_at = models.DateTimeField(db_default=Now(), db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,143 @@
+"""Bulk user provisioning: many registrations in one staff request.
+
+``BulkRegistration`` runs rows through ``UserImporter`` batch by batch, with
+the registration rules of ``UserRegistrationSerializer`` (a password is
+required) instead of the import command's, and reports an outcome per row:
+
+    {"row": 1, "email": "a@example.com", "status": "created", "id": 42}
+    {"row": 2, "email": "b@example", "status": "rejected", "reason": "email: Enter a valid email address."}
+
+Per batch the uniqueness check is one query, passwords are hashed on the
+shared pool of ``hashing.py`` a few at a time (inline when it is full, rather
+than failing the batch), rows are written with ``COPY``/``bulk_create`` and one more query
+reads back the ids. A rejected row doesn't affect the others, and a batch
+whose write fails reports its rows as ``failed`` and the next batch goes on.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import DatabaseError
+from django.db.models.functions import Lower
+
+from .hashing import PoolSaturated, get_hashing_pool
+from .importing import UserImporter, normalize_email
+from .serializers import UserRegistrationSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUserSerializer(UserRegistrationSerializer):
+    """Registration rules for one row; uniqueness is checked per batch."""
+
+    def validate_email(self, value):
+        return value
+
+
+class BulkRegistration(UserImporter):
+    """``UserImporter`` with registration rules and per-row results."""
+
+    def __init__(self, *, batch_size: int = 500, using: str = "default"):
+        # Hashing goes to the shared pool, not a process pool of its own.
+        super().__init__(batch_size=batch_size, hash_workers=0, using=using)
+
+    def provision(self, rows: Iterable[tuple[int, dict]]) -> Iterator[dict]:
+        """Yield one result per input row, in order, as each batch commits."""
+        for results in self.provision_batches(rows):
+            yield from results
+
+    def provision_batches(self, rows: Iterable[tuple[int, dict]]) -> Iterator[list[dict]]:
+        """Yield the results of each batch, in row order, as it commits."""
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            yield self.provision_batch(batch)
+
+    def provision_batch(self, batch: list[tuple[int, dict]]) -> list[dict]:
+        users, passwords, rejected = self.prepare(batch)
+        results = [
+            {"row": r.row, "email": r.email, "status": "rejected", "reason": r.reason}
+            for r in rejected
+        ]
+        # prepare() keeps the first row of every email it accepts.
+        row_numbers = {}
+        for number, row in batch:
+            if "_invalid" not in row:
+                row_numbers.setdefault(normalize_email(row.get("email")).lower(), number)
+
+        if users:
+            for user, password_hash in zip(users, self.hash_passwords(passwords), strict=True):
+                user.password = password_hash
+            results += self.write_users(users, row_numbers)
+        results.sort(key=lambda result: result["row"])
+        return results
+
+    def write_users(self, users, row_numbers: dict[str, int]) -> list[dict]:
+        keys = [user.email.lower() for user in users]
+        try:
+            self.write(users)
+            stored = {
+                key: (pk, password)
+                for key, pk, password in self.User.objects.using(self.using)
+                .annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=keys)
+                .values_list("email_lower", "pk", "password")
+            }
+        except DatabaseError:
+            logger.exception("Bulk registration failed to write %d users", len(users))
+            return [
+                {"row": row_numbers[key], "email": user.email, "status": "failed"}
+                for key, user in zip(keys, users, strict=True)
+            ]
+
+        results = []
+        for key, user in zip(keys, users, strict=True):
+            result = {"row": row_numbers[key], "email": user.email}
+            pk, password = stored.get(key, (None, None))
+            # Salted hashes are unique: any other password means a concurrent
+            # registration won the email between our check and the insert.
+            if password == user.password:
+                result.update(status="created", id=pk)
+            else:
+                result.update(status="rejected", reason="email already exists")
+            results.append(result)
+        return results
+
+    def validate(self, email: str, row: dict) -> str | None:
+        serializer = BulkUserSerializer(data={**row, "email": email})
+        if serializer.is_valid():
+            return None
+        return "; ".join(
+            f"{name}: {' '.join(str(message) for message in messages)}"
+            for name, messages in serializer.errors.items()
+        )
+
+    def hash_passwords(self, passwords: list[str | None]) -> list[str]:
+        """Hash on the shared pool, a password per task and a few tasks at a time.
+
+        The pool also serves interactive logins and registrations: at most
+        half its workers (at least one) hash for a batch at once, so those
+        find free workers and queue slots, and wait behind one hash at most
+        rather than a chunk of them. Passwords that find the pool full are
+        hashed inline.
+        """
+        pool = get_hashing_pool()
+        window = max(1, pool.workers // 2)
+        hashes: list[str | None] = [None] * len(passwords)
+        pending = {}
+        for index, password in enumerate(passwords):
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hashes[pending.pop(future)] = future.result()
+            try:
+                pending[pool.submit(make_password, password)] = index
+            except PoolSaturated:
+                hashes[index] = make_password(password)
+        for future, index in pending.items():
+            hashes[index] = future.result()
+        return hashes
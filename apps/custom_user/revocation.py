@@ -0,0 +1,255 @@
+"""Refresh-token revocation with an in-process Bloom filter in front of the table.
+
+Rotating refresh tokens revokes the old ``jti`` on every refresh, so the
+revocation check sits on the refresh hot path. Each worker keeps a Bloom
+filter of the revoked ``jti``s: a miss means "definitely not revoked" and
+costs no query; only a hit is confirmed against ``RevokedToken``.
+
+Workers pull rows revoked elsewhere every ``SYNC_INTERVAL`` seconds (an
+indexed range scan on ``revoked_at``), so a token revoked on another worker
+can be accepted here for at most that long. ``revoke()`` itself is exact:
+the unique ``jti`` means a token replayed concurrently is rotated only once.
+Every ``PURGE_INTERVAL`` seconds a worker deletes expired rows and rebuilds
+its filter from the rest (Bloom filters can't forget), and the filter is
+rebuilt with room to spare whenever it outgrows its capacity.
+
+Settings (``JWT_REVOCATION``): ``BLOOM_CAPACITY``, ``BLOOM_ERROR_RATE``,
+``SYNC_INTERVAL``, ``PURGE_INTERVAL``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+DEFAULTS = {
+    "BLOOM_CAPACITY": 100_000,
+    "BLOOM_ERROR_RATE": 0.001,
+    "SYNC_INTERVAL": 5,
+    "PURGE_INTERVAL": 3600,
+}
+
+# Rows committed just behind the watermark (a transaction that started
+# earlier but committed later) are picked up by re-reading this window.
+SYNC_OVERLAP = timedelta(seconds=1)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of a BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.bits_set = 0
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                self.bits_set += 1
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def fill_ratio(self) -> float:
+        return self.bits_set / self.size
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """False-positive probability given the bits actually set."""
+        return self.fill_ratio**self.hashes
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+
+class RevocationStore:
+    """Revoked refresh-token ``jti``s: ``RevokedToken`` rows behind a per-process filter."""
+
+    def __init__(self, **options):
+        self._options = options
+        self._lock = threading.RLock()
+        self._filter: BloomFilter | None = None
+        self._watermark: datetime | None = None
+        self._next_sync = 0.0
+        self._next_purge = 0.0
+        self.checks = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.syncs = 0
+        self.rebuilds = 0
+        self.purged = 0
+
+    def option(self, name: str):
+        if name in self._options:
+            return self._options[name]
+        return getattr(settings, "JWT_REVOCATION", {}).get(name, DEFAULTS[name])
+
+    @staticmethod
+    def _model():
+        from .models import RevokedToken
+
+        return RevokedToken
+
+    def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """Revoke ``jti``; ``False`` if it already was (e.g. a concurrent rotation won)."""
+        try:
+            with transaction.atomic():
+                self._model().objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            created = False
+        else:
+            created = True
+        # Don't wait for a sync in progress (see sync_if_due()): it, or the next
+        # one, adds the row, and the unique insert above is what stops a reuse.
+        if self._lock.acquire(blocking=False):
+            try:
+                if self._filter is not None:
+                    self._filter.add(jti)
+            finally:
+                self._lock.release()
+        return created
+
+    def is_revoked(self, jti: str) -> bool:
+        self.sync_if_due()
+        self.checks += 1
+        bloom = self._filter
+        if bloom is not None and jti not in bloom:
+            return False
+        self.filter_hits += 1
+        if self._model().objects.filter(jti=jti).exists():
+            return True
+        self.false_positives += 1
+        return False
+
+    def sync_if_due(self) -> None:
+        if self._filter is not None and time.monotonic() < self._next_sync:
+            return
+        # With a filter to check against, go on with it rather than queue behind
+        # the thread that is syncing: this thread may hold the last free pooled
+        # connection (DATABASE_POOL) that the syncing thread is waiting for.
+        if not self._lock.acquire(blocking=self._filter is None):
+            return
+        try:
+            now = time.monotonic()
+            if self._filter is not None and now < self._next_sync:
+                return  # another thread synced while we waited
+            interval = self.option("PURGE_INTERVAL")
+            if self._filter is not None and interval and now >= self._next_purge:
+                self.purge_expired()
+                self.rebuild()
+            elif self._filter is None or len(self._filter) > self._filter.capacity:
+                self.rebuild()
+            else:
+                self.sync()
+        finally:
+            self._lock.release()
+
+    def sync(self) -> int:
+        """Add rows revoked since the last sync (by any worker) to the filter."""
+        with self._lock:
+            rows = self._model().objects.all()
+            if self._watermark is not None:
+                rows = rows.filter(revoked_at__gte=self._watermark - SYNC_OVERLAP)
+            added = self._load(rows)
+            self.syncs += 1
+            self._next_sync = time.monotonic() + self.option("SYNC_INTERVAL")
+            return added
+
+    def rebuild(self) -> int:
+        """Replace the filter with one built from every unexpired row."""
+        with self._lock:
+            rows = self._model().objects.filter(expires_at__gt=timezone.now())
+            # Size for the table with headroom, so a busy worker doesn't rebuild constantly.
+            capacity = max(self.option("BLOOM_CAPACITY"), 2 * rows.count())
+            self._filter = BloomFilter(capacity, self.option("BLOOM_ERROR_RATE"))
+            self._watermark = None
+            added = self._load(rows)
+            if self._watermark is None:
+                # Only expired rows (or none): still start syncing from the newest one.
+                self._watermark = self._model().objects.aggregate(latest=Max("revoked_at"))[
+                    "latest"
+                ]
+            self.rebuilds += 1
+            now = time.monotonic()
+            self._next_sync = now + self.option("SYNC_INTERVAL")
+            # Jittered so the workers of a deployment don't all purge at once.
+            self._next_purge = now + self.option("PURGE_INTERVAL") * random.uniform(0.5, 1.0)
+            return added
+
+    def _load(self, rows) -> int:
+        # The watermark comes from the rows (database clock), never from this host's clock.
+        watermark = rows.aggregate(latest=Max("revoked_at"))["latest"]
+        added = 0
+        for jti in rows.values_list("jti", flat=True).iterator(chunk_size=5000):
+            self._filter.add(jti)
+            added += 1
+        if watermark is not None:
+            self._watermark = max(watermark, self._watermark or watermark)
+        return added
+
+    def purge_expired(self) -> int:
+        """Delete rows whose tokens have expired; they can no longer be presented."""
+        deleted, _ = self._model().objects.filter(expires_at__lte=timezone.now()).delete()
+        self.purged += deleted
+        return deleted
+
+    def clear(self) -> None:
+        """Drop the filter; the next check rebuilds it from the table."""
+        with self._lock:
+            self._filter = None
+            self._watermark = None
+
+    def stats(self) -> dict:
+        bloom = self._filter
+        return {
+            "entries": len(bloom) if bloom else 0,
+            "capacity": bloom.capacity if bloom else 0,
+            "memory_bytes": bloom.memory_bytes if bloom else 0,
+            "hashes": bloom.hashes if bloom else 0,
+            "fill_ratio": round(bloom.fill_ratio, 6) if bloom else 0.0,
+            "estimated_error_rate": bloom.estimated_error_rate if bloom else 0.0,
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+            "observed_error_rate": (
+                self.false_positives / (self.checks - self.filter_hits + self.false_positives)
+                if self.checks - self.filter_hits + self.false_positives
+                else 0.0
+            ),
+            "syncs": self.syncs,
+            "rebuilds": self.rebuilds,
+            "purged": self.purged,
+        }
+
+
+revocation_store = RevocationStore()
@@ -50,6 +50,29 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "first_name", "last_name", "password", "date_joined"]
         read_only_fields = ["id", "date_joined"]
 
+    def validate_email(self, value):
+        # Uniqueness is case-insensitive (see CustomUser.Meta.constraints).
+        if CustomUser.objects.filter_email(value).exists():
+            raise serializers.ValidationError("user with this email address already exists.")
+        return value
+
     def create(self, validated_data):
         password = validated_data.pop("password")
         return CustomUser.objects.create_user(password=password, **validated_data)
+
+
+class BulkRegisterResultSerializer(serializers.Serializer):
+    """One line of the bulk registration response (documentation only)."""
+
+    row = serializers.IntegerField(help_text="Position of the user in the request, from 1.")
+    email = serializers.CharField()
+    status = serializers.ChoiceField(choices=["created", "rejected", "failed"])
+    id = serializers.IntegerField(required=False, help_text="Set when created.")
+    reason = serializers.CharField(required=False, help_text="Set when rejected.")
+
+
+class UserExportSerializer(UserSerializer):
+    """Columns of the user export; ``?fields=`` picks a subset."""
+
+    class Meta(UserSerializer.Meta):
+        fields = [*UserSerializer.Meta.fields, "is_active", "is_staff", "last_login"]
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.routing import primary_pins
+
+from .authentication import user_state_cache
+from .cache import current_user_cache
+from .models import CustomUser
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user_state(sender, instance, **kwargs):
+    """Drop this worker's cached token state so changes apply immediately."""
+    user_state_cache.invalidate(str(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_current_user_response(sender, instance, **kwargs):
+    current_user_cache.invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def pin_to_primary(sender, instance, **kwargs):
+    """Serve this user's reads from the primary until replicas have the change."""
+    primary_pins.pin(instance.pk)
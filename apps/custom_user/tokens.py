@@ -0,0 +1,85 @@
+"""JWT tokens that carry enough claims to authenticate without loading the user row."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .revocation import revocation_store
+
+# User attributes embedded in every token. Reading these on request.user never
+# touches the database (see authentication.ClaimsJWTAuthentication).
+USER_CLAIM_FIELDS = (
+    "email",
+    "first_name",
+    "last_name",
+    "date_joined",
+    "is_staff",
+    "is_superuser",
+)
+
+
+def user_claims(user) -> dict:
+    """Return the JSON-safe claim values for ``user``."""
+    claims = {}
+    for field in USER_CLAIM_FIELDS:
+        value = getattr(user, field)
+        claims[field] = value.isoformat() if isinstance(value, datetime) else value
+    return claims
+
+
+def claims_fingerprint(claims: dict) -> str:
+    """Short digest of the claim values, used to spot tokens with stale claims."""
+    payload = json.dumps([claims.get(field) for field in USER_CLAIM_FIELDS])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying ``USER_CLAIM_FIELDS``; access tokens inherit them.
+
+    Revocation goes through ``revocation.revocation_store`` rather than
+    simplejwt's blacklist app, which would query two tables on every refresh.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+    def verify(self):
+        super().verify()
+        if revocation_store.is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Revoke this token (called by simplejwt on rotation and by the revoke view)."""
+        expires_at = datetime_from_epoch(self["exp"])
+        if not revocation_store.revoke(self[api_settings.JTI_CLAIM], expires_at):
+            # A concurrent request with the same token revoked it first.
+            raise TokenError(_("Token is blacklisted"))
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = ClaimsRefreshToken
@@ -1,10 +1,40 @@
+from django.conf import settings
 from django.urls import path
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from . import views
+from apps.core.metrics import auth_metric
+
+from . import async_views, views
 
 app_name = "custom_user"
 
+if settings.ASYNC_AUTH_VIEWS:
+    # Hash passwords on the bounded pool instead of the request worker.
+    register_view = async_views.RegisterView.as_view()
+    token_obtain_view = async_views.TokenObtainPairView.as_view()
+else:
+    register_view = views.RegisterView.as_view()
+    token_obtain_view = TokenObtainPairView.as_view()
+
+# Outcomes counted in auth_events_total (apps/core/metrics.py).
+register_view = auth_metric("register")(register_view)
+token_obtain_view = auth_metric("login")(token_obtain_view)
+
 urlpatterns = [
-    path("register/", views.RegisterView.as_view(), name="register"),
+    path("register/", register_view, name="register"),
     path("me/", views.CurrentUserView.as_view(), name="current_user"),
+    path("users/", views.UserListView.as_view(), name="user_list"),
+    path("users/bulk/", views.BulkRegisterView.as_view(), name="bulk_register"),
+    path("users/export/", views.UserExportView.as_view(), name="user_export"),
+    path("token/", token_obtain_view, name="token_obtain_pair"),
+    path(
+        "token/refresh/",
+        auth_metric("token_refresh")(TokenRefreshView.as_view()),
+        name="token_refresh",
+    ),
+    path(
+        "token/revoke/",
+        auth_metric("token_revoke")(views.TokenRevokeView.as_view()),
+        name="token_revoke",
+    ),
 ]
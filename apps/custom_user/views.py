@@ -1,24 +1,74 @@
+import json
+
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema
-from rest_framework import generics, permissions, status
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from rest_framework import exceptions, generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenBlacklistView
+
+from apps.core.api_docs import OpenApiParameter, extend_schema
+from apps.core.pagination import KeysetPagination
+from apps.core.renderers import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    CSVRenderer,
+    FastJSONRenderer,
+    NDJSONRenderer,
+    ndjson_line,
+)
+from apps.core.routing import replica_reads
+from apps.core.serializers import ValuesReader
+from apps.core.sql import query_budget
+from apps.core.streaming import StreamingResponse
 
-from .serializers import UserRegistrationSerializer, UserSerializer
+from .cache import current_user_cache
+from .exporting import ExportFilterSerializer, UserExport
+from .importing import read_rows
+from .provisioning import BulkRegistration
+from .serializers import (
+    BulkRegisterResultSerializer,
+    UserExportSerializer,
+    UserRegistrationSerializer,
+    UserSerializer,
+)
+from .tokens import ClaimsRefreshToken
 
 User = get_user_model()
 
 
+# Cold path: token state lookup + row load on a response-cache miss.
+@query_budget(2)
 class CurrentUserView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(responses=UserSerializer)
     def get(self, request, *args, **kwargs):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        renderer = request.accepted_renderer
+        if renderer.format != "json":
+            serializer = UserSerializer(request.user)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        entry = current_user_cache.get(request.user.pk)
+        if entry is None:
+            # Misses read the row so a worker holding stale token claims
+            # cannot repopulate the cache with old values.
+            with replica_reads(request.user.pk):
+                user = User.objects.get(pk=request.user.pk)
+            data = UserSerializer(user).data
+            entry = current_user_cache.set(user.pk, data, renderer.render(data))
+
+        response = Response(entry.data, status=status.HTTP_200_OK)
+        response.content = entry.body  # already rendered; skips the renderer
+        response["Content-Type"] = renderer.media_type  # which rendering would have set
+        response["ETag"] = entry.etag
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ("Authorization",))
+        return get_conditional_response(request, etag=entry.etag, response=response)
 
 
+# Unique-email check + insert.
+@query_budget(2)
 class RegisterView(generics.CreateAPIView):
     """Register a new user with email and password."""
 
@@ -30,7 +80,7 @@ class RegisterView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         user_data = UserSerializer(user).data
         user_data.update(
@@ -41,3 +91,104 @@ class RegisterView(generics.CreateAPIView):
         )
 
         return Response(user_data, status=status.HTTP_201_CREATED)
+
+
+class BulkRegisterView(APIView):
+    """Register many users at once (staff only).
+
+    Takes JSON Lines (``application/x-ndjson``), read as it arrives, or a JSON
+    array of registration objects. Streams one result line per user back as
+    each batch is written; see ``provisioning.py``. No tokens are issued.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [NDJSONRenderer, FastJSONRenderer]
+
+    @extend_schema(
+        request={
+            NDJSON_MEDIA_TYPE: UserRegistrationSerializer,
+            "application/json": UserRegistrationSerializer(many=True),
+        },
+        responses={(200, NDJSON_MEDIA_TYPE): BulkRegisterResultSerializer},
+    )
+    def post(self, request, *args, **kwargs):
+        if request.content_type.split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+            lines = (line.decode("utf-8") for line in request.stream or ())
+            rows = read_rows(lines, "jsonl")
+        else:
+            data = request.data
+            if not isinstance(data, list):
+                raise exceptions.ParseError("Expected a list of users.")
+            rows = (
+                (number, row if isinstance(row, dict) else {"_invalid": json.dumps(row)})
+                for number, row in enumerate(data, start=1)
+            )
+
+        batches = BulkRegistration().provision_batches(rows)
+        return StreamingResponse(
+            (b"".join(map(ndjson_line, results)) for results in batches),
+            content_type=NDJSON_MEDIA_TYPE,
+        )
+
+
+class UserExportView(APIView):
+    """Export users as CSV (default) or JSON Lines, streamed (staff only).
+
+    ``?format=csv|ndjson`` or the Accept header picks the format, ``?fields=``
+    the columns; filter with ``is_active``, ``joined_after`` and
+    ``joined_before``. See ``exporting.py``.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+
+    @extend_schema(
+        parameters=[
+            ExportFilterSerializer,
+            OpenApiParameter("fields", str, description="Comma-separated columns (default: all)."),
+        ],
+        responses={
+            (200, CSV_MEDIA_TYPE): UserExportSerializer,
+            (200, NDJSON_MEDIA_TYPE): UserExportSerializer,
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        fmt = request.accepted_renderer.format
+        raw = request.query_params.get("fields")
+        fields = [name.strip() for name in raw.split(",") if name.strip()] if raw else None
+        export = UserExport(fmt, fields, request.query_params.dict())
+        response = StreamingResponse(
+            export.stream(), content_type=request.accepted_renderer.media_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="users.{fmt}"'
+        return response
+
+
+class UserListPagination(KeysetPagination):
+    ordering = ("date_joined", "id")  # backed by the custom_user_joined_id_idx index
+
+
+# Token state lookup + one page query (no COUNT).
+@query_budget(2)
+class UserListView(generics.ListAPIView):
+    """List users, oldest first (staff only)."""
+
+    serializer_class = UserSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserListPagination
+    queryset = User.objects.order_by("date_joined", "id")
+
+    def list(self, request, *args, **kwargs):
+        # UserSerializer's output built straight from .values() rows; ?fields=id,email
+        # selects a subset of its fields and only those columns are queried.
+        reader = ValuesReader.from_request(self.get_serializer_class(), request)
+        ordering = [name.lstrip("-") for name in getattr(self.paginator, "ordering", ())]
+        queryset = reader.values(self.filter_queryset(self.get_queryset()), extra=ordering)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.to_representation(queryset))
+        return self.get_paginated_response(reader.to_representation(page))
+
+
+class TokenRevokeView(TokenBlacklistView):
+    """Revoke a refresh token (log out); it can no longer be refreshed."""
@@ -3,6 +3,8 @@
 Runtime selection:
 - Uses ENV (or env) to choose config.settings.<ENV>
 - Loads env vars from environments/base.env + environments/<ENV>.env
+- Serves the native async register/token views (ASYNC_AUTH_VIEWS=1) unless
+  the environment says otherwise
 """
 
 from __future__ import annotations
@@ -15,5 +17,6 @@ from config.env import load_env_files
 
 env_name = load_env_files()
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", f"config.settings.{env_name}")
+os.environ.setdefault("ASYNC_AUTH_VIEWS", "1")
 
 application = get_asgi_application()
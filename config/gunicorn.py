@@ -0,0 +1,115 @@
+"""Gunicorn configuration for the production launch mode.
+
+    gunicorn -c config/gunicorn.py            # what scripts/run_web.sh runs
+
+Environment (all optional):
+- WEB_INTERFACE: wsgi (config.wsgi, gthread workers) or asgi (config.asgi,
+  uvicorn workers). Default wsgi.
+- WEB_CONCURRENCY: worker processes. Default: 2 x CPUs + 1 for wsgi, one per
+  CPU for asgi, where CPUs honours the container's cgroup quota and affinity.
+- WEB_THREADS: threads per gthread worker (default 1).
+- WEB_BIND (default 0.0.0.0:8000), WEB_KEEPALIVE seconds (default 5),
+  WEB_TIMEOUT / WEB_GRACEFUL_TIMEOUT seconds (default 30),
+  WEB_MAX_REQUESTS (default 1000, 0 disables) and WEB_MAX_REQUESTS_JITTER
+  (default 10% of it): workers are recycled after that many requests.
+- WEB_PIDFILE: write the master pid here, for signalling.
+- DATABASE_POOL (config/settings/base.py): with it, the database connections
+  are at most WEB_CONCURRENCY x DATABASE_POOL_MAX_SIZE, whatever WEB_THREADS is.
+- PROMETHEUS_MULTIPROC_DIR: where workers keep their metrics for /metrics
+  (default: a directory on tmpfs, emptied when the master starts).
+
+The app is imported once in the master (``preload_app``) and inherited by the
+workers, which share its memory copy-on-write. Reload without dropping
+connections:
+- ``kill -HUP <master>``: re-read this config and replace workers gracefully
+  (the preloaded code stays the same);
+- ``kill -USR2 <master>`` then ``kill -TERM <old master>``: start a new master
+  with the new code next to the old one, then retire the old one.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import tempfile
+
+from apps.core.cpus import available_cpus, default_workers
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+interface = os.environ.get("WEB_INTERFACE", "wsgi").lower()
+if interface not in ("wsgi", "asgi"):
+    raise RuntimeError(f"WEB_INTERFACE must be wsgi or asgi, not {interface!r}")
+
+wsgi_app = "config.asgi:application" if interface == "asgi" else "config.wsgi:application"
+worker_class = "uvicorn_worker.UvicornWorker" if interface == "asgi" else "gthread"
+workers = _env_int("WEB_CONCURRENCY", default_workers(interface, available_cpus()))
+threads = _env_int("WEB_THREADS", 1)
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+keepalive = _env_int("WEB_KEEPALIVE", 5)
+timeout = _env_int("WEB_TIMEOUT", 30)
+graceful_timeout = _env_int("WEB_GRACEFUL_TIMEOUT", 30)
+max_requests = _env_int("WEB_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("WEB_MAX_REQUESTS_JITTER", max_requests // 10)
+pidfile = os.environ.get("WEB_PIDFILE") or None
+
+preload_app = True
+# Heartbeat files on tmpfs: a slow overlay filesystem can make workers look hung.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = None  # SQLInstrumentationMiddleware already logs one record per request
+errorlog = "-"
+
+# Per-worker metric files, summed by any worker's /metrics (apps/core/metrics.py).
+# Gunicorn exports raw_env before preloading the app, so prometheus_client sees it.
+metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.path.join(
+    worker_tmp_dir or tempfile.gettempdir(), "prometheus-metrics"
+)
+raw_env = [f"PROMETHEUS_MULTIPROC_DIR={metrics_dir}"]
+
+
+def on_starting(server):
+    from apps.core.metrics import reset_multiprocess_dir
+
+    # Samples of a previous run (or master) would be summed into this one's.
+    reset_multiprocess_dir(metrics_dir)
+
+
+def when_ready(server):
+    """Build shared state once in the master so every worker inherits it."""
+    from django.conf import settings
+
+    if not settings.API_DOCS_ENABLED:
+        return  # no schema to serve, and drf-spectacular stays unimported
+
+    from apps.core.openapi import openapi_schema
+
+    try:
+        openapi_schema.get()
+    except Exception:  # noqa: BLE001  workers fall back to building it lazily
+        server.log.exception("Could not precompute the OpenAPI schema")
+
+
+def pre_fork(server, worker):
+    from django.db import connections
+
+    from apps.core.db import close_pools
+
+    # A connection (or connection pool) opened in the master must never be
+    # shared by the workers; each worker opens its own pool on first use.
+    connections.close_all()
+    close_pools()
+    # Move the preloaded objects out of the collector's reach so collections
+    # in the workers don't write to (and so copy) their pages.
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    from apps.core.metrics import archive_worker
+
+    # Keep its counts (counters must not go down) without keeping its files.
+    archive_worker(worker.pid, metrics_dir)
@@ -10,13 +10,16 @@ DJANGO_APPS = [
 ]
 
 THIRD_PARTY_APPS = [
-    "django_extensions",
     "rest_framework",
     "rest_framework_simplejwt",
-    "drf_spectacular",
     "corsheaders",
 ]
 
+# Optional subsystems, installed only when enabled in base.py (API_DOCS_ENABLED,
+# DJANGO_EXTENSIONS_ENABLED) so production workers don't pay for them at boot.
+API_DOCS_APPS = ["drf_spectacular"]
+DEV_TOOLS_APPS = ["django_extensions"]
+
 
 def discover_local_apps(base_dir: Path) -> list[str]:
     apps_dir = base_dir / "apps"
@@ -10,9 +10,9 @@ from pathlib import Path
 import environ
 
 from .api_docs import SPECTACULAR_SETTINGS  # noqa: F401
-from .apps import DJANGO_APPS, LOCAL_APPS, THIRD_PARTY_APPS
+from .apps import API_DOCS_APPS, DEV_TOOLS_APPS, DJANGO_APPS, LOCAL_APPS, THIRD_PARTY_APPS
 from .logging import LOGGING  # noqa: F401
-from .restframework import REST_FRAMEWORK  # noqa: F401
+from .restframework import REST_FRAMEWORK, SIMPLE_JWT  # noqa: F401
 from .sentry import init_sentry
 
 # Directories
@@ -32,11 +32,33 @@ DEBUG = env.bool("DEBUG")
 SECRET_KEY = env("SECRET_KEY")
 ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=[])
 
+# Optional subsystems: /api/schema/ + docs UIs, and django-extensions (shell_plus etc.)
+API_DOCS_ENABLED = env.bool("API_DOCS_ENABLED", default=True)
+DJANGO_EXTENSIONS_ENABLED = env.bool("DJANGO_EXTENSIONS_ENABLED", default=DEBUG)
+if not API_DOCS_ENABLED:
+    # apps.core.openapi.AutoSchema imports drf-spectacular; fall back to DRF's default.
+    REST_FRAMEWORK = {k: v for k, v in REST_FRAMEWORK.items() if k != "DEFAULT_SCHEMA_CLASS"}
+
 # Installed unit --> imported from config/settings/unit.py
-INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
+INSTALLED_APPS = [
+    *DJANGO_APPS,
+    *THIRD_PARTY_APPS,
+    *(API_DOCS_APPS if API_DOCS_ENABLED else []),
+    *(DEV_TOOLS_APPS if DJANGO_EXTENSIONS_ENABLED else []),
+    *LOCAL_APPS,
+]
+
+# Prometheus /metrics (apps/core/metrics.py); scrapes need "Bearer <METRICS_TOKEN>" if set.
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
 
 # Middleware
 MIDDLEWARE = [
+    # Request id and log context for everything below, including the SQL log.
+    "apps.core.middleware.RequestContextMiddleware",
+    *(["apps.core.middleware.MetricsMiddleware"] if METRICS_ENABLED else []),
+    # Before the rest, so it sees every query issued while handling the request.
+    "apps.core.middleware.SQLInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -47,6 +69,11 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-request SQL instrumentation (apps/core/middleware.py)
+SQL_LOG_REQUESTS = env.bool("SQL_LOG_REQUESTS", default=True)
+SQL_SERVER_TIMING = env.bool("SQL_SERVER_TIMING", default=DEBUG)
+SQL_QUERY_BUDGETS_STRICT = env.bool("SQL_QUERY_BUDGETS_STRICT", default=False)
+
 # CORS (dev-friendly default; tighten in prod projects)
 CORS_ALLOW_ALL_ORIGINS = env.bool("CORS_ALLOW_ALL_ORIGINS", default=DEBUG)
 
@@ -82,6 +109,63 @@ DATABASES = {
     }
 }
 
+# Read replicas, e.g. DATABASE_REPLICA_URLS=postgres://...@replica1/db,postgres://...@replica2/db
+# (aliases replica_1, ...). Only the reads that opt in use them (apps/core/routing.py);
+# a user's reads stay on the primary for DATABASE_REPLICA_STICKINESS seconds after they write.
+DATABASE_REPLICAS = []
+for n, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    DATABASES[f"replica_{n}"] = {
+        **env.db_url_config(url),
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "CONN_HEALTH_CHECKS": True,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{n}")
+DATABASE_ROUTERS = ["apps.core.routing.ReplicaRouter"] if DATABASE_REPLICAS else []
+DATABASE_REPLICA_STICKINESS = env.int("DATABASE_REPLICA_STICKINESS", default=5)
+
+# DATABASE_POOL=1 (PostgreSQL): each worker process shares a psycopg pool per alias of at most
+# DATABASE_POOL_MAX_SIZE connections between its threads instead of keeping one
+# persistent connection per thread; requests wait up to DATABASE_POOL_TIMEOUT seconds
+# for one. Connections are replaced after DATABASE_POOL_MAX_LIFETIME seconds, and
+# closed when idle for DATABASE_POOL_MAX_IDLE seconds above DATABASE_POOL_MIN_SIZE.
+if env.bool("DATABASE_POOL", default=False):
+    for database in DATABASES.values():
+        if database["ENGINE"].endswith("postgresql"):
+            database["CONN_MAX_AGE"] = 0  # the pool owns connection lifetime
+            database.setdefault("OPTIONS", {})["pool"] = {
+                "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+                "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=4),
+                "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+                "max_lifetime": env.float("DATABASE_POOL_MAX_LIFETIME", default=1800.0),
+                "max_idle": env.float("DATABASE_POOL_MAX_IDLE", default=300.0),
+            }
+
+# /readyz and `manage.py check_ready` (apps/core/health.py): seconds each check may take,
+# seconds a worker reuses a report before checking again, and whether a failing read
+# replica fails readiness (otherwise it is only reported).
+HEALTH_CHECK_TIMEOUT = env.float("HEALTH_CHECK_TIMEOUT", default=2.0)
+HEALTH_CHECK_CACHE_SECONDS = env.float("HEALTH_CHECK_CACHE_SECONDS", default=2.0)
+HEALTH_CHECK_REPLICAS_REQUIRED = env.bool("HEALTH_CHECK_REPLICAS_REQUIRED", default=False)
+
+# Caches: CACHE_URL is the shared backend (redis://..., filecache:///var/tmp/django_cache,
+# locmemcache://). "default" fronts it with a bounded per-process LRU (apps/core/cache.py)
+# whose entries other workers may read stale for up to CACHE_L1_TIMEOUT seconds.
+CACHES = {
+    "default": {
+        "BACKEND": "apps.core.cache.TieredCache",
+        "TIMEOUT": env.int("CACHE_TIMEOUT", default=300),
+        "OPTIONS": {
+            "L2_ALIAS": "shared",
+            "L1_MAX_ENTRIES": env.int("CACHE_L1_MAX_ENTRIES", default=1000),
+            "L1_TIMEOUT": env.int("CACHE_L1_TIMEOUT", default=5),
+            # Longest a get_or_set() caller waits for another to compute a value.
+            "LOCK_TIMEOUT": env.int("CACHE_LOCK_TIMEOUT", default=10),
+        },
+    },
+    "shared": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
 # Sentry (error monitoring) - initialises only when SENTRY_DSN is set.
 init_sentry(
     dsn=env("SENTRY_DSN", default=""),
@@ -91,8 +175,22 @@ init_sentry(
     ),
     release=env("SENTRY_RELEASE", default=""),
     traces_sample_rate=env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.0),
+    # Per URL name, e.g. "custom_user:register=1,custom_user:current_user=0.01";
+    # probes, metrics and the docs are never traced unless listed here.
+    traces_sample_rates={
+        **dict.fromkeys(["healthz", "readyz", "metrics", "schema", "redoc", "swagger-ui"], 0.0),
+        **{
+            name: float(rate)
+            for name, rate in env.dict("SENTRY_TRACES_SAMPLE_RATES", default={}).items()
+        },
+    },
+    # Record every traced view and always send requests slower than this or
+    # answered with a 5xx (0: off, only the per-view rates apply).
+    traces_slow_seconds=env.float("SENTRY_TRACES_SLOW_SECONDS", default=0.0),
+    # Of the traced requests; under tail capture scaled by each view's rate.
     profiles_sample_rate=env.float("SENTRY_PROFILES_SAMPLE_RATE", default=0.0),
     send_default_pii=env.bool("SENTRY_SEND_DEFAULT_PII", default=False),
+    auto_enabling_integrations=env.bool("SENTRY_AUTO_ENABLING_INTEGRATIONS", default=False),
     debug=DEBUG,
 )
 
@@ -128,3 +226,45 @@ MEDIA_ROOT = BASE_DIR / "media"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "custom_user.CustomUser"
+
+# Case-insensitive email login (apps/custom_user/backends.py).
+AUTHENTICATION_BACKENDS = ["apps.custom_user.backends.EmailBackend"]
+# auth.W004 ("USERNAME_FIELD is not unique"): email is unique through the
+# functional Lower("email") constraint, which the check doesn't recognise.
+SILENCED_SYSTEM_CHECKS = ["auth.W004"]
+
+# Seconds each worker trusts its cached is_active/revocation state for a JWT user.
+JWT_USER_STATE_TTL = env.int("JWT_USER_STATE_TTL", default=30)
+
+# Refresh-token revocation (apps/custom_user/revocation.py): per-worker Bloom filter sizing,
+# seconds between pulls of tokens revoked on other workers, and between purges of expired rows.
+JWT_REVOCATION = {
+    "BLOOM_CAPACITY": env.int("JWT_REVOCATION_BLOOM_CAPACITY", default=100_000),
+    "BLOOM_ERROR_RATE": env.float("JWT_REVOCATION_BLOOM_ERROR_RATE", default=0.001),
+    "SYNC_INTERVAL": env.int("JWT_REVOCATION_SYNC_INTERVAL", default=5),
+    "PURGE_INTERVAL": env.int("JWT_REVOCATION_PURGE_INTERVAL", default=3600),
+}
+
+# Rendered /auth/me/ responses (invalidated on user save/delete).
+CURRENT_USER_CACHE_ALIAS = env("CURRENT_USER_CACHE_ALIAS", default="default")
+CURRENT_USER_CACHE_TIMEOUT = env.int("CURRENT_USER_CACHE_TIMEOUT", default=300)
+
+# Native async register/token views; config/asgi.py turns this on by default.
+ASYNC_AUTH_VIEWS = env.bool("ASYNC_AUTH_VIEWS", default=False)
+
+# Bounded pool for password hashing in the async auth views (see apps/custom_user/hashing.py).
+PASSWORD_HASHING_POOL = {
+    "KIND": env("PASSWORD_HASHING_POOL_KIND", default="thread"),
+    # Defaults: the CPUs (divided by WEB_CONCURRENCY when set), and twice that.
+    "WORKERS": env.int("PASSWORD_HASHING_POOL_WORKERS", default=None),
+    "MAX_QUEUE": env.int("PASSWORD_HASHING_POOL_MAX_QUEUE", default=None),
+    "RETRY_AFTER": env.int("PASSWORD_HASHING_RETRY_AFTER", default=1),
+}
+
+# Where the precomputed OpenAPI schema is stored/shared (apps/core/openapi.py); unset keeps
+# it in memory only. Fill it ahead of time with `manage.py build_openapi_schema`.
+OPENAPI_SCHEMA_DIR = env("OPENAPI_SCHEMA_DIR", default=None)
+
+# Admin changelists report the planner's row estimate instead of COUNT(*) above
+# this many rows (PostgreSQL only; apps/core/counting.py).
+ESTIMATED_COUNT_THRESHOLD = env.int("ESTIMATED_COUNT_THRESHOLD", default=100_000)
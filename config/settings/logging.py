@@ -5,6 +5,18 @@ Default posture:
 - JSON logs otherwise (works well with Docker + cloud log aggregation).
 
 Override with DJANGO_LOG_FORMAT=human|json.
+
+Outside DEBUG, records are formatted and written by a background thread in
+batches (apps.core.logs.BatchingStreamHandler): a full queue drops records and
+logs how many, instead of blocking the request. DJANGO_LOG_ASYNC=0 writes
+synchronously; DJANGO_LOG_QUEUE_SIZE, DJANGO_LOG_BATCH_SIZE and
+DJANGO_LOG_FLUSH_INTERVAL tune the buffer.
+
+Records logged during a request carry `request_id`, `user_id`, `view_name`
+and `duration_ms` (apps.core.middleware.RequestContextMiddleware).
+
+The `apps.core.sql` logger emits one record per request with `db_queries`,
+`db_time_ms`, `db_slowest_ms` and `db_slowest_sql` fields (JSON format only).
 """
 
 import os
@@ -16,6 +28,17 @@ def _truthy(value: str | None) -> bool:
 
 DEBUG = _truthy(os.getenv("DEBUG"))
 LOG_FORMAT = (os.getenv("DJANGO_LOG_FORMAT") or ("human" if DEBUG else "json")).lower()
+LOG_ASYNC = _truthy(os.getenv("DJANGO_LOG_ASYNC", "0" if DEBUG else "1"))
+
+if LOG_ASYNC:
+    CONSOLE_HANDLER = {
+        "class": "apps.core.logs.BatchingStreamHandler",
+        "queue_size": int(os.getenv("DJANGO_LOG_QUEUE_SIZE", "10000")),
+        "batch_size": int(os.getenv("DJANGO_LOG_BATCH_SIZE", "256")),
+        "flush_interval": float(os.getenv("DJANGO_LOG_FLUSH_INTERVAL", "0.5")),
+    }
+else:
+    CONSOLE_HANDLER = {"class": "logging.StreamHandler"}
 
 LOGGING = {
     "version": 1,
@@ -31,10 +54,14 @@ LOGGING = {
             "fmt": "%(levelname)s %(asctime)s %(name)s %(message)s",
         },
     },
+    "filters": {
+        "request_context": {"()": "apps.core.logs.RequestContextFilter"},
+    },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            **CONSOLE_HANDLER,
             "formatter": "json" if LOG_FORMAT == "json" else "verbose",
+            "filters": ["request_context"],
         },
     },
     "root": {
@@ -25,3 +25,10 @@ CSRF_COOKIE_SECURE = True
 SECURE_HSTS_SECONDS = env.int("SECURE_HSTS_SECONDS", default=0)
 SECURE_HSTS_INCLUDE_SUBDOMAINS = env.bool("SECURE_HSTS_INCLUDE_SUBDOMAINS", default=False)
 SECURE_HSTS_PRELOAD = env.bool("SECURE_HSTS_PRELOAD", default=False)
+
+# /metrics names every view and counts login successes and failures: never serve
+# it unauthenticated in production. Without METRICS_TOKEN it is off (no route, no
+# middleware), so existing deployments keep starting; set a token to scrape it.
+if METRICS_ENABLED and not METRICS_TOKEN:
+    METRICS_ENABLED = False
+    MIDDLEWARE = [name for name in MIDDLEWARE if name != "apps.core.middleware.MetricsMiddleware"]
@@ -1,9 +1,32 @@
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("apps.custom_user.authentication.ClaimsJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # DRF's JSON renderer and parser, through orjson when the fast-json extra is
+    # installed; the bytes on the wire are the same either way (apps/core/renderers.py).
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_SCHEMA_CLASS": "apps.core.openapi.AutoSchema",
+    # Keyset pagination: opaque cursors, no COUNT(*) or OFFSET (apps/core/pagination.py).
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.KeysetPagination",
     "PAGE_SIZE": 10,
 }
+
+SIMPLE_JWT = {
+    # Tokens carry profile claims so requests can authenticate without a user query.
+    "TOKEN_OBTAIN_SERIALIZER": "apps.custom_user.tokens.ClaimsTokenObtainPairSerializer",
+    # Embed a password hash so every token dies when the password changes.
+    "CHECK_REVOKE_TOKEN": True,
+    # Every refresh returns a new refresh token and revokes the old one
+    # (apps/custom_user/revocation.py, not the token_blacklist app).
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "apps.custom_user.tokens.ClaimsTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "apps.custom_user.tokens.ClaimsTokenBlacklistSerializer",
+}
@@ -4,6 +4,13 @@ We keep Sentry *lean*:
 - Only initialise when SENTRY_DSN is provided.
 - Capture unhandled errors/exceptions via DjangoIntegration.
 - Use LoggingIntegration to record breadcrumbs (INFO+) and send ERROR logs as events.
+- Don't probe for Sentry's auto-enabling integrations (Celery, Redis, SQLAlchemy, ...)
+  unless asked to: each probe is an import attempt at boot.
+- Trace per URL name (``TracesSampler``): ``traces_sample_rates`` overrides
+  ``traces_sample_rate`` for the views it names, and with ``traces_slow_seconds``
+  slow and failing requests are kept whatever their rate; profiles are then
+  sampled per view too, so ``profiles_sample_rate`` keeps meaning a share of
+  the view's traced requests rather than of every recorded one.
 
 Sentry is excellent for error monitoring and traces; it should complement (not replace)
 stdout logs.
@@ -11,6 +18,131 @@ stdout logs.
 
 from __future__ import annotations
 
+import functools
+import random
+from datetime import datetime
+
+# Tag carrying the view name a transaction was sampled for.
+URL_NAME_TAG = "url_name"
+
+
+class TracesSampler:
+    """``traces_sampler``/``before_send_transaction`` pair sampling by URL name.
+
+    Head sampling: a request is traced with the rate of its view, looked up by
+    namespaced name (``custom_user:register``), then plain name (``schema``),
+    falling back to ``default_rate``. A rate of 0 never traces the view.
+
+    Tail capture (``slow_seconds`` > 0): every request of a view with a rate
+    above 0 is recorded, and the decision is made when it finishes. Requests
+    slower than ``slow_seconds`` or answered with a 5xx are always sent, the
+    rest with their view's rate. That records spans for requests that are
+    then dropped, which is the price of never missing a slow one; traces
+    continued from an upstream service keep the upstream decision.
+
+    Profiles are sampled relative to recorded transactions, so under tail
+    capture ``profiles_sampler`` scales ``profiles_rate`` by the view's rate:
+    the share of requests profiled stays what it would be without it.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float],
+        default_rate: float = 0.0,
+        slow_seconds: float = 0.0,
+        profiles_rate: float = 0.0,
+    ):
+        self.rates = rates
+        self.default_rate = default_rate
+        self.slow_seconds = slow_seconds
+        self.profiles_rate = profiles_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_rate > 0 or any(rate > 0 for rate in self.rates.values())
+
+    def rate(self, view_name: str | None) -> float:
+        if view_name is None:
+            return self.default_rate
+        if view_name in self.rates:
+            return self.rates[view_name]
+        return self.rates.get(view_name.rpartition(":")[2], self.default_rate)
+
+    def __call__(self, sampling_context: dict) -> float:
+        view_name = self._view_name(sampling_context)
+        if view_name is not None:
+            import sentry_sdk
+
+            # The request's scope: the tag lands on this transaction and its errors.
+            sentry_sdk.get_isolation_scope().set_tag(URL_NAME_TAG, view_name)
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+        rate = self.rate(view_name)
+        if rate <= 0 or not self.slow_seconds:
+            return rate
+        return 1.0
+
+    def profiles_sampler(self, sampling_context: dict) -> float:
+        if not self.slow_seconds or sampling_context.get("parent_sampled") is not None:
+            return self.profiles_rate
+        return self.profiles_rate * self.rate(self._view_name(sampling_context))
+
+    def before_send_transaction(self, event: dict, hint: dict) -> dict | None:
+        if not self.slow_seconds:
+            return event
+        trace = event.get("contexts", {}).get("trace", {})
+        if trace.get("parent_span_id") or self._failed(trace) or self._slow(event):
+            return event
+        rate = self.rate(event.get("tags", {}).get(URL_NAME_TAG))
+        return event if random.random() < rate else None
+
+    def _view_name(self, sampling_context: dict) -> str | None:
+        if "wsgi_environ" in sampling_context:
+            path = sampling_context["wsgi_environ"].get("PATH_INFO", "")
+        elif "asgi_scope" in sampling_context:
+            path = sampling_context["asgi_scope"].get("path", "")
+        else:
+            return None
+        from django.conf import settings
+        from django.urls import get_urlconf
+
+        return _resolve_view_name(path, get_urlconf() or settings.ROOT_URLCONF)
+
+    def _failed(self, trace: dict) -> bool:
+        status_code = trace.get("data", {}).get("http.response.status_code")
+        if status_code is not None:
+            return int(status_code) >= 500
+        return trace.get("status") not in (None, "ok")
+
+    def _slow(self, event: dict) -> bool:
+        try:
+            duration = _seconds(event["timestamp"]) - _seconds(event["start_timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return duration >= self.slow_seconds
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_view_name(path: str, urlconf: str) -> str | None:
+    # Sampling runs before the request is routed; resolve each path once, not
+    # on every request (bounded: paths carrying ids are mostly seen once).
+    from django.urls import Resolver404, resolve
+
+    try:
+        return resolve(path, urlconf).view_name
+    except Resolver404:
+        return None
+
+
+def _seconds(timestamp) -> float:
+    # Datetimes on the transaction, ISO strings once the event is serialized.
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
 
 def init_sentry(
     *,
@@ -18,11 +150,18 @@ def init_sentry(
     environment: str,
     release: str = "",
     traces_sample_rate: float = 0.0,
+    traces_sample_rates: dict[str, float] | None = None,
+    traces_slow_seconds: float = 0.0,
     profiles_sample_rate: float = 0.0,
     send_default_pii: bool = False,
+    auto_enabling_integrations: bool = False,
     debug: bool = False,
+    transport=None,
 ) -> None:
-    """Initialise Sentry if a DSN is configured."""
+    """Initialise Sentry if a DSN is configured.
+
+    ``transport`` replaces the HTTP transport (tests pass a stub).
+    """
 
     dsn = (dsn or "").strip()
     if not dsn:
@@ -35,13 +174,27 @@ def init_sentry(
     # Breadcrumbs for INFO+; events for ERROR+
     sentry_logging = LoggingIntegration(level=20, event_level=40)
 
+    sampler = TracesSampler(
+        traces_sample_rates or {}, traces_sample_rate, traces_slow_seconds, profiles_sample_rate
+    )
+    tracing = {"profiles_sample_rate": profiles_sample_rate}
+    if sampler.enabled:
+        # Left unset otherwise: an SDK with a sampler starts a transaction per request.
+        tracing.update(
+            traces_sampler=sampler, before_send_transaction=sampler.before_send_transaction
+        )
+        if traces_slow_seconds and profiles_sample_rate:
+            # Every traced view is recorded: don't profile all of them.
+            tracing["profiles_sampler"] = sampler.profiles_sampler
+
     sentry_sdk.init(
         dsn=dsn,
         environment=environment,
         release=release or None,
         integrations=[DjangoIntegration(), sentry_logging],
-        traces_sample_rate=traces_sample_rate,
-        profiles_sample_rate=profiles_sample_rate,
+        **tracing,
         send_default_pii=send_default_pii,
+        auto_enabling_integrations=auto_enabling_integrations,
         debug=debug,
+        transport=transport,
     )
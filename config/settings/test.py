@@ -11,24 +11,35 @@ load_env_files("test")
 from .base import *  # noqa: F403,F401
 
 # Database (Postgres)
-DATABASES = {"default": env.db("DATABASE_URL")}  # noqa: F405
+DATABASES = {
+    "default": env.db("DATABASE_URL"),  # noqa: F405
+    # An independent second database the replica routing tests point
+    # DATABASE_REPLICAS at, to tell which one answered a read.
+    "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+}
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = []
 
 # Speed up tests: faster password hashing
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 
+# Fail any request that exceeds its view's declared query budget
+SQL_QUERY_BUDGETS_STRICT = True
+
 # Reduce noise in test output
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
 }
 
-# Local memory cache for tests
+# Local memory cache for tests, behind the same tiered front end as production
 CACHES = {
-    "default": {
+    **CACHES,  # noqa: F405
+    "shared": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+    },
 }
 
 # Celery (if enabled in a future profile): run tasks eagerly during tests
@@ -1,18 +1,29 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from apps.core.health import healthz, readyz
 
 urlpatterns = [
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/docs/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
-    path("api/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("auth/", include("apps.custom_user.urls", namespace="custom_user")),
-    path("auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 ]
+
+if settings.METRICS_ENABLED:
+    from apps.core.metrics import metrics_view
+
+    urlpatterns += [path("metrics", metrics_view, name="metrics")]
+
+if settings.API_DOCS_ENABLED:
+    # Imported only when enabled: drf-spectacular's views pull in the schema machinery.
+    from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+    from apps.core.views import CachedSchemaView
+
+    urlpatterns += [
+        path("api/schema/", CachedSchemaView.as_view(), name="schema"),
+        path("api/docs/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+        path("api/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+    ]
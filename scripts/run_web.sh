@@ -1,17 +1,36 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-echo "[web] Waiting for database..."
-python scripts/wait_for_db.py
+echo "[web] Waiting for the databases and caches..."
+python manage.py check_ready --wait "${READY_WAIT_SECONDS:-60}" --skip migrations
 
 # Optional auto-migrate (default: enabled)
 AUTO_MIGRATE="${AUTO_MIGRATE:-1}"
 if [[ "$AUTO_MIGRATE" == "1" ]]; then
-  echo "[web] Applying migrations..."
-  python manage.py migrate
+  # Skips migrate unless the migration files changed; replicas take turns on a DB lock.
+  echo "[web] Applying migrations if changed..."
+  python manage.py migrate_if_changed
 else
   echo "[web] AUTO_MIGRATE=0 -> skipping migrations"
 fi
 
+if [[ -n "${OPENAPI_SCHEMA_DIR:-}" ]]; then
+  echo "[web] Precomputing OpenAPI schema..."
+  python manage.py build_openapi_schema
+fi
+
+# dev: Django's runserver (autoreload); prod: gunicorn, see config/gunicorn.py.
+ENV_NAME="${ENV:-${env:-dev}}"
+case "$ENV_NAME" in
+  dev|dev_docker|test) DEFAULT_WEB_SERVER=runserver ;;
+  *) DEFAULT_WEB_SERVER=gunicorn ;;
+esac
+WEB_SERVER="${WEB_SERVER:-$DEFAULT_WEB_SERVER}"
+
+if [[ "$WEB_SERVER" == "gunicorn" ]]; then
+  echo "[web] Starting gunicorn (${WEB_INTERFACE:-wsgi})..."
+  exec gunicorn --config config/gunicorn.py
+fi
+
 echo "[web] Starting Django dev server..."
-python manage.py runserver 0.0.0.0:8000
+exec python manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,195 @@
+"""Benchmark harness for the auth endpoints.
+
+Two ways to drive the same scenarios:
+
+- in-process, through Django's test client (``test_auth_benchmarks.py``), which
+  also records SQL queries and allocations per request;
+- against a running server with concurrent clients (``loadtest.py``).
+
+Both produce the same JSON report so two runs can be diffed, and
+``compare_reports`` turns a baseline + threshold into a pass/fail.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+ENDPOINTS = ("register", "token", "token_refresh", "me", "schema")
+
+# Latency metrics compared against the baseline; queries are compared exactly.
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+    queries: list[int] = field(default_factory=list)
+    alloc_kib: list[float] = field(default_factory=list)
+    # Database connections seen open while the endpoint was driven (loadtest.py).
+    db_connections: list[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies_ms)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "mean_ms": round(sum(ordered) / count, 3) if count else 0.0,
+            "p50_ms": round(percentile(ordered, 50), 3),
+            "p95_ms": round(percentile(ordered, 95), 3),
+            "p99_ms": round(percentile(ordered, 99), 3),
+            "throughput_rps": round(count / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "queries_per_request": (
+                round(sum(self.queries) / len(self.queries), 2) if self.queries else None
+            ),
+            "alloc_kib_per_request": (
+                round(sum(self.alloc_kib) / len(self.alloc_kib), 1) if self.alloc_kib else None
+            ),
+            "db_connections_peak": max(self.db_connections, default=None),
+        }
+
+
+def measure_in_process(
+    request: Callable[[], object],
+    iterations: int,
+    *,
+    count_queries: Callable[[Callable[[], object]], int] | None = None,
+    ok: Callable[[object], bool] = lambda response: True,
+) -> EndpointStats:
+    """Time ``request()`` sequentially; a second, traced pass measures allocations.
+
+    ``count_queries(fn)`` runs ``fn`` and returns the number of SQL queries it
+    issued. Allocation tracing slows Python down, so it never overlaps the
+    timed pass.
+    """
+    stats = EndpointStats()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        response = request()
+        stats.latencies_ms.append((time.perf_counter() - t0) * 1000)
+        if not ok(response):
+            stats.errors += 1
+    stats.wall_seconds = time.perf_counter() - started
+
+    if count_queries is not None:
+        stats.queries = [count_queries(request) for _ in range(min(iterations, 10))]
+
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, 10)):
+            tracemalloc.reset_peak()
+            before, _peak = tracemalloc.get_traced_memory()
+            request()
+            _current, peak = tracemalloc.get_traced_memory()
+            stats.alloc_kib.append((peak - before) / 1024)
+    finally:
+        tracemalloc.stop()
+    return stats
+
+
+def measure_concurrent(request: Callable[[], int], total: int, concurrency: int) -> EndpointStats:
+    """Issue ``total`` calls of ``request()`` (returning a status code) from
+    ``concurrency`` threads."""
+    stats = EndpointStats()
+    lock = threading.Lock()
+    remaining = iter(range(total))
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            t0 = time.perf_counter()
+            try:
+                failed = request() >= 400
+            except Exception:  # noqa: BLE001  connection errors count as failures
+                failed = True
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                stats.latencies_ms.append(elapsed_ms)
+                stats.errors += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.wall_seconds = time.perf_counter() - started
+    return stats
+
+
+def build_report(mode: str, results: dict[str, EndpointStats], **meta) -> dict:
+    return {
+        "mode": mode,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        **meta,
+        "endpoints": {name: stats.summary() for name, stats in results.items()},
+    }
+
+
+def write_report(report: dict, path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def load_report(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Return one message per regression beyond ``threshold`` (0.2 == +20%)."""
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        for metric in LATENCY_METRICS:
+            if before[metric] and now[metric] > before[metric] * (1 + threshold):
+                change = now[metric] / before[metric] - 1
+                regressions.append(
+                    f"{name}: {metric} {before[metric]:.2f} -> {now[metric]:.2f} ({change:+.0%})"
+                )
+        queries_before, queries_now = before["queries_per_request"], now["queries_per_request"]
+        if queries_before is not None and queries_now is not None and queries_now > queries_before:
+            regressions.append(f"{name}: queries/request {queries_before} -> {queries_now}")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{'endpoint':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}"
+        f"{'queries':>9}{'KiB':>8}{'db conns':>10}{'errors':>8}"
+    ]
+    for name, s in report["endpoints"].items():
+        queries = "-" if s["queries_per_request"] is None else s["queries_per_request"]
+        alloc = "-" if s["alloc_kib_per_request"] is None else s["alloc_kib_per_request"]
+        conns = s.get("db_connections_peak")
+        conns = "-" if conns is None else conns
+        lines.append(
+            f"{name:<18}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}"
+            f"{s['throughput_rps']:>9.1f}{queries!s:>9}{alloc!s:>8}{conns!s:>10}{s['errors']:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""In-process benchmark of the auth endpoints.
+
+    BENCHMARK_ITERATIONS=500 BENCHMARK_OUTPUT=bench.json pytest tests/benchmarks -s
+    BENCHMARK_BASELINE=bench.json BENCHMARK_THRESHOLD=0.2 pytest tests/benchmarks -s
+
+Without BENCHMARK_* variables this is a short smoke pass inside the normal
+suite. Test settings use the MD5 hasher; set BENCHMARK_REAL_HASHERS=1 to time
+register/token with Django's default PBKDF2 hashers.
+"""
+
+import itertools
+import os
+
+from django.conf import global_settings, settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from harness import (
+    build_report,
+    compare_reports,
+    format_report,
+    load_report,
+    measure_in_process,
+    write_report,
+)
+from rest_framework.test import APITestCase
+
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "5"))
+THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.2"))
+
+
+def count_queries(request):
+    with CaptureQueriesContext(connection) as ctx:
+        request()
+    return len(ctx.captured_queries)
+
+
+def succeeded(response):
+    return response.status_code < 400
+
+
+class AuthEndpointBenchmark(APITestCase):
+    password = "bench-pass-123"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="bench@example.com", password=self.password
+        )
+        self.refresh = str(ClaimsRefreshToken.for_user(self.user))
+        self.access = str(ClaimsRefreshToken.for_user(self.user).access_token)
+        self.emails = (f"bench-{n}@example.com" for n in itertools.count())
+
+    def rotate_refresh(self):
+        # Refresh tokens rotate: each one is accepted once, so chain them.
+        response = self.client.post(
+            reverse("custom_user:token_refresh"), {"refresh": self.refresh}, format="json"
+        )
+        if response.status_code == 200:
+            self.refresh = response.data["refresh"]
+        return response
+
+    def scenarios(self):
+        client = self.client
+        credentials = {"email": "bench@example.com", "password": self.password}
+        return {
+            "register": lambda: client.post(
+                reverse("custom_user:register"),
+                {"email": next(self.emails), "password": self.password},
+                format="json",
+            ),
+            "token": lambda: client.post(
+                reverse("custom_user:token_obtain_pair"), credentials, format="json"
+            ),
+            "token_refresh": self.rotate_refresh,
+            "me": lambda: client.get(
+                reverse("custom_user:current_user"),
+                HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            ),
+            "schema": lambda: client.get(reverse("schema")),
+        }
+
+    def test_auth_endpoints(self):
+        hashers = (
+            global_settings.PASSWORD_HASHERS
+            if os.getenv("BENCHMARK_REAL_HASHERS")
+            else settings.PASSWORD_HASHERS
+        )
+        with override_settings(PASSWORD_HASHERS=hashers):
+            results = {
+                name: measure_in_process(
+                    request, ITERATIONS, count_queries=count_queries, ok=succeeded
+                )
+                for name, request in self.scenarios().items()
+            }
+
+        report = build_report("in-process", results, iterations=ITERATIONS)
+        print("\n" + format_report(report))
+        for name, summary in report["endpoints"].items():
+            self.assertEqual(summary["errors"], 0, f"{name} returned errors")
+
+        if output := os.getenv("BENCHMARK_OUTPUT"):
+            write_report(report, output)
+        if baseline := os.getenv("BENCHMARK_BASELINE"):
+            regressions = compare_reports(load_report(baseline), report, THRESHOLD)
+            if regressions:
+                self.fail("Benchmark regressions:\n" + "\n".join(regressions))
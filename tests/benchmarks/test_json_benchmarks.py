@@ -0,0 +1,51 @@
+"""Benchmark of JSON rendering: DRF's ``JSONRenderer`` vs. ``FastJSONRenderer``.
+
+    BENCHMARK_ITERATIONS=50 pytest tests/benchmarks -s -k json
+    BENCHMARK_ROWS=100,1000,10000,100000 pytest tests/benchmarks -s -k json
+
+Both render the same ``UserSerializer(many=True).data`` (UUIDs, datetimes,
+strings), serialized once up front, so only the encoding is timed. Without
+orjson installed ``FastJSONRenderer`` is ``JSONRenderer`` and the two match.
+"""
+
+import os
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from harness import build_report, format_report, measure_in_process
+from rest_framework.renderers import JSONRenderer
+
+from apps.core import renderers
+from apps.core.renderers import FastJSONRenderer
+from apps.custom_user.serializers import UserSerializer
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "3"))
+ROWS = [int(n) for n in os.getenv("BENCHMARK_ROWS", "100,1000,10000").split(",")]
+
+User = get_user_model()
+
+
+class JSONRendererBenchmark(TestCase):
+    def test_render_user_lists(self):
+        User.objects.bulk_create(
+            (
+                User(email=f"json-{n}@example.com", first_name="Fïrst", last_name=f"Last {n}")
+                for n in range(max(ROWS))
+            ),
+            batch_size=5000,
+        )
+        standard, fast = JSONRenderer(), FastJSONRenderer()
+
+        results = {}
+        for rows in ROWS:
+            data = UserSerializer(User.objects.order_by("id")[:rows], many=True).data
+            self.assertEqual(fast.render(data), standard.render(data))
+            results[f"stdlib_{rows}"] = measure_in_process(
+                lambda data=data: standard.render(data), ITERATIONS
+            )
+            results[f"orjson_{rows}" if renderers.orjson else f"fallback_{rows}"] = (
+                measure_in_process(lambda data=data: fast.render(data), ITERATIONS)
+            )
+
+        report = build_report("in-process", results, iterations=ITERATIONS)
+        print("\n" + format_report(report))
@@ -0,0 +1,67 @@
+"""Benchmark of the cost of request metrics.
+
+    BENCHMARK_ITERATIONS=2000 pytest tests/benchmarks -s -k metrics
+
+Times an authenticated ``GET /auth/me/`` through the full middleware stack
+with and without ``MetricsMiddleware``, and ``Metrics.observe_request()`` on
+its own, which is the per-request overhead (in-process samples; under
+gunicorn each update is a write to the worker's mmap file instead).
+"""
+
+import os
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from harness import build_report, format_report, measure_in_process
+from prometheus_client import CollectorRegistry
+
+from apps.core.metrics import Metrics
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "200"))
+METRICS_MIDDLEWARE = "apps.core.middleware.MetricsMiddleware"
+
+User = get_user_model()
+
+
+class MetricsOverheadBenchmark(TestCase):
+    def test_metrics_overhead(self):
+        user = User.objects.create_user(email="metrics-bench@example.com")
+        token = ClaimsRefreshToken.for_user(user).access_token
+        url = reverse("custom_user:current_user")
+
+        def me(client):
+            return lambda: client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with_metrics = Client()
+        with override_settings(
+            MIDDLEWARE=[m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]
+        ):
+            without_metrics = Client()
+            without_metrics.get(url)  # builds its middleware chain without metrics
+
+        metrics = Metrics(CollectorRegistry())
+        request = SimpleNamespace(
+            resolver_match=SimpleNamespace(view_name="custom_user:current_user"),
+            method="GET",
+            sql_stats=SimpleNamespace(duration=0.001, count=1),
+            auth_metric=None,
+        )
+        response = SimpleNamespace(status_code=200)
+
+        ok = {"ok": lambda response: response.status_code == 200}
+        results = {
+            "me_metrics": measure_in_process(me(with_metrics), ITERATIONS, **ok),
+            "me_no_metrics": measure_in_process(me(without_metrics), ITERATIONS, **ok),
+            "observe": measure_in_process(
+                lambda: metrics.observe_request(request, response, 0.01), ITERATIONS
+            ),
+        }
+
+        report = build_report("in-process", results, iterations=ITERATIONS)
+        print("\n" + format_report(report))
+        for name, summary in report["endpoints"].items():
+            self.assertEqual(summary["errors"], 0, f"{name} returned errors")
@@ -0,0 +1,114 @@
+"""Benchmark of the staff user list at increasing depth: keyset vs. page numbers.
+
+    BENCHMARK_USERS=200000 BENCHMARK_ITERATIONS=200 pytest tests/benchmarks -s -k pagination
+
+Times the first, middle and last page of ``/auth/users/`` with the keyset
+paginator (a cursor positioned at that depth) and with ``PageNumberPagination``
+(``?page=N``: a ``COUNT(*)`` plus ``OFFSET``). Keyset latency stays flat with
+depth; the page-number path grows with it. Run against PostgreSQL for
+representative numbers.
+"""
+
+import os
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from harness import build_report, format_report, measure_in_process
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.pagination import KeysetCursor
+from apps.custom_user.views import UserListPagination, UserListView
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "5"))
+USERS = int(os.getenv("BENCHMARK_USERS", "2000"))
+PAGE_SIZE = 50
+
+User = get_user_model()
+
+
+def count_queries(request):
+    with CaptureQueriesContext(connection) as ctx:
+        request()
+    return len(ctx.captured_queries)
+
+
+def cursor_after(row) -> str:
+    """The cursor a client holds after reading ``row``."""
+    paginator = UserListPagination()
+    paginator.base_url = "http://testserver/auth/users/"
+    paginator.names = ["date_joined", "id"]
+    link = paginator.encode_cursor(KeysetCursor(paginator.position_of(row), reverse=False))
+    return parse_qs(urlsplit(link).query)["cursor"][0]
+
+
+class PageNumbers(PageNumberPagination):
+    page_size = PAGE_SIZE
+
+
+class UserListPaginationBenchmark(TestCase):
+    def test_page_latency_by_depth(self):
+        joined = timezone.now() - timedelta(days=365)
+        User.objects.bulk_create(
+            (
+                User(email=f"page-{n}@example.com", date_joined=joined + timedelta(seconds=n))
+                for n in range(USERS)
+            ),
+            batch_size=5000,
+        )
+        staff = User.objects.create_user(email="staff-bench@example.com", is_staff=True)
+        factory = APIRequestFactory()
+        keyset_view = UserListView.as_view()
+        numbered_view = UserListView.as_view(pagination_class=PageNumbers)
+        last_page = (USERS + 1 + PAGE_SIZE - 1) // PAGE_SIZE
+
+        def keyset_at(depth: int):
+            query = {"page_size": PAGE_SIZE}
+            if depth:
+                query["cursor"] = cursor_after(
+                    User.objects.order_by("date_joined", "id")[depth - 1]
+                )
+            return self.request(factory, keyset_view, staff, query)
+
+        def numbered(page: int):
+            return self.request(factory, numbered_view, staff, {"page": page})
+
+        depths = {
+            "first": 0,
+            "middle": (last_page // 2) * PAGE_SIZE,
+            "last": (last_page - 1) * PAGE_SIZE,
+        }
+        scenarios = {f"keyset_{name}": keyset_at(depth) for name, depth in depths.items()}
+        scenarios |= {
+            f"offset_{name}": numbered(depth // PAGE_SIZE + 1) for name, depth in depths.items()
+        }
+        results = {
+            name: measure_in_process(
+                request,
+                ITERATIONS,
+                count_queries=count_queries,
+                ok=lambda response: response.status_code == 200,
+            )
+            for name, request in scenarios.items()
+        }
+
+        report = build_report("in-process", results, iterations=ITERATIONS, users=USERS)
+        print("\n" + format_report(report))
+        for name, summary in report["endpoints"].items():
+            self.assertEqual(summary["errors"], 0, f"{name} returned errors")
+
+    @staticmethod
+    def request(factory, view, user, query):
+        def send():
+            request = factory.get("/auth/users/", query)
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            return response
+
+        return send
@@ -0,0 +1,70 @@
+"""Benchmark of the refresh-token revocation check.
+
+    BENCHMARK_ITERATIONS=2000 BENCHMARK_REVOKED=100000 pytest tests/benchmarks -s -k revocation
+
+Fills the revocation table with ``BENCHMARK_REVOKED`` rows, then times the
+check for tokens that were never revoked (the common case on refresh) through
+the Bloom filter and, for comparison, as the plain table lookup a DB-only
+denylist would do. Prints the filter's memory use and its estimated and
+observed false-positive rates.
+"""
+
+import os
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from harness import build_report, format_report, measure_in_process
+
+from apps.custom_user.models import RevokedToken
+from apps.custom_user.revocation import RevocationStore
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "5"))
+REVOKED = int(os.getenv("BENCHMARK_REVOKED", "1000"))
+
+
+def count_queries(check):
+    with CaptureQueriesContext(connection) as ctx:
+        check()
+    return len(ctx.captured_queries)
+
+
+class RevocationCheckBenchmark(TestCase):
+    def test_revocation_check(self):
+        expires_at = timezone.now() + timedelta(days=1)
+        RevokedToken.objects.bulk_create(
+            (RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at) for _ in range(REVOKED)),
+            batch_size=5000,
+        )
+        store = RevocationStore(BLOOM_CAPACITY=REVOKED, SYNC_INTERVAL=3600, PURGE_INTERVAL=0)
+        store.rebuild()
+
+        fresh = (uuid.uuid4().hex for _ in iter(int, 1))
+        results = {
+            "check_filter": measure_in_process(
+                lambda: store.is_revoked(next(fresh)), ITERATIONS, count_queries=count_queries
+            ),
+            "check_table": measure_in_process(
+                lambda: RevokedToken.objects.filter(jti=next(fresh)).exists(),
+                ITERATIONS,
+                count_queries=count_queries,
+            ),
+        }
+        report = build_report("in-process", results, iterations=ITERATIONS, revoked=REVOKED)
+        print("\n" + format_report(report))
+
+        # Observed rate over enough never-revoked ids to see a 0.1% target.
+        probes = max(ITERATIONS, 10_000)
+        for _ in range(probes):
+            store.is_revoked(next(fresh))
+        stats = store.stats()
+        print(
+            f"filter: {stats['entries']} entries, {stats['memory_bytes'] / 1024:.1f} KiB, "
+            f"{stats['hashes']} hashes, estimated fp {stats['estimated_error_rate']:.4%}, "
+            f"observed fp {stats['observed_error_rate']:.4%} over {stats['checks']} checks"
+        )
+        self.assertEqual(store.false_positives, stats["filter_hits"])
+        self.assertLess(stats["observed_error_rate"], 5 * store.option("BLOOM_ERROR_RATE"))
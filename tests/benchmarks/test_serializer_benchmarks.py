@@ -0,0 +1,64 @@
+"""Benchmark of list serialization: ``UserSerializer(many=True)`` vs. ``ValuesReader``.
+
+    BENCHMARK_ITERATIONS=50 pytest tests/benchmarks -s -k serializer
+    BENCHMARK_ROWS=1000,10000,100000 pytest tests/benchmarks -s -k serializer
+
+Each call fetches and serializes every row: the ModelSerializer path loads
+model instances, the reader selects the serialized columns with ``.values()``
+(``values_sparse`` only ``id`` and ``email``, as ``?fields=id,email`` does).
+"""
+
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from harness import build_report, format_report, measure_in_process
+
+from apps.core.serializers import ValuesReader
+from apps.custom_user.serializers import UserSerializer
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "3"))
+ROWS = [int(n) for n in os.getenv("BENCHMARK_ROWS", "1000,10000").split(",")]
+
+User = get_user_model()
+
+
+def count_queries(serialize):
+    with CaptureQueriesContext(connection) as ctx:
+        serialize()
+    return len(ctx.captured_queries)
+
+
+class SerializerBenchmark(TestCase):
+    def test_list_serialization(self):
+        User.objects.bulk_create(
+            (
+                User(email=f"ser-{n}@example.com", first_name="First", last_name=f"Last {n}")
+                for n in range(max(ROWS))
+            ),
+            batch_size=5000,
+        )
+        full = ValuesReader(UserSerializer)
+        sparse = ValuesReader(UserSerializer, ["id", "email"])
+
+        results = {}
+        for rows in ROWS:
+            queryset = User.objects.order_by("id")[:rows]
+            label = f"{rows // 1000}k"
+            scenarios = {
+                f"model_{label}": lambda qs=queryset: UserSerializer(qs.all(), many=True).data,
+                f"values_{label}": lambda qs=queryset: full.to_representation(full.values(qs)),
+                f"values_sparse_{label}": (
+                    lambda qs=queryset: sparse.to_representation(sparse.values(qs))
+                ),
+            }
+            self.assertEqual(scenarios[f"model_{label}"](), scenarios[f"values_{label}"]())
+            for name, serialize in scenarios.items():
+                results[name] = measure_in_process(
+                    serialize, ITERATIONS, count_queries=count_queries
+                )
+
+        report = build_report("in-process", results, iterations=ITERATIONS)
+        print("\n" + format_report(report))
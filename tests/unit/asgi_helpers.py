@@ -0,0 +1,61 @@
+"""Serving a request through Django's ``ASGIHandler``, as an ASGI server would.
+
+The test client's async handler doesn't consume streaming responses the way
+``ASGIHandler`` does (through ``__aiter__``), so streaming under ASGI is
+tested here.
+"""
+
+import asyncio
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+
+
+async def asgi_request(method, path, body=b"", headers=(), on_body=lambda: None):
+    """Serve a request through ``ASGIHandler``; the messages sent, each body
+    message paired with ``on_body()`` at the time it was sent."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+    received = []
+
+    async def receive():
+        if not received:
+            received.append(True)
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Future()  # no disconnect; cancelled once the response is sent
+
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            messages.append((message, on_body()))
+        else:
+            messages.append(message)
+
+    # Like the test client: leave the test's database connections alone.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        await ASGIHandler()(scope, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+    return messages
@@ -0,0 +1,96 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.counting import EstimatedCountPaginator, estimate_count
+
+User = get_user_model()
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="Ann.Lee@example.com", first_name="Ann", last_name="Lee")
+        User.objects.create_user(email="bob@example.com", first_name="Bob", last_name="Annand")
+        User.objects.create_user(email="carol@example.com", first_name="Carol", last_name="King")
+
+    def emails(self, text):
+        return sorted(User.objects.search(text).values_list("email", flat=True))
+
+    def test_terms_match_any_field_case_insensitively(self):
+        self.assertEqual(self.emails("ann"), ["Ann.Lee@example.com", "bob@example.com"])
+        self.assertEqual(self.emails("CAROL"), ["carol@example.com"])
+        self.assertEqual(self.emails("ann bob"), ["bob@example.com"])
+        self.assertEqual(self.emails('"ann.lee@"'), ["Ann.Lee@example.com"])
+        self.assertEqual(self.emails("zed"), [])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_sqlite_prefix_search_uses_the_lower_indexes(self):
+        sql, params = User.objects.search("ann").values("id").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertNotIn("SCAN", plan)
+        self.assertIn("custom_user_first_name_lower_idx", plan)
+
+
+class EstimatedCountTests(TestCase):
+    def setUp(self):
+        User.objects.bulk_create(
+            User(email=f"count{n}@example.com", is_staff=n % 2 == 0) for n in range(20)
+        )
+
+    def test_small_or_unestimated_results_are_counted_exactly(self):
+        self.assertEqual(EstimatedCountPaginator(User.objects.order_by("id"), 5).count, 20)
+        self.assertEqual(EstimatedCountPaginator(list(range(7)), 5).count, 7)
+
+    @skipUnless(connection.vendor == "postgresql", "planner estimates are PostgreSQL-only")
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=0)
+    def test_postgres_reports_the_planner_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        self.assertEqual(estimate_count(User.objects.all()), 20)
+        filtered = User.objects.filter(is_staff=True).order_by("id")
+        self.assertGreater(estimate_count(filtered), 0)
+        with CaptureQueriesContext(connection) as ctx:
+            count = EstimatedCountPaginator(filtered, 5).count
+        self.assertGreater(count, 0)
+        self.assertNotIn("COUNT(", " ".join(q["sql"] for q in ctx.captured_queries).upper())
+
+    @skipUnless(connection.vendor != "postgresql", "other backends only")
+    def test_other_backends_have_no_estimate(self):
+        self.assertIsNone(estimate_count(User.objects.all()))
+
+
+class UserAdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="root@example.com", password="x")
+        User.objects.create_user(email="staffer@example.com", first_name="Ann", is_staff=True)
+        User.objects.create_user(email="gone@example.com", last_name="Ann", is_active=False)
+        self.client.force_login(self.admin)
+        self.url = reverse("admin:custom_user_customuser_changelist")
+
+    def test_search_and_filters(self):
+        response = self.client.get(self.url, {"q": "ann"})
+        self.assertEqual(
+            sorted(user.email for user in response.context["cl"].result_list),
+            ["gone@example.com", "staffer@example.com"],
+        )
+        response = self.client.get(self.url, {"q": "ann", "is_active__exact": "0"})
+        self.assertEqual(
+            [user.email for user in response.context["cl"].result_list], ["gone@example.com"]
+        )
+
+    def test_changelist_counts_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"is_staff__exact": "1"})
+        self.assertEqual(response.status_code, 200)
+        counts = [q["sql"] for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
+        self.assertEqual(len(counts), 1)
+        self.assertEqual(
+            [user.email for user in response.context["cl"].result_list],
+            ["root@example.com", "staffer@example.com"],
+        )
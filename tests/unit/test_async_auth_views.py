@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework import status
+
+from apps.custom_user import async_views
+from apps.custom_user.hashing import HashingPool, PoolSaturated
+
+User = get_user_model()
+
+
+class AsyncAuthViewTests(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.pool = HashingPool(workers=2, max_queue=0)
+        patcher = mock.patch.object(async_views, "get_hashing_pool", return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.shutdown)
+
+    def post(self, view, data):
+        request = self.factory.post("/", data=json.dumps(data), content_type="application/json")
+        return view.as_view()(request)
+
+    async def test_register_hashes_on_the_pool_and_returns_tokens(self):
+        response = await self.post(
+            async_views.RegisterView,
+            {"email": "async@EXAMPLE.com", "password": "newpass123", "first_name": "Async"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        body = json.loads(response.content)
+        self.assertIn("access", body)
+        self.assertEqual(body["email"], "async@example.com")
+        user = await User.objects.aget(email="async@example.com")
+        self.assertTrue(user.check_password("newpass123"))
+
+    async def test_register_validation_errors(self):
+        response = await self.post(async_views.RegisterView, {"email": "not-an-email"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", json.loads(response.content))
+
+    async def test_token_obtain(self):
+        await sync_to_async(User.objects.create_user)(
+            email="login@example.com", password="testpass123"
+        )
+
+        ok = await self.post(
+            async_views.TokenObtainPairView,
+            {"email": "login@example.com", "password": "testpass123"},
+        )
+        bad = await self.post(
+            async_views.TokenObtainPairView,
+            {"email": "login@example.com", "password": "wrong"},
+        )
+
+        self.assertEqual(ok.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(json.loads(ok.content)), {"access", "refresh"})
+        self.assertEqual(bad.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", bad)
+
+    async def test_saturated_pool_sheds_load_with_429(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        for _ in range(self.pool.capacity):
+            self.pool.submit(release.wait)
+
+        response = await self.post(
+            async_views.TokenObtainPairView,
+            {"email": "login@example.com", "password": "testpass123"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+
+
+class HashingPoolTests(TestCase):
+    def test_capacity_is_enforced_and_released(self):
+        pool = HashingPool(workers=1, max_queue=1, retry_after=3)
+        self.addCleanup(pool.shutdown)
+        release = threading.Event()
+        futures = [pool.submit(release.wait) for _ in range(2)]
+
+        with self.assertRaises(PoolSaturated) as ctx:
+            pool.submit(release.wait)
+        self.assertEqual(ctx.exception.retry_after, 3)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(pool.in_flight, 0)
+
+    def test_default_size_is_the_process_share_of_the_cpus(self):
+        with mock.patch("apps.custom_user.hashing.available_cpus", return_value=8):
+            for env, size in [
+                ({"WEB_INTERFACE": "asgi"}, 8),  # e.g. a single uvicorn process
+                ({}, 8),
+                ({"WEB_CONCURRENCY": "2"}, 4),
+                ({"WEB_CONCURRENCY": "17"}, 1),
+                ({"WEB_INTERFACE": "bogus"}, 8),  # not the gunicorn config's business
+            ]:
+                with self.subTest(env), mock.patch.dict("os.environ", env, clear=False):
+                    for name in {"WEB_INTERFACE", "WEB_CONCURRENCY"} - env.keys():
+                        os.environ.pop(name, None)
+                    self.assertEqual(HashingPool().workers, size)
@@ -0,0 +1,209 @@
+import json
+import threading
+from unittest import mock
+
+from asgi_helpers import asgi_request
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.custom_user import provisioning
+from apps.custom_user.hashing import HashingPool
+from apps.custom_user.provisioning import BulkRegistration
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+USERS = [
+    {"email": "alice@EXAMPLE.com", "password": "pass-alice-123", "first_name": "Alice"},
+    {"email": "bob@example.com"},
+    {"email": "ALICE@example.com", "password": "other-password"},
+    {"email": "taken@example.com", "password": "pass-taken-123"},
+    {"email": "not-an-email", "password": "whatever-123"},
+    {"email": "carol@example.com", "password": "pass-carol-123", "last_name": "C" * 51},
+    {"email": "dave@example.com", "password": "pass-dave-1234"},
+]
+
+
+class BulkRegisterTests(APITestCase):
+    def setUp(self):
+        User.objects.create_user(email="Taken@example.com", password="existing-123")
+        staff = User.objects.create_user(email="staff@example.com", password="x", is_staff=True)
+        self.authenticate(staff)
+        self.url = reverse("custom_user:bulk_register")
+
+    def authenticate(self, user):
+        token = ClaimsRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def results(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_ndjson_in_ndjson_out(self):
+        body = "\n".join(json.dumps(user) for user in USERS) + "\n\n{broken\n"
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+        results = self.results(response)
+
+        alice = User.objects.get(email="alice@example.com")
+        dave = User.objects.get(email="dave@example.com")
+        self.assertTrue(alice.check_password("pass-alice-123"))
+        self.assertEqual(alice.first_name, "Alice")
+        self.assertEqual(
+            results,
+            [
+                {"row": 1, "email": "alice@example.com", "status": "created", "id": alice.pk},
+                {
+                    "row": 2,
+                    "email": "bob@example.com",
+                    "status": "rejected",
+                    "reason": "password: This field is required.",
+                },
+                {
+                    "row": 3,
+                    "email": "ALICE@example.com",
+                    "status": "rejected",
+                    "reason": "duplicate email in input",
+                },
+                {
+                    "row": 4,
+                    "email": "taken@example.com",
+                    "status": "rejected",
+                    "reason": "email already exists",
+                },
+                {
+                    "row": 5,
+                    "email": "not-an-email",
+                    "status": "rejected",
+                    "reason": "email: Enter a valid email address.",
+                },
+                {
+                    "row": 6,
+                    "email": "carol@example.com",
+                    "status": "rejected",
+                    "reason": "last_name: Ensure this field has no more than 50 characters.",
+                },
+                {"row": 7, "email": "dave@example.com", "status": "created", "id": dave.pk},
+                {"row": 8, "email": "", "status": "rejected", "reason": "invalid JSON object"},
+            ],
+        )
+        self.assertEqual(User.objects.count(), 4)
+
+    def test_json_array_streams_batch_by_batch(self):
+        users = [
+            {"email": f"user{n}@example.com", "password": f"pass-{n}-abcdef"} for n in range(5)
+        ]
+        with mock.patch.object(BulkRegistration, "__init__", self.small_batches):
+            response = self.client.post(self.url, users, format="json")
+            stream = iter(response.streaming_content)
+            first = [json.loads(line) for line in next(stream).splitlines()]
+            # The first batch is committed before the second one is read.
+            self.assertEqual([r["status"] for r in first], ["created", "created"])
+            self.assertEqual(User.objects.filter(email__startswith="user").count(), 2)
+            rest = [json.loads(line) for line in b"".join(stream).splitlines()]
+        self.assertEqual([r["row"] for r in rest], [3, 4, 5])
+        self.assertEqual(User.objects.filter(email__startswith="user").count(), 5)
+
+    @staticmethod
+    def small_batches(importer, **kwargs):
+        super(BulkRegistration, importer).__init__(batch_size=2, hash_workers=0)
+
+    def test_a_failed_batch_does_not_stop_the_next(self):
+        users = [
+            {"email": f"user{n}@example.com", "password": f"pass-{n}-abcdef"} for n in range(4)
+        ]
+        write = BulkRegistration.write
+        calls = []
+
+        def flaky_write(importer, batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise DatabaseError("connection lost")
+            return write(importer, batch)
+
+        with (
+            mock.patch.object(BulkRegistration, "__init__", self.small_batches),
+            mock.patch.object(BulkRegistration, "write", flaky_write),
+            self.assertLogs("apps.custom_user.provisioning", "ERROR"),
+        ):
+            results = self.results(self.client.post(self.url, users, format="json"))
+        self.assertEqual([r["status"] for r in results], ["failed", "failed", "created", "created"])
+        self.assertEqual(User.objects.filter(email__startswith="user").count(), 2)
+
+    async def test_streams_under_asgi(self):
+        users = [
+            {"email": f"user{n}@example.com", "password": f"pass-{n}-abcdef"} for n in range(5)
+        ]
+        token = ClaimsRefreshToken.for_user(
+            await User.objects.aget(email="staff@example.com")
+        ).access_token
+        provision_batch = BulkRegistration.provision_batch
+        batches = []
+
+        def counted(importer, batch):
+            batches.append(len(batch))
+            return provision_batch(importer, batch)
+
+        with (
+            mock.patch.object(BulkRegistration, "__init__", self.small_batches),
+            mock.patch.object(BulkRegistration, "provision_batch", counted),
+        ):
+            messages = await asgi_request(
+                "POST",
+                self.url,
+                json.dumps(users).encode(),
+                [
+                    (b"authorization", f"Bearer {token}".encode()),
+                    (b"content-type", b"application/json"),
+                ],
+                on_body=lambda: len(batches),
+            )
+        self.assertEqual(messages[0]["status"], 200)
+        # Each batch's lines went out before the next batch was provisioned.
+        bodies = [(message["body"], written) for message, written in messages[1:-1]]
+        self.assertEqual([written for _, written in bodies], [1, 2, 3])
+        results = [json.loads(line) for body, _ in bodies for line in body.splitlines()]
+        self.assertEqual([r["status"] for r in results], ["created"] * 5)
+
+    def test_staff_only_and_lists_only(self):
+        self.assertEqual(
+            self.client.post(self.url, {"email": "x@example.com"}, format="json").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.authenticate(User.objects.get_by_email("taken@example.com"))
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class HashPasswordsTests(APITestCase):
+    def test_one_password_per_task_on_half_the_pool(self):
+        pool = HashingPool(workers=4, max_queue=0)
+        self.addCleanup(pool.shutdown)
+        lock, running, peak = threading.Lock(), [0], [0]
+        make_password = provisioning.make_password
+
+        def hash_one(password):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            try:
+                return make_password(password)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        passwords = [f"pass-{n}-abcdef" for n in range(8)]
+        with (
+            mock.patch.object(provisioning, "get_hashing_pool", return_value=pool),
+            mock.patch.object(provisioning, "make_password", hash_one),
+            mock.patch.object(pool, "submit", wraps=pool.submit) as submit,
+        ):
+            hashes = BulkRegistration().hash_passwords(passwords)
+        self.assertEqual(submit.call_count, 8)
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual(pool.in_flight, 0)
+        for password, password_hash in zip(passwords, hashes, strict=True):
+            self.assertTrue(User(password=password_hash).check_password(password))
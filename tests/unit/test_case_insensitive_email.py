@@ -0,0 +1,112 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import authenticate, get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+migration = import_module("apps.custom_user.migrations.0002_email_case_insensitive_unique")
+
+
+class CaseInsensitiveEmailTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="Mixed.Case@Example.com", password="testpass123")
+
+    def test_lookup_and_authentication_ignore_case(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(User.objects.get_by_email("mixed.case@example.COM"), self.user)
+        self.assertEqual(
+            authenticate(email="MIXED.CASE@example.com", password="testpass123"), self.user
+        )
+        self.assertIsNone(authenticate(email="mixed.case@example.com", password="wrong"))
+
+    def test_token_obtain_with_other_case(self):
+        response = self.client.post(
+            reverse("custom_user:token_obtain_pair"),
+            {"email": "mixed.case@EXAMPLE.com", "password": "testpass123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_registration_rejects_case_duplicates(self):
+        response = self.client.post(
+            reverse("custom_user:register"),
+            {"email": "mixed.case@example.com", "password": "newpass-12345"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["email"], ["user with this email address already exists."])
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(email="MIXED.CASE@example.com", password="x")
+
+    def test_lookup_probes_the_functional_index(self):
+        queryset = User.objects.filter_email("mixed.case@example.com")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertIn("custom_user_email_ci_unique", queryset.explain())
+
+
+class CaseDuplicateReportTests(TransactionTestCase):
+    def test_migration_reports_existing_case_duplicates(self):
+        constraint = User._meta.constraints[0]
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(User, constraint)
+        try:
+            first = User.objects.create(email="dup@example.com")
+            second = User.objects.create(email="DUP@example.com")
+            User.objects.create(email="single@example.com")
+
+            with connection.schema_editor() as editor:
+                with self.assertRaisesMessage(RuntimeError, "1 email address(es)") as raised:
+                    migration.report_case_duplicates(apps, editor)
+            self.assertIn(
+                f"#{first.pk} dup@example.com, #{second.pk} DUP@example.com", str(raised.exception)
+            )
+        finally:
+            User.objects.all().delete()
+            with connection.schema_editor() as editor:
+                editor.add_constraint(User, constraint)
+
+
+class ConcurrentConstraintTests(TransactionTestCase):
+    def index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indisunique, indisvalid FROM pg_index"
+                " WHERE indexrelid = to_regclass('custom_user_email_ci_unique')"
+            )
+            return cursor.fetchone()
+
+    def test_rebuilds_over_a_failed_build_and_drops_backwards(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("CREATE INDEX CONCURRENTLY is PostgreSQL only")
+        loader = MigrationLoader(connection)
+        before = loader.project_state(("custom_user", "0001_initial"))
+        after = loader.project_state(("custom_user", "0002_email_case_insensitive_unique"))
+        operation = migration.Migration.operations[1]
+        constraint = User._meta.constraints[0]
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(User, constraint)
+        try:
+            # What a failed concurrent build leaves: an index under the constraint's name.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE INDEX custom_user_email_ci_unique ON {User._meta.db_table} (id)"
+                )
+            with connection.schema_editor(atomic=False) as editor:
+                operation.database_forwards("custom_user", editor, before, after)
+            self.assertEqual(self.index(), (True, True))
+
+            with connection.schema_editor(atomic=False) as editor:
+                operation.database_backwards("custom_user", editor, after, before)
+            self.assertIsNone(self.index())
+        finally:
+            with connection.schema_editor(atomic=False) as editor:
+                operation.database_forwards("custom_user", editor, before, after)
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.custom_user.cache import current_user_cache
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+class CurrentUserCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="cached@example.com", password="testpass123")
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("custom_user:current_user")
+        current_user_cache.reset_stats()
+
+    def test_second_request_is_a_cache_hit_with_identical_body(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertNotIn("Last-Modified", second)
+        self.assertEqual(current_user_cache.stats()["hits"], 1)
+        self.assertEqual(current_user_cache.stats()["misses"], 1)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_user_save_invalidates_the_cached_response(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.user.last_name = "Changed"
+        self.user.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["last_name"], "Changed")
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(current_user_cache.stats()["invalidations"], 1)
+
+    def test_etag_survives_a_refill(self):
+        etag = self.client.get(self.url)["ETag"]
+        # What another worker, or a refill after an unrelated invalidation, sees.
+        current_user_cache.invalidate(self.user.pk)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
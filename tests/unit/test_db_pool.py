@@ -0,0 +1,87 @@
+import threading
+import unittest
+from unittest import mock
+
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import TransactionTestCase
+from prometheus_client import CollectorRegistry
+
+from apps.core.db import close_pools, pool_stats
+from apps.core.metrics import Metrics
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "psycopg pools are PostgreSQL only")
+class ConnectionPoolTests(TransactionTestCase):
+    def setUp(self):
+        pooled = {
+            **connection.settings_dict,
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                **connection.settings_dict["OPTIONS"],
+                "pool": {"min_size": 1, "max_size": 2, "timeout": 5},
+            },
+        }
+        self.connections = ConnectionHandler(
+            {"default": connection.settings_dict, "pooled": pooled}
+        )
+        patcher = mock.patch("apps.core.db.connections", self.connections)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(close_pools)
+
+    def query_from_threads(self, threads: int):
+        barrier = threading.Barrier(threads)
+
+        def run():
+            db = self.connections["pooled"]
+            try:
+                with db.cursor() as cursor:
+                    barrier.wait(timeout=5)  # all threads want a connection at once
+                    cursor.execute("SELECT pg_sleep(0.05)")
+            finally:
+                db.close()  # hands the connection back to the pool
+
+        workers = [threading.Thread(target=run) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def test_threads_share_at_most_max_size_connections(self):
+        self.query_from_threads(2)
+        self.query_from_threads(2)
+
+        stats = pool_stats()["pooled"]
+        self.assertEqual(stats["requests_num"], 4)
+        self.assertLessEqual(stats["pool_size"], 2)
+        self.assertEqual(stats.get("requests_errors", 0), 0)
+        self.assertNotIn("default", pool_stats())
+
+    def test_pool_stats_are_synced_to_metrics(self):
+        self.query_from_threads(2)
+        registry = CollectorRegistry()
+        metrics = Metrics(registry)
+        metrics.sync(force=True)
+        metrics.sync(force=True)  # counters only take the difference
+
+        self.assertEqual(
+            registry.get_sample_value("db_pool_checkouts_total", {"alias": "pooled"}), 2
+        )
+        idle = registry.get_sample_value(
+            "db_pool_connections", {"alias": "pooled", "state": "idle"}
+        )
+        in_use = registry.get_sample_value(
+            "db_pool_connections", {"alias": "pooled", "state": "in_use"}
+        )
+        self.assertEqual((idle + in_use, in_use), (pool_stats()["pooled"]["pool_size"], 0))
+        self.assertEqual(
+            registry.get_sample_value("db_pool_requests_waiting", {"alias": "pooled"}), 0
+        )
+
+    def test_close_pools(self):
+        self.query_from_threads(1)
+        pool = self.connections["pooled"].pool
+        close_pools()
+        self.assertTrue(pool.closed)
+        self.assertEqual(pool_stats(), {})
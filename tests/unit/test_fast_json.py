@@ -0,0 +1,138 @@
+import io
+import uuid
+from datetime import UTC, date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core import renderers
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer, fast_dumps, ndjson_line
+
+User = get_user_model()
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+SAMPLES = {
+    "uuid": uuid.UUID("3e1c2e5e-4a3b-4c2e-9e1f-2e3d4c5b6a7f"),
+    "datetime": datetime(2024, 2, 29, 23, 59, 58, 123456, tzinfo=UTC),
+    "datetime_offset": datetime(2024, 2, 29, 23, 59, 58, 120000, tzinfo=IST),
+    "datetime_naive": datetime(2024, 2, 29, 12, 0),
+    "date": date(2024, 2, 29),
+    "time": time(1, 2, 3, 4567),
+    "timedelta": timedelta(days=1, seconds=3),
+    "decimal": [Decimal("1.10"), Decimal("-0.000001"), Decimal("12345678901234567890.5")],
+    "float": [0.1, 1e-05, 1.5e-07, 1e-10, 1e16, 123456789.125, -0.0],
+    "int": [0, -(2**63), 2**64, 2**70],
+    "text": 'é 😀 "quoted" \\ \x00\x1f \u2028\u2029 €',
+    "lazy": gettext_lazy("Hello"),
+    "containers": {"tuple": (1, 2), "set": {3}, "nested": [{"a": [None, True, False]}]},
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeDRF(self, data, *args):
+        self.assertEqual(FastJSONRenderer().render(data, *args), JSONRenderer().render(data, *args))
+
+    def test_same_bytes_as_json_renderer(self):
+        for name, value in SAMPLES.items():
+            with self.subTest(name):
+                self.assertRendersLikeDRF({name: value})
+        self.assertRendersLikeDRF(SAMPLES)
+        self.assertRendersLikeDRF(SAMPLES, "application/json; indent=4")
+        self.assertRendersLikeDRF(None)
+
+    def test_orjson_renders_what_it_matches(self):
+        if renderers.orjson is None:
+            self.skipTest("orjson isn't installed")
+        for name in ("uuid", "datetime", "date", "time", "decimal", "text", "lazy"):
+            self.assertIsNotNone(fast_dumps(SAMPLES[name]), name)
+        # Written differently by orjson (1e-7, 0.00001) or not at all (> 64 bits).
+        for value in (1e-05, 1.5e-07, 2**70):
+            self.assertIsNone(fast_dumps([value]), value)
+        # A UUID isn't mistaken for a float.
+        self.assertIsNotNone(fast_dumps(uuid.UUID("00000000-0000-4000-8000-5e0000000000")))
+
+    def test_not_a_number(self):
+        with self.assertRaises(ValueError):
+            FastJSONRenderer().render({"value": Decimal("NaN")})
+        # The one difference: orjson writes NaN floats as null.
+        if renderers.orjson is not None:
+            self.assertEqual(FastJSONRenderer().render([float("nan")]), b"[null]")
+
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertIsNone(fast_dumps(SAMPLES))
+            self.assertRendersLikeDRF(SAMPLES)
+
+    def test_ndjson_lines(self):
+        expected = JSONRenderer().render(SAMPLES) + b"\n"
+        self.assertEqual(ndjson_line(SAMPLES), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(ndjson_line(SAMPLES), expected)
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body, encoding="utf-8"):
+        try:
+            return parser.parse(io.BytesIO(body), parser_context={"encoding": encoding})
+        except ParseError as exc:
+            return type(exc)
+
+    def assertParsesLikeDRF(self, body, encoding="utf-8"):
+        fast, standard = (
+            self.parse(FastJSONParser(), body, encoding),
+            self.parse(JSONParser(), body, encoding),
+        )
+        self.assertEqual(fast, standard)
+        self.assertEqual(repr(fast), repr(standard))  # 1 and 1.0 compare equal
+        return fast
+
+    def test_same_data_or_error_as_json_parser(self):
+        bodies = [
+            b'{"email": "a@example.com", "n": [1, 2.5, -0.0, 1e-7, true, null]}',
+            '{"name": "é 😀 \\u00e9 \\ud83d\\ude00"}'.encode(),
+            b'{"big": 123456789012345678901234567890, "neg": -9223372036854775809}',
+            b'{"a": 1, "a": 2}',
+            b"  [1]  ",
+            b'"text"',
+            b'{"huge": 1e400}',
+            b'{"lone": "\\ud800"}',
+            b"{'single': 1}",
+            b'{"nan": NaN}',
+            b'{"trailing": 1,}',
+            b"\xef\xbb\xbf{}",
+            b'{"bad": "\xff"}',
+            b"",
+        ]
+        for body in bodies:
+            with self.subTest(body):
+                self.assertParsesLikeDRF(body)
+
+    def test_big_integers_stay_integers(self):
+        data = self.assertParsesLikeDRF(b"[18446744073709551616, -9223372036854775809]")
+        self.assertEqual(data, [2**64, -(2**63) - 1])
+
+    def test_other_encodings_use_json_parser(self):
+        body = '{"name": "é"}'.encode("latin-1")
+        self.assertEqual(self.assertParsesLikeDRF(body, "latin-1"), {"name": "é"})
+
+
+class DefaultRendererTests(TestCase):
+    def test_api_responses_are_unchanged(self):
+        response = self.client.post(
+            reverse("custom_user:register"),
+            {"email": "json@example.com", "password": "Str0ng-pass-123", "first_name": "Zoë"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertEqual(User.objects.get().first_name, "Zoë")
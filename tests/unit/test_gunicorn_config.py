@@ -0,0 +1,35 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from config import gunicorn
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def cpus_with_quota(self, content: str, affinity: int = 8) -> int:
+        with tempfile.TemporaryDirectory() as directory:
+            cpu_max = Path(directory) / "cpu.max"
+            cpu_max.write_text(content)
+            with mock.patch.object(gunicorn.os, "sched_getaffinity", return_value=range(affinity)):
+                return gunicorn.available_cpus(cpu_max)
+
+    def test_available_cpus_honours_cgroup_quota(self):
+        self.assertEqual(self.cpus_with_quota("max 100000\n"), 8)
+        self.assertEqual(self.cpus_with_quota("150000 100000\n"), 2)
+        self.assertEqual(self.cpus_with_quota("20000 100000\n"), 1)
+        self.assertEqual(self.cpus_with_quota("400000 100000\n", affinity=2), 2)
+
+    def test_default_workers_per_interface(self):
+        self.assertEqual(gunicorn.default_workers("wsgi", 4), 9)
+        self.assertEqual(gunicorn.default_workers("asgi", 4), 4)
+
+    def test_production_settings(self):
+        self.assertTrue(gunicorn.preload_app)
+        self.assertEqual(gunicorn.wsgi_app, "config.wsgi:application")
+        self.assertGreater(gunicorn.max_requests, 0)
+        self.assertGreater(gunicorn.max_requests_jitter, 0)
+
+    def test_metrics_dir_is_exported_to_the_app(self):
+        self.assertIn(f"PROMETHEUS_MULTIPROC_DIR={gunicorn.metrics_dir}", gunicorn.raw_env)
@@ -0,0 +1,171 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.health import Check, Readiness, check_cache, check_migrations, readiness
+
+
+def failing():
+    raise ConnectionError("refused")
+
+
+class HealthEndpointTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        readiness.clear()
+        self.addCleanup(readiness.clear)
+
+    def test_healthz_checks_nothing(self):
+        with mock.patch("apps.core.health.default_checks") as default_checks:
+            response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+        default_checks.assert_not_called()
+
+    def test_readyz_reports_every_dependency(self):
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        body = response.json()
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(
+            set(body["checks"]),
+            {"database:default", "database:replica", "cache:shared", "migrations"},
+        )
+
+    def test_readyz_is_cached(self):
+        with mock.patch("apps.core.health.default_checks", return_value=[]) as default_checks:
+            for _ in range(3):
+                self.client.get("/readyz")
+            self.assertEqual(default_checks.call_count, 1)
+
+            with override_settings(HEALTH_CHECK_CACHE_SECONDS=0):
+                self.client.get("/readyz")
+            self.assertEqual(default_checks.call_count, 2)
+
+    def test_failed_check_is_503_without_details(self):
+        checks = [Check("database:default", failing, 1.0)]
+        with mock.patch("apps.core.health.default_checks", return_value=checks):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["checks"]["database:default"], {"ok": False, "duration_ms": mock.ANY}
+        )
+
+    def test_failing_replica_is_reported_but_not_required(self):
+        def check_database(alias):
+            if alias == "replica":
+                failing()
+
+        with (
+            override_settings(DATABASE_REPLICAS=["replica"]),
+            mock.patch("apps.core.health.check_database", side_effect=check_database),
+        ):
+            response = self.client.get("/readyz")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()["checks"]["database:replica"],
+                {"ok": False, "duration_ms": mock.ANY, "required": False},
+            )
+
+            readiness.clear()
+            with override_settings(HEALTH_CHECK_REPLICAS_REQUIRED=True):
+                response = self.client.get("/readyz")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(
+                response.json()["checks"]["database:replica"],
+                {"ok": False, "duration_ms": mock.ANY},
+            )
+
+    def test_cache_probes_use_their_own_key_and_clean_up(self):
+        backend = caches["shared"]
+        with mock.patch.object(backend, "set", wraps=backend.set) as set_:
+            check_cache("shared")
+            check_cache("shared")
+        (first, *_), (second, *_) = (call.args for call in set_.call_args_list)
+        self.assertNotEqual(first, second)
+        self.assertIsNone(backend.get(first))
+        self.assertIsNone(backend.get(second))
+
+    def test_unapplied_migrations_fail(self):
+        check_migrations()
+        (latest,) = MigrationLoader(connection).graph.leaf_nodes("custom_user")
+        MigrationRecorder(connection).record_unapplied(*latest)
+        with self.assertRaisesMessage(RuntimeError, "unapplied migration"):
+            check_migrations()
+
+
+class ReadinessTests(SimpleTestCase):
+    def test_checks_run_concurrently_each_under_its_own_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        probe = Readiness()
+        checks = [
+            Check("slow", lambda: release.wait(5), 0.2),
+            Check("also_slow", lambda: time.sleep(0.15), 0.5),
+            Check("fast", lambda: None, 0.5),
+        ]
+
+        started = time.monotonic()
+        report = probe.run(checks)
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual(report.failures, ["slow"])
+        self.assertIn("timed out", report.results["slow"].error)
+        self.assertTrue(report.results["also_slow"].ok)
+
+        # A check still stuck from last time is waited on, not started again.
+        again = probe.run(checks[:1])
+        self.assertEqual(again.failures, ["slow"])
+        self.assertEqual(probe._executor._work_queue.qsize(), 0)
+        release.set()
+        time.sleep(0.05)
+        self.assertTrue(probe.run(checks[:1]).ok)
+
+
+class CheckReadyCommandTests(TestCase):
+    databases = {"default", "replica"}
+
+    def test_ready(self):
+        out = StringIO()
+        call_command("check_ready", stdout=out)
+        self.assertIn("Ready after 1 attempt(s).", out.getvalue())
+
+    def test_waits_with_backoff_then_gives_up(self):
+        checks = [Check("cache:shared", failing, 1.0)]
+        err = StringIO()
+        with (
+            mock.patch(
+                "apps.core.management.commands.check_ready.default_checks", return_value=checks
+            ),
+            self.assertRaisesMessage(CommandError, "cache:shared (ConnectionError: refused)"),
+        ):
+            call_command("check_ready", "--wait", "0.5", "--max-delay", "0.1", stderr=err)
+        self.assertIn("retrying in", err.getvalue())
+
+    def test_does_not_wait_for_checks_that_are_not_required(self):
+        checks = [Check("database:replica_1", failing, 1.0, required=False)]
+        out, err = StringIO(), StringIO()
+        with mock.patch(
+            "apps.core.management.commands.check_ready.default_checks", return_value=checks
+        ):
+            call_command("check_ready", "--wait", "5", stdout=out, stderr=err)
+        self.assertIn("Ready after 1 attempt(s).", out.getvalue())
+        self.assertIn(
+            "database:replica_1: failed, not required (ConnectionError: refused)", err.getvalue()
+        )
+
+    def test_skip(self):
+        with mock.patch(
+            "apps.core.management.commands.check_ready.default_checks", return_value=[]
+        ) as default_checks:
+            call_command("check_ready", "--skip", "migrations", stdout=StringIO())
+        default_checks.assert_called_once_with(skip=("migrations",))
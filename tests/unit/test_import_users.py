@@ -0,0 +1,107 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.custom_user.importing import UserImporter
+
+User = get_user_model()
+
+CSV = """email,password,first_name,last_name
+alice@EXAMPLE.com,pass-alice-123,Alice,A
+bob@example.com,pass-bob-12345,Bob,B
+ALICE@example.com,other-password,Dup,Licate
+not-an-email,whatever-123,Bad,Row
+taken@example.com,pass-taken-123,Taken,T
+carol@example.com,,Carol,C
+"""
+
+
+class ImportUsersCommandTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="Taken@example.com", password="existing-123")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def write(self, name, content):
+        path = self.tmp / name
+        path.write_text(content)
+        return path
+
+    def run_import(self, path, *args):
+        out = StringIO()
+        call_command("import_users", str(path), "--hash-workers", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_csv_and_reports_rejections(self):
+        path = self.write("users.csv", CSV)
+        rejects = self.tmp / "rejects.jsonl"
+
+        output = self.run_import(path, "--batch-size", "4", "--rejects", str(rejects))
+
+        alice = User.objects.get(email="alice@example.com")
+        self.assertTrue(alice.check_password("pass-alice-123"))
+        self.assertEqual(alice.first_name, "Alice")
+        self.assertFalse(User.objects.get(email="carol@example.com").has_usable_password())
+        self.assertEqual(User.objects.count(), 4)
+
+        reasons = {r["row"]: r["reason"] for r in map(json.loads, rejects.read_text().splitlines())}
+        self.assertEqual(
+            reasons,
+            {3: "duplicate email in input", 4: "invalid email", 5: "email already exists"},
+        )
+        self.assertIn("batch 2: rows 5-6", output)
+        self.assertIn("Imported 3 users, rejected 3 rows", output)
+        self.assertFalse((self.tmp / "users.csv.checkpoint").exists())
+
+    def test_resume_skips_rows_recorded_in_the_checkpoint(self):
+        path = self.write(
+            "users.jsonl",
+            "\n".join(
+                json.dumps({"email": f"user{i}@example.com", "password": "pw-123456789"})
+                for i in range(5)
+            ),
+        )
+        self.write("users.jsonl.checkpoint", json.dumps({"rows": 3, "created": 3, "rejected": 0}))
+
+        output = self.run_import(path, "--resume")
+
+        self.assertEqual(
+            sorted(User.objects.filter(email__startswith="user").values_list("email", flat=True)),
+            ["user3@example.com", "user4@example.com"],
+        )
+        self.assertIn("Imported 5 users", output)
+
+    def test_hashes_in_a_process_pool(self):
+        path = self.write("users.csv", "email,password\np1@example.com,pw-1\np2@example.com,pw-2\n")
+
+        call_command("import_users", str(path), "--hash-workers", "2", stdout=StringIO())
+
+        self.assertTrue(User.objects.get(email="p2@example.com").check_password("pw-2"))
+
+    def test_rejects_a_password_that_isnt_a_string(self):
+        path = self.write(
+            "users.jsonl",
+            '{"email": "num@example.com", "password": 12345678}\n'
+            '{"email": "str@example.com", "password": "pw-123456789"}\n',
+        )
+        rejects = self.tmp / "rejects.jsonl"
+
+        output = self.run_import(path, "--rejects", str(rejects))
+
+        self.assertIn("Imported 1 users, rejected 1 rows", output)
+        self.assertEqual(json.loads(rejects.read_text())["reason"], "password must be a string")
+
+    def test_rows_taken_since_the_check_are_not_counted_as_created(self):
+        importer = UserImporter(hash_workers=0, use_copy=False)
+        users = [
+            User.objects.build_user(email) for email in ("TAKEN@example.com", "new@example.com")
+        ]
+
+        self.assertEqual(importer.write(users), 1)
+        self.assertEqual(User.objects.count(), 2)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.custom_user.authentication import user_from_claims, user_state_cache
+from apps.custom_user.tokens import ClaimsRefreshToken, user_claims
+
+User = get_user_model()
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_state_cache.clear()
+        self.user = User.objects.create_user(
+            email="claims@example.com",
+            password="testpass123",
+            first_name="Claims",
+            last_name="User",
+        )
+        self.me_url = reverse("custom_user:current_user")
+
+    def authenticate(self, user=None):
+        token = ClaimsRefreshToken.for_user(user or self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_current_user_served_without_queries_once_state_is_cached(self):
+        self.authenticate()
+        self.client.get(self.me_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "claims@example.com")
+        self.assertEqual(response.data["first_name"], "Claims")
+        self.assertEqual(response.data["id"], self.user.pk)
+
+    def test_inactive_user_is_rejected(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        self.authenticate()
+        self.user.set_password("another-pass-456")
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stale_claims_fall_back_to_the_database(self):
+        self.authenticate()
+        self.user.first_name = "Renamed"
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "Renamed")
+
+    def test_fields_outside_claims_load_in_one_query(self):
+        user = user_from_claims(str(self.user.pk), user_claims(self.user), is_active=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.email, "claims@example.com")
+        with self.assertNumQueries(1):
+            self.assertTrue(user.password)
+            self.assertIsNone(user.last_login)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from apps.core.pagination import KeysetPagination
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+class UserListPaginationTests(APITestCase):
+    def setUp(self):
+        joined = timezone.now() - timedelta(days=30)
+        self.staff = User.objects.create_user(
+            email="staff@example.com", password="x", is_staff=True, date_joined=joined
+        )
+        # Pairs of users share a date_joined, so the id tie-breaker matters.
+        User.objects.bulk_create(
+            User(email=f"user{n}@example.com", date_joined=joined + timedelta(hours=n // 2))
+            for n in range(11)
+        )
+        self.expected = list(
+            User.objects.order_by("date_joined", "id").values_list("id", flat=True)
+        )
+        token = ClaimsRefreshToken.for_user(self.staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("custom_user:user_list")
+
+    def walk(self, url, link):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(user["id"] for user in response.data["results"])
+            last = response
+            url = response.data[link]
+        return ids, last
+
+    def test_forward_and_backward_walks_cover_every_user_once(self):
+        ids, last_page = self.walk(f"{self.url}?page_size=5", "next")
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(len(last_page.data["results"]), 2)
+
+        back, first_page = self.walk(last_page.data["previous"], "previous")
+        self.assertEqual(back, [*self.expected[5:10], *self.expected[:5]])
+        self.assertIsNone(first_page.data["previous"])
+
+    def test_pages_use_no_count_or_offset(self):
+        first = self.client.get(self.url, {"page_size": 3})
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(first.data["next"])
+        sql = " ".join(q["sql"] for q in ctx.captured_queries).upper()
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_invalid_cursor_and_permissions(self):
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+        user = User.objects.get(email="user0@example.com")
+        token = ClaimsRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ordering_must_end_in_a_unique_field(self):
+        class ByDate(KeysetPagination):
+            ordering = ("date_joined",)
+
+        request = APIRequestFactory().get("/")
+        with self.assertRaises(ImproperlyConfigured):
+            ByDate().get_ordering(request, User.objects.all(), None)
@@ -0,0 +1,138 @@
+import io
+import json
+import logging
+import re
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+from apps.core.logs import BatchingStreamHandler, RequestContextFilter
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+def json_handler(**options):
+    stream = io.StringIO()
+    handler = BatchingStreamHandler(stream, **options)
+    handler.setFormatter(JsonFormatter("%(levelname)s %(name)s %(message)s"))
+    handler.addFilter(RequestContextFilter())
+    return handler, stream
+
+
+def attach(test, handler, name):
+    """Route ``name`` to ``handler`` alone for the duration of ``test``."""
+    logger = logging.getLogger(name)
+    test.addCleanup(handler.close)
+    test.addCleanup(logger.removeHandler, handler)
+    for attr in ("level", "propagate", "disabled"):
+        test.addCleanup(setattr, logger, attr, getattr(logger, attr))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.disabled = False  # the test settings' LOGGING disables existing loggers
+    return logger
+
+
+class BatchingStreamHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.handler, self.stream = json_handler(batch_size=50, flush_interval=0.05)
+        self.logger = attach(self, self.handler, "tests.batching")
+
+    def lines(self):
+        self.handler.flush()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_records_are_written_in_order_off_thread(self):
+        writes = []
+        write = self.stream.write
+        self.stream.write = lambda text: (
+            writes.append(threading.current_thread().name) or write(text)
+        )
+        for n in range(120):
+            self.logger.info("record %d", n)
+
+        lines = self.lines()
+        self.assertEqual([line["message"] for line in lines], [f"record {n}" for n in range(120)])
+        self.assertEqual(set(writes), {"log-writer"})
+        self.assertLess(len(writes), 120)
+        self.assertEqual(self.handler.stats()["written"], 120)
+
+    def test_arguments_and_exceptions_are_captured_when_logged(self):
+        payload = {"state": "before"}
+        self.logger.info("payload %s", payload)
+        payload["state"] = "after"
+        try:
+            raise ZeroDivisionError("boom")
+        except ZeroDivisionError:
+            self.logger.exception("failed")
+
+        first, second = self.lines()
+        self.assertEqual(first["message"], "payload {'state': 'before'}")
+        self.assertIn("ZeroDivisionError", second["exc_info"])
+
+    def test_full_queue_drops_and_reports(self):
+        handler, stream = json_handler(queue_size=5, batch_size=1)
+        logger = attach(self, handler, "tests.batching.small")
+        release = threading.Event()
+        handler.format = lambda record, format=handler.format: release.wait(5) and format(record)
+
+        for n in range(50):
+            logger.info("record %d", n)
+        dropped = handler.stats()["dropped"]
+        release.set()
+        handler.flush()
+        handler.close()
+
+        self.assertGreaterEqual(dropped, 40)
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        reports = [m for m in messages if m.startswith("Log queue full")]
+        self.assertEqual(sum(int(re.search(r"\d+", m)[0]) for m in reports), dropped)
+        self.assertEqual(len(messages) - len(reports), 50 - dropped)
+
+
+class RequestContextTests(TestCase):
+    def setUp(self):
+        self.handler, self.stream = json_handler(flush_interval=0.01)
+        attach(self, self.handler, "apps.core.sql")
+        self.user = User.objects.create_user(email="ctx@example.com")
+
+    def records(self):
+        self.handler.flush()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_request_log_carries_request_context(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        response = self.client.get(
+            reverse("custom_user:current_user"),
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+            HTTP_X_REQUEST_ID="req-123",
+        )
+        self.assertEqual(response["X-Request-ID"], "req-123")
+
+        (record,) = self.records()
+        self.assertEqual(record["request_id"], "req-123")
+        self.assertEqual(record["user_id"], self.user.pk)
+        self.assertEqual(record["view_name"], "custom_user:current_user")
+        self.assertGreater(record["duration_ms"], 0)
+
+    def test_django_request_errors_carry_the_request_id(self):
+        handler, stream = json_handler()
+        attach(self, handler, "django.request")
+        response = self.client.get(reverse("custom_user:current_user"))
+        handler.close()
+        (record,) = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(record["status_code"], 401)
+        self.assertEqual(record["request_id"], response["X-Request-ID"])
+
+    def test_malformed_request_ids_are_replaced(self):
+        response = self.client.get(
+            reverse("custom_user:current_user"), HTTP_X_REQUEST_ID="bad id\n"
+        )
+        self.assertRegex(response["X-Request-ID"], r"^[0-9a-f]{32}$")
+        (record,) = self.records()
+        self.assertEqual(record["request_id"], response["X-Request-ID"])
+        self.assertIsNone(record["user_id"])
@@ -0,0 +1,183 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY, CollectorRegistry
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from apps.core.metrics import archive_worker, get_metrics
+
+User = get_user_model()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsCollectionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="metrics@example.com", password="pw")
+
+    def test_requests_are_counted_timed_and_exposed(self):
+        view = "custom_user:current_user"
+        before = sample("http_requests_total", view=view, method="GET", status="401")
+        latency_before = sample("http_request_duration_seconds_count", view=view, method="GET")
+        missing_before = sample(
+            "http_requests_total", view="<unresolved>", method="GET", status="404"
+        )
+
+        self.client.get(reverse("custom_user:current_user"))
+        self.client.get("/no-such-page/")
+
+        self.assertEqual(
+            sample("http_requests_total", view=view, method="GET", status="401"), before + 1
+        )
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", view=view, method="GET"),
+            latency_before + 1,
+        )
+        self.assertEqual(
+            sample("http_requests_total", view="<unresolved>", method="GET", status="404"),
+            missing_before + 1,
+        )
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'http_requests_total{method="GET",status="401",view="custom_user:current_user"}', body
+        )
+        self.assertIn("http_request_db_seconds_bucket", body)
+
+    def test_auth_outcomes(self):
+        url = reverse("custom_user:token_obtain_pair")
+        success = sample("auth_events_total", event="login", outcome="success")
+        failure = sample("auth_events_total", event="login", outcome="failure")
+        refreshed = sample("auth_events_total", event="token_refresh", outcome="success")
+
+        tokens = self.client.post(url, {"email": "metrics@example.com", "password": "pw"}).json()
+        self.client.post(url, {"email": "metrics@example.com", "password": "wrong"})
+        self.client.post(reverse("custom_user:token_refresh"), {"refresh": tokens["refresh"]})
+
+        self.assertEqual(sample("auth_events_total", event="login", outcome="success"), success + 1)
+        self.assertEqual(sample("auth_events_total", event="login", outcome="failure"), failure + 1)
+        self.assertEqual(
+            sample("auth_events_total", event="token_refresh", outcome="success"), refreshed + 1
+        )
+
+    def test_tiered_cache_reads_are_synced(self):
+        cache = caches["default"]
+        location = settings.CACHES["default"].get("LOCATION") or "default"
+        labels = {"cache": location, "namespace": "metrics-test"}
+        hits = sample("cache_requests_total", result="l1_hit", **labels)
+        misses = sample("cache_requests_total", result="miss", **labels)
+
+        cache.get("metrics-test:a")
+        cache.set("metrics-test:a", 1)
+        cache.get("metrics-test:a")
+        get_metrics().sync(force=True)
+
+        self.assertEqual(sample("cache_requests_total", result="l1_hit", **labels), hits + 1)
+        self.assertEqual(sample("cache_requests_total", result="miss", **labels), misses + 1)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_protects_the_endpoint(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+
+WORKER = """
+from types import SimpleNamespace
+from prometheus_client import CollectorRegistry
+from apps.core.metrics import Metrics
+
+metrics = Metrics(CollectorRegistry())
+request = SimpleNamespace(resolver_match=None, method="GET", auth_metric="login")
+for _ in range({requests}):
+    metrics.observe_request(request, SimpleNamespace(status_code=200), 0.02)
+print(__import__("os").getpid())
+"""
+
+
+class MultiprocessAggregationTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def run_worker(self, requests: int) -> int:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": self.path}
+        result = subprocess.run(
+            [sys.executable, "-c", WORKER.format(requests=requests)],
+            cwd=Path(settings.BASE_DIR),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return int(result.stdout)
+
+    def collected(self, name, **labels):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=self.path)
+        return registry.get_sample_value(name, labels)
+
+    def test_workers_are_summed_and_survive_archiving(self):
+        first = self.run_worker(3)
+        self.run_worker(2)
+        labels = {"view": "<unresolved>", "method": "GET"}
+
+        self.assertEqual(self.collected("http_requests_total", status="200", **labels), 5)
+        self.assertEqual(self.collected("http_request_duration_seconds_count", **labels), 5)
+        self.assertEqual(self.collected("auth_events_total", event="login", outcome="success"), 5)
+
+        archive_worker(first, self.path)
+        archive_worker(first, self.path)  # idempotent
+        self.assertFalse(Path(self.path, f"counter_{first}.db").exists())
+        self.assertEqual(self.collected("http_requests_total", status="200", **labels), 5)
+        self.assertEqual(
+            self.collected("http_request_duration_seconds_bucket", le="0.025", **labels), 5
+        )
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    def setup_prod(self, **env):
+        return subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import django; django.setup(); from django.conf import settings; "
+                "print(settings.METRICS_ENABLED, "
+                "'apps.core.middleware.MetricsMiddleware' in settings.MIDDLEWARE)",
+            ],
+            env={
+                **os.environ,
+                "ENV": "prod",
+                "DJANGO_SETTINGS_MODULE": "config.settings.prod",
+                "SECRET_KEY": "x" * 50,
+                "METRICS_ENABLED": "1",
+                **env,
+            },
+            capture_output=True,
+            text=True,
+        )
+
+    def test_metrics_are_off_in_production_without_a_token(self):
+        for env, served in [
+            ({"METRICS_TOKEN": ""}, "False False"),
+            ({"METRICS_TOKEN": "scrape-token"}, "True True"),
+            ({"METRICS_ENABLED": "0", "METRICS_TOKEN": "scrape-token"}, "False False"),
+        ]:
+            with self.subTest(env):
+                completed = self.setup_prod(**env)
+                self.assertEqual(completed.returncode, 0, completed.stderr)
+                self.assertEqual(completed.stdout.strip(), served)
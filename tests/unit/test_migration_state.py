@@ -0,0 +1,86 @@
+import unittest
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.migration_state import (
+    MIGRATION_LOCK_ID,
+    forget_fingerprint,
+    migration_files_fingerprint,
+    migration_lock,
+    store_fingerprint,
+    stored_fingerprint,
+)
+from apps.core.models import MigrationFingerprint
+
+MIGRATE = "apps.core.management.commands.migrate_if_changed.call_command"
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_follows_the_migration_modules(self):
+        fingerprint = migration_files_fingerprint()
+        self.assertEqual(migration_files_fingerprint(), fingerprint)
+        with override_settings(MIGRATION_MODULES={"custom_user": None}):
+            self.assertNotEqual(migration_files_fingerprint(), fingerprint)
+
+
+class MigrateIfChangedTests(TestCase):
+    def migrate_if_changed(self, *args):
+        out = StringIO()
+        call_command("migrate_if_changed", *args, stdout=out)
+        return out.getvalue()
+
+    def test_migrates_once_then_skips(self):
+        self.assertIsNone(stored_fingerprint())
+        with mock.patch(MIGRATE) as migrate:
+            self.assertIn("Migrated to", self.migrate_if_changed())
+            migrate.assert_called_once_with(
+                "migrate", database="default", interactive=False, verbosity=1
+            )
+        self.assertEqual(stored_fingerprint(), migration_files_fingerprint())
+
+        with mock.patch(MIGRATE) as migrate, self.assertNumQueries(1):
+            self.assertIn("up to date", self.migrate_if_changed())
+        migrate.assert_not_called()
+
+        with mock.patch(MIGRATE) as migrate:
+            self.migrate_if_changed("--force")
+        migrate.assert_called_once()
+
+    def test_check(self):
+        store_fingerprint("stale")
+        with mock.patch(MIGRATE) as migrate, self.assertRaisesMessage(CommandError, "changed"):
+            self.migrate_if_changed("--check")
+        migrate.assert_not_called()
+
+        store_fingerprint(migration_files_fingerprint())
+        self.assertIn("up to date", self.migrate_if_changed("--check"))
+
+    def test_a_migrate_that_changes_the_schema_drops_the_fingerprint(self):
+        store_fingerprint("current")
+        forget_fingerprint(sender=None, using="default", plan=[])
+        self.assertEqual(stored_fingerprint(), "current")
+        forget_fingerprint(sender=None, using="default", plan=[(mock.Mock(), False)])
+        self.assertFalse(MigrationFingerprint.objects.exists())
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "advisory locks are PostgreSQL only")
+class MigrationLockTests(TestCase):
+    def test_excludes_other_sessions(self):
+        other = connection.copy()
+        self.addCleanup(other.close)
+
+        def other_gets_lock():
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+                acquired = cursor.fetchone()[0]
+                if acquired:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+                return acquired
+
+        with migration_lock():
+            self.assertFalse(other_gets_lock())
+        self.assertTrue(other_gets_lock())
@@ -0,0 +1,78 @@
+import gzip
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.test import APIRequestFactory
+
+from apps.core import openapi
+from apps.core.openapi import SchemaCache, load_bundle, openapi_schema
+
+
+class CachedSchemaViewTests(TestCase):
+    def setUp(self):
+        openapi_schema.clear()
+        self.addCleanup(openapi_schema.clear)
+        self.url = reverse("schema")
+
+    def stock_response(self, **extra):
+        request = APIRequestFactory().get(self.url, **extra)
+        response = SpectacularAPIView.as_view()(request)
+        return response.render()
+
+    def test_bytes_and_content_type_match_spectacular(self):
+        for extra in ({}, {"HTTP_ACCEPT": "application/json"}):
+            with self.subTest(**extra):
+                expected = self.stock_response(**extra)
+                response = self.client.get(self.url, **extra)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response["Content-Type"], expected["Content-Type"])
+                self.assertEqual(response["Content-Disposition"], expected["Content-Disposition"])
+
+    def test_generated_once_and_revalidated_with_etag(self):
+        with mock.patch.object(
+            openapi, "generate_schema_bundle", wraps=openapi.generate_schema_bundle
+        ) as generate:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        generate.assert_called_once()
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(first["Cache-Control"], "public, max-age=0, must-revalidate")
+
+    def test_gzip_and_fingerprinted_url(self):
+        plain = self.client.get(self.url)
+        fingerprint = openapi_schema.get().fingerprint
+        response = self.client.get(
+            self.url, {"v": fingerprint}, HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response["ETag"], plain["ETag"])
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+
+class BuildOpenAPISchemaCommandTests(TestCase):
+    def test_workers_reuse_the_prebuilt_bundle(self):
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("build_openapi_schema", output_dir=directory, stdout=StringIO())
+            call_command(
+                "build_openapi_schema", output_dir=directory, check=True, stdout=StringIO()
+            )
+
+            cache = SchemaCache(directory)
+            bundle = cache.get()
+            self.assertEqual(cache.generations, 0)
+            self.assertEqual(bundle.variants["yaml"].body[:8], b"openapi:")
+
+            # Any change to the sources the schema is built from invalidates it.
+            self.assertIsNone(load_bundle(directory, "0" * 32))
+            with mock.patch.object(openapi, "schema_fingerprint", return_value="0" * 32):
+                stale = SchemaCache(directory)
+                stale.get()
+            self.assertEqual(stale.generations, 1)
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.routing import ReplicaRouter, primary_pins, replica_reads
+from apps.custom_user.authentication import user_state_cache
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    DATABASE_ROUTERS=["apps.core.routing.ReplicaRouter"],
+    DATABASE_REPLICA_STICKINESS=60,
+)
+class ReplicaRoutingTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="reader@example.com", first_name="Primary")
+        # The "replica" lags: the same row with an older first name. bulk_create
+        # sends no signals, so nothing is pinned by the copy itself.
+        User.objects.using("replica").bulk_create(
+            [
+                User(
+                    pk=self.user.pk,
+                    email=self.user.email,
+                    password=self.user.password,
+                    first_name="Replica",
+                    date_joined=self.user.date_joined,
+                )
+            ]
+        )
+        self.forget_pins()
+
+    def forget_pins(self):
+        """What the stickiness window running out looks like to every worker."""
+        primary_pins.clear()
+        user_state_cache.clear()
+        cache.clear()
+
+    def me(self, user=None, token=None):
+        token = token or ClaimsRefreshToken.for_user(user or self.user).access_token
+        return self.client.get(
+            reverse("custom_user:current_user"),
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+            HTTP_ACCEPT="application/json",
+        )
+
+    def test_current_user_reads_from_the_replica(self):
+        response = self.me()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["first_name"], "Replica")
+
+    def test_a_user_reads_their_own_writes(self):
+        self.user.first_name = "Updated"
+        self.user.save()
+        self.assertEqual(User.objects.using("replica").get().first_name, "Replica")
+
+        self.assertEqual(self.me().json()["first_name"], "Updated")
+        self.forget_pins()
+        self.assertEqual(self.me().json()["first_name"], "Replica")
+
+    def test_a_new_user_authenticates_before_the_replica_has_them(self):
+        response = self.client.post(
+            reverse("custom_user:register"),
+            {"email": "new@example.com", "password": "Str0ng-pass-123"},
+        )
+        self.assertEqual(response.status_code, 201)
+        access = response.json()["access"]
+        self.assertFalse(User.objects.using("replica").filter(email="new@example.com").exists())
+
+        self.assertEqual(self.me(token=access).status_code, 200)
+        self.forget_pins()
+        # The JWT user lookup reads the replica, which has no such user yet.
+        self.assertEqual(self.me(token=access).status_code, 401)
+
+    def test_admin_lists_read_from_the_replica_until_the_admin_writes(self):
+        admin = User.objects.create_superuser(email="admin@example.com", password="pw")
+        User.objects.using("replica").bulk_create(
+            [
+                User(pk=admin.pk, email=admin.email, is_staff=True, is_superuser=True),
+                User(email="replica-only@example.com"),
+            ]
+        )
+        self.client.force_login(admin)
+        self.forget_pins()
+        changelist = reverse("admin:custom_user_customuser_changelist")
+
+        self.assertContains(self.client.get(changelist), "replica-only@example.com")
+
+        response = self.client.post(
+            changelist,
+            {"action": "delete_selected", "_selected_action": [self.user.pk], "post": "yes"},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertTrue(User.objects.using("replica").filter(pk=self.user.pk).exists())
+
+        response = self.client.get(changelist)
+        self.assertNotContains(response, "replica-only@example.com")
+        self.assertNotContains(response, "reader@example.com")
+
+    def test_writes_always_go_to_the_primary(self):
+        router = ReplicaRouter()
+        with replica_reads(self.user.pk) as alias:
+            self.assertEqual(alias, "replica")
+            self.assertEqual(User.objects.get().first_name, "Replica")
+            self.assertEqual(router.db_for_write(User), "default")
+        self.assertEqual(User.objects.get().first_name, "Primary")
+        self.assertIsNone(router.db_for_read(User))
+
+
+class WithoutReplicasTests(TestCase):
+    def test_reads_stay_on_default(self):
+        user = User.objects.create_user(email="solo@example.com")
+        with replica_reads(user.pk) as alias:
+            self.assertEqual(alias, "default")
+        self.assertFalse(primary_pins.is_pinned(user.pk))
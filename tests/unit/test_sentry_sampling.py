@@ -0,0 +1,158 @@
+import io
+import time
+from unittest import mock
+
+import sentry_sdk
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path, resolve
+from sentry_sdk.transport import Transport
+
+from config.settings import sentry
+from config.settings.sentry import TracesSampler, init_sentry
+
+
+def fast(request):
+    return HttpResponse("ok")
+
+
+def slow(request):
+    time.sleep(0.06)
+    return HttpResponse("ok")
+
+
+def broken(request):
+    return HttpResponse("down", status=502)
+
+
+urlpatterns = [
+    path("fast/", fast, name="fast"),
+    path("slow/", slow, name="slow"),
+    path("broken/", broken, name="broken"),
+    path("register/", fast, name="register"),
+    path("healthz", fast, name="healthz"),
+]
+
+
+class StubTransport(Transport):
+    """Keeps envelopes in memory; nothing leaves the machine."""
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.envelopes = []
+
+    def capture_envelope(self, envelope):
+        self.envelopes.append(envelope)
+
+    def transactions(self):
+        events = (envelope.get_transaction_event() for envelope in self.envelopes)
+        return [event["tags"].get("url_name") for event in events if event is not None]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TracesSamplerTests(SimpleTestCase):
+    def init(self, **options):
+        self.transport = StubTransport()
+        init_sentry(
+            dsn="https://key@sentry.invalid/1",
+            environment="test",
+            transport=self.transport,
+            **options,
+        )
+        self.addCleanup(sentry_sdk.init)  # no DSN: back to a client that sends nothing
+
+    def get(self, url, **headers):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            **headers,
+        }
+        # Like the test client: leave the test's database connections alone.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            response = WSGIHandler()(environ, lambda status, headers, exc_info=None: None)
+            b"".join(response)
+            response.close()
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        sentry_sdk.flush()
+
+    def test_rates_by_url_name(self):
+        sampler = TracesSampler({"custom_user:register": 1.0, "schema": 0.0}, default_rate=0.1)
+        self.assertEqual(sampler.rate("custom_user:register"), 1.0)
+        self.assertEqual(sampler.rate("schema"), 0.0)
+        self.assertEqual(sampler.rate("docs:schema"), 0.0)
+        self.assertEqual(sampler.rate("register"), 0.1)
+        self.assertEqual(sampler.rate(None), 0.1)
+
+    def test_head_sampling_per_view(self):
+        self.init(traces_sample_rates={"register": 1.0, "healthz": 0.0})
+        for url in ("/register/", "/healthz", "/fast/"):
+            self.get(url)
+        self.assertEqual(self.transport.transactions(), ["register"])
+
+    def test_tail_capture_keeps_slow_and_failing_requests(self):
+        self.init(
+            traces_sample_rate=0.01,
+            traces_sample_rates={"healthz": 0.0},
+            traces_slow_seconds=0.05,
+        )
+        with mock.patch("config.settings.sentry.random.random", return_value=0.5):
+            for url in ("/fast/", "/slow/", "/broken/", "/healthz"):
+                self.get(url)
+        self.assertEqual(self.transport.transactions(), ["slow", "broken"])
+
+        with mock.patch("config.settings.sentry.random.random", return_value=0.001):
+            self.get("/fast/")
+        self.assertEqual(self.transport.transactions()[-1], "fast")
+
+    def test_continued_traces_keep_the_upstream_decision(self):
+        self.init(traces_sample_rate=0.01, traces_slow_seconds=0.05)
+        trace_id = "771a43a4192642f0b136d5159a501700"
+        with mock.patch("config.settings.sentry.random.random", return_value=0.5):
+            self.get("/fast/", HTTP_SENTRY_TRACE=f"{trace_id}-b7ad6b7169203331-1")
+            self.get("/slow/", HTTP_SENTRY_TRACE=f"{trace_id}-b7ad6b7169203331-0")
+        self.assertEqual(self.transport.transactions(), ["fast"])
+
+    def test_view_names_are_resolved_once_per_path(self):
+        sentry._resolve_view_name.cache_clear()
+        self.addCleanup(sentry._resolve_view_name.cache_clear)
+        self.init(traces_sample_rates={"register": 1.0})
+        with mock.patch("django.urls.resolve", wraps=resolve) as resolve_:
+            for _ in range(3):
+                self.get("/register/")
+        resolve_.assert_called_once_with("/register/", __name__)
+        self.assertEqual(self.transport.transactions(), ["register"] * 3)
+
+    def test_tail_capture_scales_the_profile_rate_by_the_view_rate(self):
+        sampler = TracesSampler(
+            {"register": 0.5, "healthz": 0.0}, default_rate=0.1, slow_seconds=1.0, profiles_rate=0.2
+        )
+        context = {"wsgi_environ": {"PATH_INFO": "/register/"}, "parent_sampled": None}
+        self.assertEqual(sampler(context), 1.0)
+        self.assertAlmostEqual(sampler.profiles_sampler(context), 0.1)
+        context["wsgi_environ"]["PATH_INFO"] = "/healthz"
+        self.assertEqual(sampler.profiles_sampler(context), 0.0)
+        # Continued traces and head sampling: the transaction decision is already the rate.
+        self.assertEqual(sampler.profiles_sampler({**context, "parent_sampled": True}), 0.2)
+        sampler.slow_seconds = 0
+        self.assertEqual(sampler.profiles_sampler(context), 0.2)
+
+        self.init(traces_sample_rate=0.1, traces_slow_seconds=1.0, profiles_sample_rate=0.2)
+        options = sentry_sdk.get_client().options
+        self.assertEqual(options["profiles_sampler"].__self__.profiles_rate, 0.2)
+
+    def test_tracing_stays_off_without_rates(self):
+        self.init(traces_sample_rates={"healthz": 0.0}, traces_slow_seconds=1.0)
+        self.assertIsNone(sentry_sdk.get_client().options["traces_sampler"])
+        self.get("/fast/")
+        self.assertEqual(self.transport.transactions(), [])
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.middleware import SQLInstrumentationMiddleware
+from apps.core.sql import (
+    QueryBudgetExceeded,
+    assert_max_queries,
+    get_query_budget,
+    query_budget,
+)
+from apps.custom_user import views
+
+User = get_user_model()
+
+
+@query_budget(1)
+def two_query_view(request):
+    User.objects.count()
+    User.objects.exists()
+    return HttpResponse("ok")
+
+
+class SQLInstrumentationMiddlewareTests(TestCase):
+    def run_view(self, view):
+        request = RequestFactory().get("/probe/")
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = SQLInstrumentationMiddleware(get_response)
+        return request, middleware(request)
+
+    @override_settings(SQL_QUERY_BUDGETS_STRICT=False, SQL_SERVER_TIMING=True)
+    def test_records_queries_logs_and_sets_server_timing(self):
+        with self.assertLogs("apps.core.sql", level="INFO") as logs:
+            request, response = self.run_view(two_query_view)
+
+        self.assertEqual(request.sql_stats.count, 2)
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        summary, overrun = logs.records
+        self.assertEqual(summary.db_queries, 2)
+        self.assertIn("SELECT", summary.db_slowest_sql)
+        self.assertEqual(overrun.levelname, "WARNING")
+
+    def test_strict_mode_fails_on_budget_overrun(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.run_view(two_query_view)
+
+    def test_views_declare_budgets(self):
+        self.assertEqual(get_query_budget(views.CurrentUserView.as_view()), 2)
+        self.assertEqual(get_query_budget(views.RegisterView.as_view()), 2)
+
+    def test_assert_max_queries_helper(self):
+        with assert_max_queries(1):
+            User.objects.count()
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_max_queries(1):
+                User.objects.count()
+                User.objects.count()
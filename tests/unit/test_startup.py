@@ -0,0 +1,85 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+
+from apps.core.management.commands.profile_startup import parse_importtime, summarize_imports
+from apps.core.openapi import generate_schema_bundle
+from config import urls
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     yaml.error
+import time:      2000 |       2120 |   yaml
+import time:       300 |       2420 | rest_framework.compat
+"""
+
+
+class ProfileStartupTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        records = parse_importtime(IMPORTTIME)
+        self.assertEqual(
+            [r.module for r in records], ["yaml.error", "yaml", "rest_framework.compat"]
+        )
+        self.assertEqual([r.depth for r in records], [2, 1, 0])
+
+        summary = summarize_imports(records, top=2)
+        self.assertEqual(summary["packages"], {"yaml": 2.1, "rest_framework": 0.3})
+        self.assertEqual(summary["slowest"][0]["module"], "rest_framework.compat")
+
+    def test_reports_phases_of_a_fresh_boot(self):
+        out = StringIO()
+        call_command("profile_startup", "--json", path="/auth/me/", top=5, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertTrue(report["status"].startswith("401"))
+        phases = list(report["phases_ms"].values())
+        self.assertEqual(phases, sorted(phases))
+        self.assertGreater(report["imports"]["modules"], 100)
+
+
+class OptionalSubsystemTests(SimpleTestCase):
+    def reload_urls(self):
+        clear_url_caches()
+        importlib.reload(urls)
+
+    def test_api_docs_can_be_disabled(self):
+        self.addCleanup(self.reload_urls)
+        with override_settings(API_DOCS_ENABLED=False):
+            self.reload_urls()
+            with self.assertRaises(NoReverseMatch):
+                reverse("schema")
+        self.reload_urls()
+        self.assertEqual(reverse("schema"), "/api/schema/")
+
+    def test_disabled_api_docs_import_no_drf_spectacular(self):
+        code = (
+            "import sys, django; django.setup()\n"
+            "from django.test import Client\n"
+            "status = Client().get('/auth/me/').status_code\n"
+            "loaded = sorted(m for m in sys.modules if m.startswith('drf_spectacular'))\n"
+            "print(status, loaded)"
+        )
+        env = {
+            **os.environ,
+            "API_DOCS_ENABLED": "0",
+            "DJANGO_SETTINGS_MODULE": "config.settings.test",
+            "ALLOWED_HOSTS": "testserver",
+        }
+        completed = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "401 []")
+
+    def test_schema_extensions_are_registered_for_generation(self):
+        # Imported with the DEFAULT_SCHEMA_CLASS rather than in an AppConfig.ready().
+        body = generate_schema_bundle().variants["yaml"].body
+        self.assertIn("apps.custom_user.schema", sys.modules)
+        self.assertIn(b"\n    JWT:\n", body)
+        self.assertNotIn(b"ClaimsTokenObtainPair", body)
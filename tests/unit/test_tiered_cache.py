@@ -0,0 +1,111 @@
+import tempfile
+import threading
+import time
+import uuid
+
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.cache import TieredCache, tiered_cache_stats
+
+FILE_CACHE_DIR = tempfile.mkdtemp(prefix="tiered-cache-tests-")
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "file": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": FILE_CACHE_DIR,
+        },
+        # Atomic add(), like Redis; FileBasedCache.add() can race.
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tiered-cache-tests",
+        },
+    }
+)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["file"].clear()
+        caches["shared"].clear()
+
+    def tiered(self, **options):
+        """A cache with its own L1, as another worker process would have."""
+        options = {"L2_ALIAS": "file", "L1_TIMEOUT": 60, "POLL_INTERVAL": 0.01, **options}
+        return TieredCache(f"test-{uuid.uuid4().hex}", {"OPTIONS": options})
+
+    def test_reads_fall_through_l1_then_l2(self):
+        writer, reader = self.tiered(), self.tiered()
+        writer.set("users:1", {"name": "a"})
+
+        self.assertEqual(writer.get("users:1"), {"name": "a"})
+        self.assertEqual(reader.get("users:1"), {"name": "a"})
+        self.assertEqual(reader.get("users:1"), {"name": "a"})
+        self.assertIsNone(reader.get("users:2"))
+
+        self.assertEqual(writer.stats()["users"]["l1_hits"], 1)
+        stats = reader.stats()["users"]
+        self.assertEqual((stats["l1_hits"], stats["l2_hits"], stats["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3)
+
+    def test_delete_and_expiry_reach_l1(self):
+        local, other = self.tiered(), self.tiered(L1_TIMEOUT=0.05)
+        local.set("k", 1)
+        self.assertEqual(other.get("k"), 1)
+
+        local.delete("k")
+        self.assertIsNone(local.get("k"))
+        self.assertEqual(other.get("k"), 1)  # stale until its L1 entry expires
+        time.sleep(0.06)
+        self.assertIsNone(other.get("k"))
+
+    def test_l1_is_a_bounded_lru(self):
+        tiered = self.tiered(L1_MAX_ENTRIES=2)
+        tiered.set("ns:a", 1)
+        tiered.set("ns:b", 2)
+        tiered.get("ns:a")  # most recently used
+        tiered.set("ns:c", 3)
+
+        self.assertEqual(len(tiered.l1), 2)
+        self.assertEqual(tiered.stats()["ns"]["l1_evictions"], 1)
+        tiered.get("ns:b")  # evicted from L1, still in L2
+        self.assertEqual(tiered.stats()["ns"]["l2_hits"], 1)
+
+    def test_get_or_set_computes_once_across_threads_and_processes(self):
+        workers = [self.tiered(L2_ALIAS="shared"), self.tiered(L2_ALIAS="shared")]
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "expensive"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda c=c: results.append(c.get_or_set("report:1", compute)))
+            for c in workers * 4
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["expensive"] * 8)
+        self.assertEqual(len(calls), 1)
+        stats = [w.stats()["report"] for w in workers]
+        self.assertEqual(sum(s["computations"] for s in stats), 1)
+        self.assertLessEqual(sum(s["stampede_waits"] for s in stats), 1)
+
+    def test_waiter_computes_when_the_lock_holder_never_finishes(self):
+        tiered = self.tiered(LOCK_TIMEOUT=0.05)
+        caches["file"].add("report:2.lock", 1, timeout=60)  # abandoned lock
+        self.assertEqual(tiered.get_or_set("report:2", lambda: "fresh"), "fresh")
+
+
+class DefaultCacheTests(SimpleTestCase):
+    def test_default_cache_is_tiered(self):
+        self.assertIsInstance(caches["default"], TieredCache)
+        cache.set("tiered-default:probe", 1)
+        self.assertEqual(cache.get("tiered-default:probe"), 1)
+        self.assertIn("tiered-default", tiered_cache_stats()["default"])
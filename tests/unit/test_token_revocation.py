@@ -0,0 +1,129 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenError
+
+from apps.custom_user.models import RevokedToken
+from apps.custom_user.revocation import BloomFilter, RevocationStore, revocation_store
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+def table_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if RevokedToken._meta.db_table in q["sql"]]
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives_and_error_rate_near_target(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        members = [uuid.uuid4().hex for _ in range(5000)]
+        for jti in members:
+            bloom.add(jti)
+
+        self.assertTrue(all(jti in bloom for jti in members))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(20_000))
+        self.assertLess(false_positives / 20_000, 0.02)
+        self.assertAlmostEqual(bloom.estimated_error_rate, 0.01, delta=0.005)
+        # ~9.6 bits per entry for 1%.
+        self.assertLess(bloom.memory_bytes, 5000 * 10 / 8 + 8)
+
+
+class RefreshRotationTests(APITestCase):
+    def setUp(self):
+        revocation_store.clear()
+        self.addCleanup(revocation_store.clear)
+        self.user = User.objects.create_user(email="rotate@example.com", password="testpass123")
+        self.refresh = str(ClaimsRefreshToken.for_user(self.user))
+
+    def refresh_token(self, token):
+        return self.client.post(reverse("custom_user:token_refresh"), {"refresh": token})
+
+    def test_refresh_rotates_and_revokes_the_old_token(self):
+        response = self.refresh_token(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["refresh"], self.refresh)
+
+        replay = self.refresh_token(self.refresh)
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh_token(response.data["refresh"]).status_code, 200)
+
+    def test_unrevoked_tokens_are_cleared_by_the_filter_without_a_lookup(self):
+        self.refresh_token(self.refresh)  # builds the filter
+        token = str(ClaimsRefreshToken.for_user(self.user))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.refresh_token(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Only the INSERT revoking the rotated token; no SELECT on the table.
+        self.assertEqual(len(table_queries(ctx)), 1)
+        self.assertIn("INSERT", table_queries(ctx)[0])
+
+    def test_revoke_endpoint_logs_out(self):
+        response = self.client.post(reverse("custom_user:token_revoke"), {"refresh": self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh_token(self.refresh).status_code, 401)
+
+    def test_a_token_is_rotated_only_once(self):
+        first = ClaimsRefreshToken(self.refresh)
+        second = ClaimsRefreshToken(self.refresh)  # both verified before either rotates
+        first.blacklist()
+        with self.assertRaises(TokenError):
+            second.blacklist()
+
+
+class RevocationStoreTests(TestCase):
+    def expires(self, **delta):
+        return timezone.now() + timedelta(**(delta or {"days": 1}))
+
+    def test_revocations_from_other_workers_arrive_on_sync(self):
+        local = RevocationStore(SYNC_INTERVAL=3600)
+        other = RevocationStore()
+        self.assertFalse(local.is_revoked("a"))
+
+        other.revoke("a", self.expires())
+        self.assertFalse(local.is_revoked("a"))  # inside the sync window
+        local.sync()
+        self.assertTrue(local.is_revoked("a"))
+        self.assertEqual(local.stats()["filter_hits"], 1)
+
+    def test_purge_deletes_expired_rows_and_rebuilds_the_filter(self):
+        store = RevocationStore(SYNC_INTERVAL=0, PURGE_INTERVAL=60)
+        store.revoke("expired", self.expires(seconds=-1))
+        store.revoke("live", self.expires())
+        store.rebuild()
+        self.assertEqual(store.stats()["entries"], 1)
+
+        store._next_purge = 0
+        store.sync_if_due()
+        self.assertEqual(store.purged, 1)
+        self.assertEqual(list(RevokedToken.objects.values_list("jti", flat=True)), ["live"])
+
+    def test_filter_grows_past_its_capacity(self):
+        store = RevocationStore(BLOOM_CAPACITY=10, SYNC_INTERVAL=0)
+        store.is_revoked("x")
+        RevokedToken.objects.bulk_create(
+            RevokedToken(jti=f"t{n}", expires_at=self.expires()) for n in range(15)
+        )
+        store.sync_if_due()  # picks the rows up, now over capacity
+        store.sync_if_due()
+        stats = store.stats()
+        self.assertEqual(stats["entries"], 15)
+        self.assertEqual(stats["capacity"], 30)
+        self.assertTrue(store.is_revoked("t3"))
+
+    def test_purge_command(self):
+        RevokedToken.objects.create(jti="old", expires_at=self.expires(seconds=-1))
+        out = StringIO()
+        call_command("purge_revoked_tokens", "--stats", stdout=out)
+        self.assertIn("Deleted 1 expired", out.getvalue())
+        self.assertIn("Filter: 0 entries", out.getvalue())
@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from asgi_helpers import asgi_request
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core.renderers import csv_lines
+from apps.custom_user.exporting import UserExport
+from apps.custom_user.serializers import UserExportSerializer
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+class UserExportTests(APITestCase):
+    def setUp(self):
+        joined = datetime(2024, 1, 1, tzinfo=UTC)
+        self.staff = User.objects.create_user(
+            email="staff@example.com", is_staff=True, date_joined=joined - timedelta(days=1)
+        )
+        User.objects.bulk_create(
+            User(
+                email=f"user{n}@example.com",
+                first_name=f'Üser {n}, "quoted"',
+                is_active=n % 2 == 0,
+                date_joined=joined + timedelta(days=n),
+            )
+            for n in range(5)
+        )
+        token = ClaimsRefreshToken.for_user(self.staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("custom_user:user_export")
+
+    def get(self, query="", **headers):
+        response = self.client.get(f"{self.url}{query}", **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_by_default(self):
+        response, body = self.get()
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="users.csv"')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(list(rows[0]), UserExportSerializer.Meta.fields)
+        self.assertEqual(
+            [row["email"] for row in rows[1:]], [f"user{n}@example.com" for n in range(5)]
+        )
+        self.assertEqual(rows[1]["first_name"], 'Üser 0, "quoted"')
+        self.assertEqual(rows[1]["last_login"], "")
+
+    def test_ndjson_matches_the_serializer(self):
+        response, body = self.get(HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        users = User.objects.order_by("pk")
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            json.loads(json.dumps(UserExportSerializer(users, many=True).data)),
+        )
+
+    def test_columns_and_filters(self):
+        _response, body = self.get(
+            "?format=ndjson&fields=email,is_active&is_active=true"
+            "&joined_after=2024-01-02&joined_before=2024-01-05T00:00:00Z"
+        )
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            [{"email": "user2@example.com", "is_active": True}],
+        )
+
+    def test_rejects_bad_input_and_non_staff(self):
+        response = self.client.get(f"{self.url}?fields=password")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(b"Unknown field(s): password.", response.content)
+        response = self.client.get(f"{self.url}?format=ndjson&joined_after=yesterday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        token = ClaimsRefreshToken.for_user(User.objects.get(email="user0@example.com"))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_streams_a_chunk_at_a_time(self):
+        export = UserExport("ndjson", ["id"], chunk_size=2)
+        chunks = list(export.stream())
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [2, 2, 2])
+        self.assertEqual(export.stats.rows, 6)
+
+    async def test_streams_a_chunk_at_a_time_under_asgi(self):
+        token = ClaimsRefreshToken.for_user(self.staff).access_token
+        exports = []
+
+        def small_chunks(*args, **kwargs):
+            exports.append(UserExport(*args, chunk_size=2, **kwargs))
+            return exports[-1]
+
+        with mock.patch("apps.custom_user.views.UserExport", small_chunks):
+            messages = await asgi_request(
+                "GET",
+                f"{self.url}?format=ndjson&fields=id",
+                headers=[(b"authorization", f"Bearer {token}".encode())],
+                on_body=lambda: exports[0].stats.rows,
+            )
+        self.assertEqual(messages[0]["status"], 200)
+        # Each chunk was sent before the next one was fetched.
+        chunks = messages[1:-1]
+        self.assertEqual([rows for _message, rows in chunks], [0, 2, 4])
+        self.assertEqual([message["body"].count(b"\n") for message, _rows in chunks], [2, 2, 2])
+
+    def test_csv_formulas_are_escaped(self):
+        User.objects.filter(email="user0@example.com").update(
+            first_name='=HYPERLINK("http://evil")', last_name="-2+3"
+        )
+        _response, body = self.get("?fields=email,first_name,last_name")
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[2], ["user0@example.com", '\'=HYPERLINK("http://evil")', "'-2+3"])
+        self.assertEqual(
+            csv_lines([["+1", "@SUM(A1)", "\tx", "a=b", -1, None]]),
+            b"'+1,'@SUM(A1),'\tx,a=b,-1,\r\n",
+        )
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "users.csv"
+            err = io.StringIO()
+            call_command(
+                "export_users",
+                "--fields", "id,email",
+                "--inactive",
+                "--joined-before", "2024-01-04",
+                "--output", str(path),
+                stderr=err,
+            )  # fmt: skip
+            user = User.objects.get(email="user1@example.com")
+            self.assertEqual(path.read_text().splitlines(), ["id,email", f"{user.pk},{user.email}"])
+        self.assertIn("Exported 1 users in", err.getvalue())
+        self.assertIn("rows/s", err.getvalue())
+
+        with self.assertRaisesMessage(CommandError, "Unknown field(s)"):
+            call_command("export_users", "--fields", "password", "--output", "/dev/null")
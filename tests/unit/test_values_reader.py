@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+
+from apps.core.serializers import ValuesReader
+from apps.custom_user.serializers import UserSerializer
+from apps.custom_user.tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+class ValuesReaderTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="a@example.com", first_name="Ann")
+        User.objects.create_user(
+            email="b@example.com", date_joined=timezone.now().replace(microsecond=0)
+        )
+
+    def test_matches_the_model_serializer(self):
+        reader = ValuesReader(UserSerializer)
+        for zone in ("Africa/Johannesburg", "UTC"):
+            with self.subTest(zone=zone), timezone.override(zone):
+                queryset = User.objects.order_by("id")
+                self.assertEqual(
+                    reader.to_representation(reader.values(queryset)),
+                    UserSerializer(queryset, many=True).data,
+                )
+
+    def test_fields_subset_keeps_serializer_order(self):
+        reader = ValuesReader(UserSerializer, ["email", "id"])
+        rows = reader.to_representation(reader.values(User.objects.order_by("id")))
+        self.assertEqual(list(rows[0]), ["id", "email"])
+
+    def test_unknown_fields_and_uncompilable_serializers(self):
+        with self.assertRaises(serializers.ValidationError):
+            ValuesReader(UserSerializer, ["password"])
+
+        class WithMethodField(UserSerializer):
+            initials = serializers.SerializerMethodField()
+
+            class Meta(UserSerializer.Meta):
+                fields = [*UserSerializer.Meta.fields, "initials"]
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesReader(WithMethodField)
+
+
+class UserListFieldsTests(APITestCase):
+    def setUp(self):
+        staff = User.objects.create_user(
+            email="staff@example.com",
+            is_staff=True,
+            date_joined=timezone.now() - timedelta(days=1),
+        )
+        User.objects.create_user(email="member@example.com", last_name="Member")
+        token = ClaimsRefreshToken.for_user(staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("custom_user:user_list")
+
+    def test_full_representation_matches_user_serializer(self):
+        response = self.client.get(self.url)
+        expected = UserSerializer(User.objects.order_by("date_joined", "id"), many=True).data
+        self.assertEqual(response.json()["results"], expected)
+
+    def test_sparse_fields_are_pushed_into_the_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"fields": "email", "page_size": 1})
+        self.assertEqual(response.data["results"], [{"email": "staff@example.com"}])
+        page_sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn("last_name", page_sql)
+        self.assertNotIn("password", page_sql)
+
+        following = self.client.get(response.data["next"])
+        self.assertEqual(following.data["results"], [{"email": "member@example.com"}])
+
+    def test_unknown_field_is_a_400(self):
+        response = self.client.get(self.url, {"fields": "email,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)